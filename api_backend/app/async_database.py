@@ -0,0 +1,16 @@
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from .config import ASYNC_DATABASE_URL, DB_POOL_SETTINGS
+
+# Engine async (asyncpg / aiosqlite), créé uniquement si API_ASYNC est activé
+if make_url(ASYNC_DATABASE_URL).get_backend_name() == "sqlite":
+    async_engine = create_async_engine(ASYNC_DATABASE_URL)
+else:
+    async_engine = create_async_engine(ASYNC_DATABASE_URL, **DB_POOL_SETTINGS)
+
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -5,4 +5,34 @@ load_dotenv()
 DATABASE_URL    = os.getenv("DATABASE_URL")
 JWT_SECRET      = os.getenv("JWT_SECRET")
 JWT_ALGORITHM   = os.getenv("JWT_ALGORITHM")
-JWT_EXPIRE_MINUTES = int(os.getenv("JWT_EXPIRE_MINUTES", 60))
\ No newline at end of file
+JWT_EXPIRE_MINUTES = int(os.getenv("JWT_EXPIRE_MINUTES", 60))
+# Durée de vie (secondes) des utilisateurs en cache dans l'API (service.principal_cache).
+# L'invalidation n'atteint que ce processus : un utilisateur modifié, désactivé ou
+# supprimé depuis l'application de bureau ou un autre worker reste accepté au plus
+# PRINCIPAL_CACHE_TTL secondes. 0 désactive le cache.
+PRINCIPAL_CACHE_TTL = int(os.getenv("PRINCIPAL_CACHE_TTL", 60))
+
+# Réglages du pool SQLAlchemy (voir models.database.get_engine)
+DB_POOL_SETTINGS = {
+    "pool_size":     int(os.getenv("DB_POOL_SIZE", 10)),
+    "max_overflow":  int(os.getenv("DB_MAX_OVERFLOW", 20)),
+    "pool_timeout":  int(os.getenv("DB_POOL_TIMEOUT", 30)),
+    "pool_recycle":  int(os.getenv("DB_POOL_RECYCLE", 1800)),
+    "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "1").lower() in ("1", "true", "yes"),
+}
+
+# Mode async (opt-in) : endpoints /patients en lecture sur AsyncEngine/AsyncSession
+API_ASYNC = os.getenv("API_ASYNC", "0").lower() in ("1", "true", "yes")
+
+
+def _to_async_url(url: str) -> str:
+    """postgresql:// → postgresql+asyncpg://, sqlite:// → sqlite+aiosqlite://"""
+    if not url:
+        return url
+    scheme, sep, rest = url.partition("://")
+    driver = {"postgresql": "postgresql+asyncpg", "postgresql+psycopg2": "postgresql+asyncpg",
+              "sqlite": "sqlite+aiosqlite"}.get(scheme, scheme)
+    return f"{driver}{sep}{rest}"
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or _to_async_url(DATABASE_URL)
@@ -1,6 +1,7 @@
-from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
-from .config import DATABASE_URL
+from models.database import get_engine
+from .config import DATABASE_URL, DB_POOL_SETTINGS
 
-engine = create_engine(DATABASE_URL)
+# Engine du registre partagé (models.database) : même pool que les contrôleurs
+engine = get_engine(DATABASE_URL, **DB_POOL_SETTINGS)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
\ No newline at end of file
@@ -0,0 +1,69 @@
+# api_backend/app/dependencies.py
+"""
+Conteneur de dépendances FastAPI : chaque endpoint ne construit que ce dont il a
+besoin (session, un repository, un contrôleur), au lieu d'un AuthController complet.
+"""
+from fastapi import Depends, HTTPException
+from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.orm import Session
+from jose import jwt as jose_jwt, JWTError
+
+from app.database import SessionLocal
+from app.config import JWT_SECRET, JWT_ALGORITHM, PRINCIPAL_CACHE_TTL
+from repositories.user_repo import UserRepository
+from service.principal_cache import Principal, principal_cache
+
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
+principal_cache.ttl = PRINCIPAL_CACHE_TTL
+
+
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_repository(repo_cls):
+    """
+    Fabrique une dépendance qui instancie uniquement `repo_cls` sur la session
+    de la requête. Usage : repo = Depends(get_repository(PatientRepository))
+    """
+    def _provide(db: Session = Depends(get_db)):
+        return repo_cls(db)
+    _provide.__name__ = f"get_{repo_cls.__name__}"
+    return _provide
+
+
+def decode_subject(token: str) -> str:
+    """Décode le JWT et renvoie son `sub` (HTTP 401 si invalide ou expiré)."""
+    try:
+        payload = jose_jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+        sub = payload.get("sub")
+        if sub is None:
+            raise HTTPException(status_code=401, detail="Token invalide")
+    except JWTError:
+        raise HTTPException(status_code=401, detail="Token invalide ou expiré")
+    return sub
+
+
+def principal_from_user(sub, user) -> Principal:
+    if not user:
+        raise HTTPException(status_code=401, detail="Utilisateur non trouvé")
+    if not user.is_active:
+        raise HTTPException(status_code=401, detail="Compte désactivé")
+    return principal_cache.put(sub, Principal.from_user(user))
+
+
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> Principal:
+    """
+    Utilisateur courant, lu dans principal_cache (TTL) par le `sub` du JWT.
+    La base n'est interrogée qu'en cas d'absence ou d'expiration dans le cache ;
+    UserRepository invalide l'entrée à chaque modification de l'utilisateur.
+    """
+    sub = decode_subject(token)
+    principal = principal_cache.get(sub)
+    if principal is not None:
+        return principal
+    return principal_from_user(sub, UserRepository(db).get_user_by_id(int(sub)))
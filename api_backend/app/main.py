@@ -8,9 +8,26 @@ sys.path.append(root_path)
 # ⚠️ Ajustement ici selon les bons noms de fichiers
 from .routes.auth import auth_endpoints
 from .routes.patients import patients_endpoints
+from .config import DATABASE_URL, API_ASYNC
+from models.database import pool_stats
 
 app = FastAPI(title="AH2 API")
 
 # Inclusion des routers
 app.include_router(auth_endpoints.router, prefix="", tags=["Auth"])
+if API_ASYNC:
+    # Lectures async montées en premier : elles priment sur les GET du router sync
+    from .routes.patients import patients_async_endpoints
+    from .async_database import async_engine
+    app.include_router(patients_async_endpoints.router, prefix="/patients", tags=["Patients"])
+
+    @app.on_event("shutdown")
+    async def dispose_async_engine():
+        await async_engine.dispose()
 app.include_router(patients_endpoints.router, prefix="/patients", tags=["Patients"])
+
+
+@app.get("/health/db", tags=["Health"])
+def db_pool_health():
+    """Statistiques du pool de connexions partagé (empruntées, overflow, attente)."""
+    return pool_stats(DATABASE_URL)
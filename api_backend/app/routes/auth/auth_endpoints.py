@@ -1,52 +1,29 @@
 import datetime
 from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
-from jose import jwt as jose_jwt ,JWTError
-from app.database import SessionLocal
+from fastapi.security import OAuth2PasswordRequestForm
+from jose import jwt as jose_jwt
 from app.config import JWT_SECRET, JWT_ALGORITHM, JWT_EXPIRE_MINUTES
-from controller.auth_controller import AuthController
+# get_db / get_current_user / oauth2_scheme restent importables depuis ce module
+from app.dependencies import get_db, get_repository, get_current_user, oauth2_scheme
+from repositories.user_repo import UserRepository
+from models.user import pwd_context
+from service.principal_cache import Principal, principal_cache
 from .schemas import Token
 
 router = APIRouter()
 
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
-
-# Dependency
-
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
 
 @router.post("/auth/login", response_model=Token, tags=["Authentication"])
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    auth_ctrl = AuthController(db_session=db)
-    user = auth_ctrl.authenticate(form_data.username, form_data.password)
-    if not user:
+def login(form_data: OAuth2PasswordRequestForm = Depends(),
+          user_repo: UserRepository = Depends(get_repository(UserRepository))):
+    # Seul le UserRepository est nécessaire pour vérifier les identifiants
+    user = user_repo.get_user_by_username(form_data.username)
+    if not user or not user.is_active or not pwd_context.verify(form_data.password, user.password_hash):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Identifiants invalides")
 
     expire = datetime.datetime.utcnow() + datetime.timedelta(minutes=JWT_EXPIRE_MINUTES)
-    payload = {"sub": user.user_id, "exp": expire}
+    payload = {"sub": str(user.user_id), "exp": expire}
     token = jose_jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
+    # L'utilisateur vient d'être chargé : on amorce le cache des principaux
+    principal_cache.put(user.user_id, Principal.from_user(user))
     return {"access_token": token, "token_type": "bearer"}
-
-# Exemple de dependency pour obtenir l'utilisateur courant
-
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
-    try:
-        # 1) Décoder le token, pas l'encoder
-        payload = jose_jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
-        user_id = payload.get("sub")
-        if user_id is None:
-            raise HTTPException(status_code=401, detail="Token invalide")
-    except JWTError:  # Exception générique de python-jose
-        raise HTTPException(status_code=401, detail="Token invalide ou expiré")
-
-    auth_ctrl = AuthController(db_session=db)
-    user = auth_ctrl.user_repo.get_user_by_id(user_id)
-    if not user:
-        raise HTTPException(status_code=401, detail="Utilisateur non trouvé")
-    return user
\ No newline at end of file
@@ -0,0 +1,75 @@
+# api_backend/app/routes/patients/patients_async_endpoints.py
+"""
+Endpoints /patients en lecture, version async (activés par API_ASYNC=1).
+Montés avant le router sync : ils prennent la main sur GET, les écritures
+(procédures stockées) restent servies par patients_endpoints.
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+
+from .patients_schemas import PatientResponse
+from app.async_database import get_async_db
+from app.dependencies import oauth2_scheme, decode_subject, principal_from_user
+from models.user import User
+from repositories.patient_repo_async import AsyncPatientRepository
+from service.principal_cache import Principal, principal_cache
+
+router = APIRouter(prefix="/patients", tags=["Patients"])
+
+
+async def get_current_user_async(token: str = Depends(oauth2_scheme),
+                                 db: AsyncSession = Depends(get_async_db)) -> Principal:
+    sub = decode_subject(token)
+    principal = principal_cache.get(sub)
+    if principal is not None:
+        return principal
+    # User.application_role est en lazy="joined" : chargé dans la même requête
+    result = await db.execute(select(User).where(User.user_id == int(sub)))
+    return principal_from_user(sub, result.unique().scalar_one_or_none())
+
+
+def get_async_patient_repo(db: AsyncSession = Depends(get_async_db)) -> AsyncPatientRepository:
+    return AsyncPatientRepository(db)
+
+
+@router.get("/", response_model=List[PatientResponse])
+async def list_patients(
+    page: int = Query(1, ge=1),
+    per_page: int = Query(10, ge=1, le=100),
+    search: str = Query(None),
+    current_user: Principal = Depends(get_current_user_async),
+    repo: AsyncPatientRepository = Depends(get_async_patient_repo)
+):
+    # Même règle que PatientController.list_patients : un secrétaire ne voit
+    # que les patients créés par un secrétaire
+    role = (current_user.role_name or "").lower()
+    return await repo.list_patients(
+        page=page, per_page=per_page, search=search,
+        creator_role=role if "secr" in role else None
+    )
+
+
+@router.get("/code/{code}", response_model=PatientResponse)
+async def get_patient_by_code(
+    code: str,
+    current_user: Principal = Depends(get_current_user_async),
+    repo: AsyncPatientRepository = Depends(get_async_patient_repo)
+):
+    p = await repo.find_by_code(code)
+    if not p:
+        raise HTTPException(status_code=404, detail="Patient non trouvé")
+    return p
+
+
+@router.get("/{patient_id}", response_model=PatientResponse)
+async def get_patient(
+    patient_id: int,
+    current_user: Principal = Depends(get_current_user_async),
+    repo: AsyncPatientRepository = Depends(get_async_patient_repo)
+):
+    p = await repo.get_by_id(patient_id)
+    if not p:
+        raise HTTPException(status_code=404, detail="Patient non trouvé")
+    return p
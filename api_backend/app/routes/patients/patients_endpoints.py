@@ -1,27 +1,18 @@
 # api_backend/app/routes/patients/patients_endpoints.py
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
 from typing import List
 
 from .patients_schemas import PatientCreate, PatientUpdate, PatientResponse
-from app.database import SessionLocal
-from controller.auth_controller import AuthController
+from app.dependencies import get_repository, get_current_user
 from controller.patient_controller import PatientController
-from app.routes.auth.auth_endpoints import get_current_user
+from repositories.patient_repo import PatientRepository
 
 router = APIRouter(prefix="/patients", tags=["Patients"])
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 def get_patient_controller(current_user=Depends(get_current_user),
-                           db: Session = Depends(get_db)) -> PatientController:
-    auth_ctrl = AuthController(db_session=db)
-    return PatientController(repo=auth_ctrl.patient_repo, current_user=current_user)
+                           repo: PatientRepository = Depends(get_repository(PatientRepository))) -> PatientController:
+    # Seul le PatientRepository est construit ; l'utilisateur vient du cache des principaux
+    return PatientController(repo=repo, current_user=current_user)
 
 @router.get("/", response_model=List[PatientResponse])
 def list_patients(
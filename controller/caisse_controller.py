@@ -4,17 +4,25 @@ from typing import List
 from datetime import datetime, date
 from models.caisse import Caisse
 from repositories.caisse_repo import CaisseRepository
+from repositories.cash_summary_repo import CashSummaryRepository
+from service.cash_summary_service import CashSummaryService
 from models.consultation_spirituelle import ConsultationSpirituel
 
 
 class CaisseController:
-    def __init__(self, repo: CaisseRepository, current_user):
+    def __init__(self, repo: CaisseRepository, current_user, summary_service: CashSummaryService = None):
         """
-        - repo         : instance de CaisseRepository
-        - current_user : instance de User (doit avoir l’attribut 'user_id' et 'username')
+        - repo            : instance de CaisseRepository
+        - current_user    : instance de User (doit avoir l’attribut 'user_id' et 'username')
+        - summary_service : CashSummaryService (créé sur la session du repo si absent)
         """
         self.repo = repo
         self.user = current_user
+        self.summary = summary_service or CashSummaryService(CashSummaryRepository(repo.session))
+
+    def with_session(self, session) -> "CaisseController":
+        """Même contrôleur sur une autre session (chargement en arrière-plan, voir view.async_loader)."""
+        return CaisseController(CaisseRepository(session), self.user)
 
     def list_transactions(self) -> List[Caisse]:
         """
@@ -22,6 +30,30 @@ class CaisseController:
         """
         return self.repo.list_all()
 
+    def list_transactions_page(
+        self,
+        date_from: date = None,
+        date_to: date = None,
+        status: str = None,
+        payment_method: str = None,
+        term: str = None,
+        after: tuple[datetime, int] | None = None,
+        limit: int = 50
+    ) -> tuple[List[Caisse], tuple[datetime, int] | None]:
+        """
+        Retourne une page de transactions filtrées côté serveur et le curseur
+        (paid_at, transaction_id) de la page suivante (None s'il n'y en a plus).
+        """
+        return self.repo.list_page(
+            date_from=date_from,
+            date_to=date_to,
+            status=status,
+            payment_method=payment_method,
+            term=term,
+            after=after,
+            limit=limit
+        )
+
     def get_transaction(self, transaction_id: int) -> Caisse:
         """
         Récupère une transaction par son ID, lève ValueError si non trouvée.
@@ -75,6 +107,13 @@ class CaisseController:
         """
         return self.repo.get_total_transactions(date_from=date_from, date_to=date_to)
 
+    def get_cash_summary(self, date_from: date, date_to: date, statuses=None) -> dict:
+        """
+        Totaux transactions / retraits / net sur [date_from..date_to], détaillés par jour,
+        par mode de paiement et par type de transaction (voir CashSummaryService).
+        """
+        return self.summary.get_summary(date_from, date_to, statuses=statuses)
+
     def create_transaction(self, data: dict) -> Caisse:
         """
         Crée une nouvelle transaction (paiement) avec ses lignes.
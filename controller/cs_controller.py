@@ -1,5 +1,7 @@
 # controllers/consultation_spirituel_controller.py
 from typing import List
+from sqlalchemy.orm import Session
+from repositories.cs_repo import ConsultationSpirituelRepository
 
 class ConsultationSpirituelController:
     def __init__(self, repo, patient_controller, current_user):
@@ -10,6 +12,37 @@ class ConsultationSpirituelController:
     def list_consultations(self) -> List:
         return self.repo.list_all()
 
+    def list_consultations_page(self, type_filter=None, term=None, date_from=None, date_to=None,
+                                page: int = 1, per_page: int = 100):
+        """Page filtrée côté base : renvoie (consultations, total)."""
+        return self.repo.list_page(type_filter, term, date_from, date_to, page, per_page)
+
+    def list_consultations_filtered(self, type_filter=None, term=None, date_from=None, date_to=None) -> List:
+        return self.repo.list_filtered(type_filter, term, date_from, date_to)
+
+    def iter_consultations_filtered(self, type_filter=None, term=None, date_from=None, date_to=None):
+        """Générateur des consultations filtrées, pour l'export PDF."""
+        return self.repo.iter_filtered(type_filter, term, date_from, date_to)
+
+    def export_consultations_task(self, title: str, type_filter=None, term=None, date_from=None, date_to=None):
+        """
+        Tâche d'export PDF des consultations filtrées (voir service.export_jobs),
+        avec sa propre session ; renvoie le chemin du fichier généré.
+        """
+        from utils.export_cs_pdf import export_cs_to_pdf
+        bind = self.repo.session.get_bind()
+        filters = (type_filter, term, date_from, date_to)
+
+        def task(job):
+            with Session(bind=bind) as session:
+                repo = ConsultationSpirituelRepository(session)
+                rows = repo.iter_filtered(*filters)
+                return export_cs_to_pdf(job.track(rows, total=repo.count_filtered(*filters)), title=title)
+        return task
+
+    def list_consultation_types(self) -> List[str]:
+        return self.repo.list_types()
+
     def list_for_patient(self, patient_id: int) -> List:
         return self.repo.find_by_patient(patient_id)
 
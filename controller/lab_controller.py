@@ -1,5 +1,5 @@
 import logging
-from repositories.lab_repo import LabRepository
+from repositories.lab_repo import LabRepository, age_on
 from typing import List, Dict, Optional
 from datetime import datetime
 from sqlalchemy import func
@@ -42,20 +42,18 @@ class LabController:
     # Résultats
     def create_result(self, patient_id: Optional[int], examen_id: int, details: List[Dict]) -> Dict:
         # génère le code labo avant création
-        code_lab = self.generate_lab_code(patient_id)
-        lr = self.repo.create_lab_result({
+        code_lab = self.repo.generate_lab_code(patient_id)
+        # En-tête + détails en une seule transaction (aucun panel à moitié enregistré)
+        result_id = self.repo.create_result_with_details({
             'patient_id': patient_id,
             'examen_id': examen_id,
             'test_date': datetime.now(),
-            'prescribed_by': self.user.id,
-            'technician_id': self.user.id,
+            'prescribed_by': self.user.user_id,
+            'technician_id': self.user.user_id,
             'technician_name': self.user.username,
-            'code_lab_patient': code_lab   # il faudra ajouter cette colonne à votre modèle LabResult
-        })
-        for d in details:
-            d.update({'result_id': lr.result_id})
-            self.repo.add_result_detail(d)
-        return {"result_id": lr.result_id, "code_lab_patient": code_lab}
+            'code_lab_patient': code_lab
+        }, details)
+        return {"result_id": result_id, "code_lab_patient": code_lab}
 
     def get_result(self, result_id:int) -> Optional[Dict]:
         fr = self.repo.get_full_lab_result(result_id)
@@ -65,35 +63,69 @@ class LabController:
             "details":fr.details
         }
 
-    def complete_result(self, result_id:int, age:int, sexe:str) -> Dict:
+    def complete_result(self, result_id:int, age:int=None, sexe:str=None) -> Dict:
         cr = self.repo.complete_result(result_id, age, sexe)
         return {"status":cr.status}
+
+    def complete_results(self, result_ids: List[int]) -> Dict:
+        """Validation par lot : interprète et clôture tous les résultats donnés."""
+        done = self.repo.complete_results(result_ids)
+        return {
+            "completed": [r.result_id for r in done],
+            "flagged":   sum(1 for r in done for d in r.details if d.flagged),
+        }
     
-    def list_results_by_status(self, status: str) -> List[Dict]:
-        results = self.repo.list_results_by_status(status)
+    def preview_interpretation(self, parametre_id: int, valeur_text: str,
+                               age: int = None, sexe: str = None) -> Optional[Dict]:
+        """
+        Aperçu de l'interprétation d'une valeur en cours de saisie
+        (index des plages en mémoire, aucune écriture). None si non interprétable.
+        """
+        try:
+            value = float(str(valeur_text).replace(',', '.'))
+        except (TypeError, ValueError):
+            return None
+        found = self.repo.preview_interpretation(parametre_id, value, age, sexe)
+        if not found:
+            return None
+        rr, interpretation, flagged = found
+        return {
+            "interpretation": interpretation,
+            "flagged": flagged,
+            "valeur_min": float(rr.valeur_min),
+            "valeur_max": float(rr.valeur_max),
+        }
+
+    def list_results_by_status(self, status: str, page: int = 1, per_page: int = 100,
+                               oldest_first: bool = True) -> List[Dict]:
+        """Liste de travail paginée (colonnes de synthèse + âge / sexe du patient)."""
+        rows = self.repo.list_worklist(status, page=page, per_page=per_page, oldest_first=oldest_first)
         out = []
-        for r in results:
+        for r in rows:
             out.append({
                 'result_id':        r.result_id,
                 'code_lab_patient': r.code_lab_patient,
                 # concaténation inline
-                'patient_name':     f"{r.patient.first_name} {r.patient.last_name}",
-                'examen_name':      r.examen.nom,
-                'test_date':        r.test_date.strftime('%Y-%m-%d %H:%M'),
+                'patient_name':     f"{r.first_name or ''} {r.last_name or ''}".strip(),
+                'examen_name':      r.examen_name,
+                'test_date':        r.test_date.strftime('%Y-%m-%d %H:%M') if r.test_date else '',
                 'status':           r.status,
+                'age':              age_on(r.birth_date),
+                'gender':           r.gender,
             })
         return out
 
+    def count_results_by_status(self, status: str) -> int:
+        return self.repo.count_by_status(status)
+
 
     def get_patient_age(self, result_id: int) -> int:
-        res = self.repo.get_full_lab_result(result_id)
-        birth = res.patient.birth_date  # suppose birth_date exists
-        today = datetime.now().date()
-        return today.year - birth.year - ((today.month, today.day) < (birth.month, birth.day))
+        birth, _ = self.repo.get_patient_profile(result_id)
+        return age_on(birth)
 
     def get_patient_sex(self, result_id: int) -> str:
-        res = self.repo.get_full_lab_result(result_id)
-        return res.patient.sexe
+        _, gender = self.repo.get_patient_profile(result_id)
+        return gender
     
     def list_params(self) -> List[Dict]:
         return [{
@@ -1,5 +1,6 @@
 # controllers/medical_controller.py
 import logging
+from sqlalchemy.orm import Session
 from repositories.medical_repo import MedicalRecordRepository
 from datetime import date, timedelta
 
@@ -10,13 +11,44 @@ class MedicalRecordController:
         self.user = current_user
         self.logger = logging.getLogger(__name__)
 
-    def list_records(self, patient_id=None, page=1, per_page=20):
+    def list_records(self, patient_id=None, page=1, per_page=20, **filters):
+        """
+        filters : date_from, date_to, motif_code, severity, search (voir MedicalRecordRepository).
+        per_page=None renvoie tous les dossiers filtrés.
+        """
         try:
-            return self.repo.list_records(patient_id=patient_id, page=page, per_page=per_page)
+            return self.repo.list_records(patient_id=patient_id, page=page, per_page=per_page, **filters)
         except Exception as e:
             self.logger.error(f"Erreur list_records: {e}", exc_info=True)
             raise
 
+    def iter_records(self, patient_id=None, **filters):
+        """Générateur des dossiers filtrés, pour les exports (voir MedicalRecordRepository.iter_records)."""
+        return self.repo.iter_records(patient_id=patient_id, **filters)
+
+    def export_records_task(self, path: str, fmt: str = "pdf", **filters):
+        """
+        Tâche d'export des dossiers filtrés vers `path` (fmt : 'pdf' ou 'xlsx'),
+        à soumettre à service.export_jobs : elle ouvre sa propre session sur
+        le même engine, la session de l'UI n'est jamais partagée entre threads.
+        """
+        from utils.export_utils import (
+            export_medical_records_to_excel, export_medical_records_to_pdf, medical_record_rows
+        )
+        writer = export_medical_records_to_excel if fmt == "xlsx" else export_medical_records_to_pdf
+        bind = self.repo.session.get_bind()
+
+        def task(job):
+            with Session(bind=bind) as session:
+                repo = MedicalRecordRepository(session)
+                rows = repo.iter_records(**filters)
+                writer(medical_record_rows(job.track(rows, total=repo.count_records(**filters))), path)
+            return path
+        return task
+
+    def count_records(self, patient_id=None, **filters) -> int:
+        return self.repo.count_records(patient_id=patient_id, **filters)
+
     def get_record(self, record_id: int):
         return self.repo.get(record_id)
 
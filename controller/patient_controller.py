@@ -1,14 +1,37 @@
 # controllers/patient_controller.py
 import logging
 from sqlalchemy import func
+from sqlalchemy.orm import Session
 from models.application_role import ApplicationRole
 from models.user import User
+from repositories.patient_repo import PatientRepository
+from service.principal_cache import Principal
 
 class PatientController:
-    def __init__(self, repo, current_user):
+    def __init__(self, repo, current_user, role_name: str = None):
         self.repo = repo
         self.user = current_user
         self.logger = logging.getLogger(__name__)
+        # Rôle et instantané de l'utilisateur résolus à la construction, dans le
+        # thread de l'UI : with_session() les recopie sans relire l'utilisateur ORM
+        self._role_name = (role_name if role_name is not None else self._resolve_role_name()).lower()
+        if isinstance(current_user, Principal):
+            self._principal = current_user
+        else:
+            self._principal = Principal(
+                user_id=current_user.user_id, username=current_user.username,
+                full_name=current_user.full_name, is_active=current_user.is_active,
+                role_id=current_user.role_id, role_name=self._role_name,
+                specialty_id=current_user.specialty_id,
+            )
+
+    def with_session(self, session) -> "PatientController":
+        """
+        Même contrôleur sur une autre session (chargement en arrière-plan, voir
+        view.async_loader) : appelé dans le thread de chargement, il reçoit le
+        Principal détaché et le rôle déjà résolu, jamais l'utilisateur ORM.
+        """
+        return PatientController(PatientRepository(session), self._principal, role_name=self._role_name)
 
     def create_patient(self, data: dict) -> tuple[int,str]:
         required = ['first_name', 'last_name', 'birth_date']
@@ -25,26 +48,71 @@ class PatientController:
     def get_patient(self, patient_id: int) -> dict:
         return self.repo.get_by_id(patient_id)
 
+    def get_codes_by_ids(self, ids) -> dict:
+        """Renvoie {patient_id: code_patient} pour une liste d'IDs (une seule requête)."""
+        return self.repo.get_codes_by_ids(ids)
+
+    @property
+    def role_name(self) -> str:
+        """Rôle de l'utilisateur courant (minuscules), résolu à la construction."""
+        return self._role_name
+
+    def _resolve_role_name(self) -> str:
+        # Principal (API) : rôle déjà connu ; User (desktop) : une requête
+        name = getattr(self.user, 'role_name', None)
+        if name is None:
+            name = (
+                self.repo.session
+                    .query(ApplicationRole.role_name)
+                    .join(User, User.role_id == ApplicationRole.role_id)
+                    .filter(User.user_id == self.user.user_id)
+                    .scalar()
+            )
+        return name or ''
+
+    def _creator_role_scope(self):
+        """Un secrétaire ne voit que les patients créés par un secrétaire."""
+        role = self.role_name
+        return role if 'secr' in role else None
+
     def list_patients(self, page=1, per_page=10, search=None):
-        # 1) Récupère le role_name de l'utilisateur via la relation User.role_id
-        user_role_name = (
-            self.repo.session
-                .query(ApplicationRole.role_name)
-                .join(User, User.role_id == ApplicationRole.role_id)
-                .filter(User.user_id == self.user.user_id)
-                .scalar() or ''
+        return self.repo.list_patients(
+            page=page, per_page=per_page, search=search,
+            creator_role=self._creator_role_scope()
         )
-        role_lower = user_role_name.lower()
 
-        # 2) Si c'est un secrétaire, on renvoie tous les patients créés par un secrétaire
-        if 'secr' in role_lower:
-            return self.repo.find_by_creator_role(role_lower)
+    def iter_patients(self, search=None):
+        """Générateur de tous les patients visibles (export), lus par lots."""
+        return self.repo.iter_patients(search=search, creator_role=self._creator_role_scope())
 
-        # 3) Sinon, pagination + recherche
-        return self.repo.list_patients(page=page, per_page=per_page, search=search)
-    
-    def list_spiritual_patients(self):
-        return self.repo.find_by_creator_role('secretaire')
+    def export_patients_task(self, title: str, search=None):
+        """
+        Tâche d'export PDF des patients visibles (voir service.export_jobs),
+        avec sa propre session ; renvoie le chemin du fichier généré.
+        """
+        from utils.pdf_export import export_patients_to_pdf
+        bind = self.repo.session.get_bind()
+        creator_role = self._creator_role_scope()  # lu ici, dans le thread UI
+
+        def task(job):
+            with Session(bind=bind) as session:
+                repo = PatientRepository(session)
+                rows = repo.iter_patients(search=search, creator_role=creator_role)
+                total = repo.count_patients(search=search, creator_role=creator_role)
+                return export_patients_to_pdf(job.track(rows, total=total), title=title)
+        return task
+
+    def search_patients(self, term, page=1, per_page=10):
+        """Recherche classée : renvoie (patients de la page, nombre total de résultats)."""
+        return self.repo.search_patients(
+            term, page=page, per_page=per_page,
+            creator_role=self._creator_role_scope()
+        )
+
+    def list_spiritual_patients(self, page=1, per_page=50, search=None):
+        return self.repo.list_patients(
+            page=page, per_page=per_page, search=search, creator_role='secretaire'
+        )
     
     def find_by_code(self, code: str) -> dict:
         p = self.repo.find_by_code(code)
@@ -11,6 +11,16 @@ class PharmacyController:
     def search_products(self, term=None, type_filter=None, status_filter=None):
         return self.repo.search(term, type_filter, status_filter)
 
+    def search_products_page(self, term=None, type_filter=None, status_filter=None,
+                             expires_within_days=None, expired=False,
+                             sort_by=None, descending=False, page=1, per_page=50):
+        """Recherche paginée côté base : renvoie (produits, total)."""
+        return self.repo.search_page(
+            term, type_filter, status_filter,
+            expires_within_days=expires_within_days, expired=expired,
+            sort_by=sort_by, descending=descending, page=page, per_page=per_page
+        )
+
     def get_product(self, medication_id: int):
         prod = self.repo.get_by_id(medication_id)
         if not prod:
@@ -42,11 +52,35 @@ class PharmacyController:
     def delete_product(self, medication_id: int):
         return self.repo.delete(medication_id)
 
-    def renew_stock(self, medication_id: int, added_quantity: int):
+    def renew_stock(self, medication_id: int, added_quantity: int, expiry_date=None, lot_number=None):
         """
-        Réapprovisionne le stock d’un produit existant.
+        Réapprovisionne le stock d’un produit existant (nouveau lot).
         """
-        return self.repo.renew_stock(medication_id, added_quantity, self.user)
+        return self.repo.renew_stock(medication_id, added_quantity, self.user,
+                                     expiry_date=expiry_date, lot_number=lot_number)
 
     def list_critical_or_empty(self):
         return self.repo.get_critical_or_empty()
+
+    def list_lots(self, medication_id: int):
+        return self.repo.list_lots(medication_id)
+
+    def list_expiring_lots(self, days: int = 30, include_expired: bool = False):
+        return self.repo.get_expiring_lots(days, include_expired)
+
+    def consumption_forecast(self, window_days: int = 28):
+        """
+        Pour chaque produit : consommation sur la fenêtre, moyenne journalière
+        (avg_daily) et jours de stock restants (days_remaining, None sans vente).
+        """
+        return self.repo.forecast_consumption(window_days)
+
+    def reorder_suggestions(self, window_days: int = 28, lead_time_days: int = 7, cover_days: int = 30):
+        """
+        Produits sous leur point de commande, avec la quantité à commander
+        (suggested_quantity), du plus urgent au moins urgent.
+        """
+        return self.repo.get_reorder_suggestions(window_days, lead_time_days, cover_days)
+
+    def consumption_series(self, medication_id: int, granularity: str = 'week', periods: int = 12):
+        return self.repo.get_consumption_series(medication_id, granularity, periods)
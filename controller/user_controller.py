@@ -29,20 +29,13 @@ class UserController:
             raise RuntimeError(f"Erreur création utilisateur : {e}")
 
     def update_user(self, user_id: int, data: dict) -> User:
-        user = self.user_repo.session.query(User).get(user_id)
-        if not user:
-            raise ValueError(f"Utilisateur {user_id} introuvable")
-        for field in ('full_name','postgres_role','is_active','role_id','specialty_id'):
-            if field in data:
-                setattr(user, field, data[field])
-        if data.get('password'):
-            user.set_password(data['password'])
         try:
-            self.user_repo.session.commit()
-            return user
+            user = self.user_repo.update_user(user_id, data)
         except SQLAlchemyError as e:
-            self.user_repo.session.rollback()
             raise RuntimeError(f"Erreur mise à jour utilisateur : {e}")
+        if not user:
+            raise ValueError(f"Utilisateur {user_id} introuvable")
+        return user
         
 
     def get_user_by_id(self, user_id: int) -> User:
@@ -1,4 +1,5 @@
-from models.database import DatabaseManager
+from models.database import DatabaseManager, dispose_engines
+from service.export_jobs import export_manager
 from view.auth_view import AuthView
 from controller.auth_controller import AuthController
 import sys
@@ -21,8 +22,9 @@ def main():
     except Exception as e:
         print(f"Erreur: {e}", file=sys.stderr)
     finally:
-        if db is not None:
-            db.engine.dispose()
+        # Exports en cours annulés avant de fermer les pools qu'ils utilisent
+        export_manager.shutdown()
+        dispose_engines()
 
 if __name__ == "__main__":
     main()
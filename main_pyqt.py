@@ -1,6 +1,7 @@
 import sys
 from PyQt6.QtWidgets import QApplication
-from models.database import DatabaseManager
+from models.database import DatabaseManager, dispose_engines
+from service.export_jobs import export_manager
 from controller.auth_controller import AuthController
 from view_pyqt6.auth_view import AuthView
 
@@ -17,6 +18,8 @@ def main():
 
     # Création de l'application Qt et de la vue
     app = QApplication(sys.argv)
+    # Fermeture : exports en cours annulés avant de fermer les pools qu'ils utilisent
+    app.aboutToQuit.connect(export_manager.shutdown)
     auth_view = AuthView(auth_controller)
     auth_view.show()
 
@@ -24,8 +27,7 @@ def main():
     exit_code = app.exec()
 
     # Nettoyage
-    if db is not None:
-        db.engine.dispose()
+    dispose_engines()
 
     sys.exit(exit_code)
 
@@ -9,6 +9,7 @@ from sqlalchemy import (
     Text,
     DateTime,
     ForeignKey,
+    Index,
 )
 from sqlalchemy.orm import relationship
 from .database import Base  
@@ -16,6 +17,10 @@ from .database import Base
 
 class Caisse(Base):
     __tablename__ = "caisse"
+    __table_args__ = (
+        # Pagination par curseur (paid_at, transaction_id) de la liste caisse
+        Index("ix_caisse_paid_at_id", "paid_at", "transaction_id"),
+    )
 
     transaction_id = Column(Integer, primary_key=True, autoincrement=True)
     patient_id = Column(Integer, ForeignKey("patients.patient_id"), nullable=True)
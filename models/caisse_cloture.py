@@ -0,0 +1,86 @@
+# models/caisse_cloture.py
+
+from datetime import datetime
+from sqlalchemy import (
+    Column,
+    Integer,
+    Numeric,
+    String,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+)
+from sqlalchemy.orm import relationship
+from .database import Base
+
+
+class CaisseCloture(Base):
+    """
+    Clôture journalière de la caisse : une ligne par journée passée déjà agrégée.
+    Sa présence indique que les totaux du jour sont figés dans caisse_cloture_ligne
+    (même si la journée n'a eu aucun mouvement).
+    """
+    __tablename__ = "caisse_cloture"
+
+    closure_date = Column(Date, primary_key=True)
+    closed_at    = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    lignes = relationship(
+        "CaisseClotureLigne",
+        back_populates="cloture",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+
+    def __repr__(self):
+        return f"<CaisseCloture(date={self.closure_date}, closed_at={self.closed_at})>"
+
+
+class CaisseClotureLigne(Base):
+    """
+    Total figé d'une journée clôturée, par (kind, status, payment_method, transaction_type).
+     - kind = 'tx'      : transactions de caisse
+     - kind = 'retrait' : retraits (payment_method / transaction_type à NULL)
+    """
+    __tablename__ = "caisse_cloture_ligne"
+    __table_args__ = (
+        Index("ix_caisse_cloture_ligne_date", "closure_date"),
+    )
+
+    ligne_id         = Column(Integer, primary_key=True, autoincrement=True)
+    closure_date     = Column(
+        Date,
+        ForeignKey("caisse_cloture.closure_date", ondelete="CASCADE"),
+        nullable=False,
+    )
+    kind             = Column(String(10), nullable=False)
+    status           = Column(String(20), nullable=True)
+    payment_method   = Column(String(50), nullable=True)
+    transaction_type = Column(String(50), nullable=True)
+    total            = Column(Numeric(12, 2), nullable=False, default=0)
+    nb               = Column(Integer, nullable=False, default=0)
+
+    cloture = relationship("CaisseCloture", back_populates="lignes")
+
+    def __repr__(self):
+        return (
+            f"<CaisseClotureLigne(date={self.closure_date}, kind={self.kind}, "
+            f"method={self.payment_method}, type={self.transaction_type}, total={self.total})>"
+        )
+
+
+class CaisseClotureVersion(Base):
+    """
+    Version d'une journée de caisse, incrémentée par toute modification qui la
+    touche (CashSummaryRepository.invalidate_days). Une clôture n'est écrite que
+    si la version n'a pas bougé depuis la lecture qui a précédé l'agrégation :
+    une modification en cours ne peut pas être figée avec les anciens totaux.
+    """
+    __tablename__ = "caisse_cloture_version"
+
+    closure_date = Column(Date, primary_key=True)
+    version      = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<CaisseClotureVersion(date={self.closure_date}, version={self.version})>"
@@ -0,0 +1,18 @@
+# models/code_counter.py
+
+from sqlalchemy import Column, Integer, String
+from .database import Base
+
+
+class CodeCounter(Base):
+    """
+    Compteur nommé (scope) pour l'attribution de codes sans sondage ni collision,
+    ex. 'patient:AH2-900101MJ' ou 'lab:20250614'. last_value = dernière valeur attribuée.
+    """
+    __tablename__ = 'code_counters'
+
+    scope      = Column(String(50), primary_key=True)
+    last_value = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<CodeCounter(scope={self.scope}, last_value={self.last_value})>"
@@ -1,12 +1,18 @@
 # models/consultation_spirituel.py
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime, Numeric, ForeignKey,ARRAY
+from sqlalchemy import Column, Integer, String, Text, DateTime, Numeric, ForeignKey,ARRAY, Index
 from sqlalchemy.orm import relationship
 from .database import Base
 from .prayer_book_type import PrayerBookType  # Import to ensure registry knows this class
 
 class ConsultationSpirituel(Base):
     __tablename__ = 'consultation_spirituel'
+    __table_args__ = (
+        # Liste paginée : tri par date, filtrée ou non par type / patient
+        Index("ix_cs_consultation_date", "consultation_date"),
+        Index("ix_cs_type_date", "type_consultation", "consultation_date"),
+        Index("ix_cs_patient_id", "patient_id"),
+    )
 
     consultation_id = Column(Integer, primary_key=True, autoincrement=True)
     patient_id = Column(Integer, ForeignKey('patients.patient_id'), nullable=False)
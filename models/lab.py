@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Numeric, DateTime, ForeignKey, Text, Boolean
+from sqlalchemy import Column, Integer, String, Numeric, DateTime, ForeignKey, Text, Boolean, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from .database import Base
@@ -41,6 +41,10 @@ class ReferenceRange(Base):
 
 class LabResult(Base):
     __tablename__ = 'lab_results'
+    __table_args__ = (
+        # Listes de travail (en attente / complétés) triées par date
+        Index("ix_lab_results_status_test_date", "status", "test_date"),
+    )
     
     code_lab_patient = Column(String(20), unique=True, nullable=False)
     result_id = Column(Integer, primary_key=True)
@@ -1,11 +1,17 @@
 # models/medical_record.py
-from sqlalchemy import Column, Integer, String, Numeric, DateTime, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, Numeric, DateTime, Text, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from .database import Base
 
 class MedicalRecord(Base):
     __tablename__ = 'medical_records'
+    __table_args__ = (
+        # Liste des dossiers : filtre patient / motif puis tri par date
+        Index("ix_medical_records_patient_date", "patient_id", "consultation_date"),
+        Index("ix_medical_records_motif_date", "motif_code", "consultation_date"),
+        Index("ix_medical_records_consultation_date", "consultation_date"),
+    )
 
     record_id          = Column(Integer, primary_key=True)
     patient_id         = Column(Integer, ForeignKey('patients.patient_id'), nullable=False)
@@ -0,0 +1,217 @@
+# models/migrations.py
+"""
+Mise à niveau du schéma d'une base existante.
+
+Base.metadata.create_all ne sert qu'à l'installation d'une base neuve ; les
+tables et objets ajoutés depuis (compteurs, clôtures de caisse, ...) sont créés
+sur une base déjà déployée par les étapes ci-dessous, à lancer une fois après
+chaque mise à jour de l'application :
+
+    python -m models.migrations            # DSN lu dans DATABASE_URL
+    python -m models.migrations <DSN>
+
+Chaque étape s'exécute dans sa propre transaction et est inscrite dans la table
+schema_migrations : une étape déjà passée n'est pas rejouée. Les étapes restent
+idempotentes (création avec checkfirst) pour qu'une base neuve puisse aussi les
+enregistrer (DatabaseManager.create_tables). Une erreur interrompt la mise à
+niveau et remonte telle quelle : rien n'est masqué.
+"""
+import logging
+import sys
+from datetime import datetime
+
+from sqlalchemy import Table, Column, String, DateTime, MetaData, select, insert, exists, literal
+
+from .database import get_engine
+
+logger = logging.getLogger(__name__)
+
+# Table de suivi hors de Base.metadata : elle n'appartient à aucun modèle
+_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations", _metadata,
+    Column("name", String(100), primary_key=True),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+# Étapes dans l'ordre d'application : (nom, fonction(connection))
+MIGRATIONS = []
+
+
+def migration(name: str):
+    """Enregistre une étape de migration (décorateur)."""
+    def register(fn):
+        MIGRATIONS.append((name, fn))
+        return fn
+    return register
+
+
+def upgrade(engine=None) -> list:
+    """Applique les étapes manquantes ; renvoie la liste des étapes appliquées."""
+    engine = engine or get_engine()
+    with engine.begin() as conn:
+        schema_migrations.create(conn, checkfirst=True)
+        applied = set(conn.execute(select(schema_migrations.c.name)).scalars())
+
+    done = []
+    for name, step in MIGRATIONS:
+        if name in applied:
+            continue
+        with engine.begin() as conn:
+            step(conn)
+            conn.execute(insert(schema_migrations).values(name=name, applied_at=datetime.utcnow()))
+        logger.info("Migration appliquée : %s", name)
+        done.append(name)
+    return done
+
+
+def _create_indexes(conn, model, *names):
+    """Crée les index `names` déclarés sur le modèle (create_all n'altère pas une table existante)."""
+    by_name = {index.name: index for index in model.__table__.indexes}
+    for name in names:
+        by_name[name].create(conn, checkfirst=True)
+
+
+# ---------------------------------------------------------------- étapes
+
+@migration("001_caisse_paid_at_index")
+def _caisse_paid_at_index(conn):
+    """Pagination par curseur (paid_at, transaction_id) de la liste de caisse."""
+    from .caisse import Caisse
+    _create_indexes(conn, Caisse, "ix_caisse_paid_at_id")
+
+
+@migration("003_caisse_cloture")
+def _caisse_cloture(conn):
+    """Clôtures journalières de caisse (CashSummaryService)."""
+    from .caisse_cloture import CaisseCloture, CaisseClotureLigne
+    CaisseCloture.__table__.create(conn, checkfirst=True)
+    CaisseClotureLigne.__table__.create(conn, checkfirst=True)
+
+
+@migration("003_caisse_cloture_version")
+def _caisse_cloture_version(conn):
+    """Versions par journée : sérialise clôture et invalidation (CashSummaryRepository)."""
+    from .caisse_cloture import CaisseClotureVersion
+    CaisseClotureVersion.__table__.create(conn, checkfirst=True)
+
+
+@migration("007_code_counters")
+def _code_counters(conn):
+    """
+    Compteurs de codes (codes patient, codes labo). Chaque compteur est amorcé
+    à sa première utilisation depuis les codes existants (CounterRepository).
+    """
+    from .code_counter import CodeCounter
+    CodeCounter.__table__.create(conn, checkfirst=True)
+
+
+@migration("008_patient_search_index")
+def _patient_search_index(conn):
+    """
+    Index de recherche patient (pg_trgm + unaccent / FTS5). Sans le droit
+    CREATE EXTENSION, l'étape est tout de même validée : la recherche reste en
+    ILIKE jusqu'à DatabaseManager.create_search_indexes() par un administrateur.
+    """
+    from repositories.patient_search_repo import install_search_indexes
+    install_search_indexes(conn)
+
+
+@migration("009_patients_created_by_index")
+def _patients_created_by_index(conn):
+    """Listes de patients filtrées par créateur et triées par nom."""
+    from .patient import Patient
+    _create_indexes(conn, Patient, "ix_patients_created_by_last_name")
+
+
+@migration("014_lab_results_status_index")
+def _lab_results_status_index(conn):
+    """Listes de travail du laboratoire (statut, date d'analyse)."""
+    from .lab import LabResult
+    _create_indexes(conn, LabResult, "ix_lab_results_status_test_date")
+
+
+@migration("017_stock_status_trigger")
+def _stock_status_trigger(conn):
+    """
+    Trigger de pharmacy.stock_status (colonne server_onupdate=FetchedValue()),
+    puis recalcul des lignes existantes. Nécessite les droits DDL : sans eux,
+    la migration échoue au lieu de laisser la colonne sans mise à jour.
+    """
+    from .pharmacy import install_stock_status_trigger
+    install_stock_status_trigger(conn)
+
+
+@migration("017_pharmacy_stock_indexes")
+def _pharmacy_stock_indexes(conn):
+    """
+    Alertes de stock bas (index partiel sur les statuts 'critique' / 'épuisé',
+    après le recalcul de stock_status par l'étape précédente) et péremptions.
+    """
+    from .pharmacy import Pharmacy
+    _create_indexes(conn, Pharmacy, "ix_pharmacy_low_stock", "ix_pharmacy_expiry_date")
+
+
+@migration("018_pharmacy_lot")
+def _pharmacy_lot(conn):
+    """
+    Lots de la pharmacie (allocation FEFO), puis reprise du stock antérieur aux
+    lots : un lot d'ouverture par produit en stock qui n'en a aucun.
+    """
+    from .pharmacy import Pharmacy
+    from .pharmacy_lot import PharmacyLot
+    PharmacyLot.__table__.create(conn, checkfirst=True)
+    lot, ph = PharmacyLot.__table__, Pharmacy.__table__
+    conn.execute(
+        insert(lot).from_select(
+            ['medication_id', 'lot_number', 'quantity', 'initial_quantity',
+             'expiry_date', 'received_at', 'created_by'],
+            select(
+                ph.c.medication_id, literal('OUVERTURE'), ph.c.quantity, ph.c.quantity,
+                ph.c.expiry_date, ph.c.created_at, literal('système')
+            )
+            .where(ph.c.quantity > 0)
+            .where(~exists().where(lot.c.medication_id == ph.c.medication_id))
+        )
+    )
+
+
+@migration("019_stock_movement_bucket")
+def _stock_movement_bucket(conn):
+    """
+    Cumuls de mouvements de stock et index sur stock_movement.created_at
+    (fenêtre recalculée par StockAnalyticsRepository.refresh). L'ancien
+    filigrane par movement_id est abandonné : le premier rafraîchissement
+    reconstruit tous les cumuls.
+    """
+    from .code_counter import CodeCounter
+    from .stock_movement import StockMovement
+    from .stock_movement_bucket import StockMovementBucket
+    StockMovementBucket.__table__.create(conn, checkfirst=True)
+    for index in StockMovement.__table__.indexes:
+        index.create(conn, checkfirst=True)
+    conn.execute(CodeCounter.__table__.delete().where(CodeCounter.scope == 'rollup:stock_movement'))
+
+
+@migration("020_consultation_spirituel_indexes")
+def _consultation_spirituel_indexes(conn):
+    """Listes et statistiques des consultations spirituelles (date, type, patient)."""
+    from .consultation_spirituelle import ConsultationSpirituel
+    _create_indexes(conn, ConsultationSpirituel, "ix_cs_consultation_date", "ix_cs_type_date", "ix_cs_patient_id")
+
+
+@migration("021_medical_records_indexes")
+def _medical_records_indexes(conn):
+    """Dossiers médicaux par patient, par motif et par date de consultation."""
+    from .medical_record import MedicalRecord
+    _create_indexes(
+        conn, MedicalRecord,
+        "ix_medical_records_patient_date", "ix_medical_records_motif_date",
+        "ix_medical_records_consultation_date",
+    )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    applied = upgrade(get_engine(sys.argv[1] if len(sys.argv) > 1 else None))
+    print(f"{len(applied)} migration(s) appliquée(s)" + (f" : {', '.join(applied)}" if applied else ""))
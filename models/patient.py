@@ -1,5 +1,5 @@
 # models/patient.py
-from sqlalchemy import Column, Integer, String, Date, Text, Sequence, ForeignKey, TIMESTAMP
+from sqlalchemy import Column, Integer, String, Date, Text, Sequence, ForeignKey, TIMESTAMP, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from .database import Base
@@ -7,6 +7,10 @@ import models
 
 class Patient(Base):
     __tablename__ = 'patients'
+    __table_args__ = (
+        # Listes filtrées par rôle du créateur, triées par nom
+        Index("ix_patients_created_by_last_name", "created_by", "last_name"),
+    )
 
     patient_id    = Column(Integer, Sequence('patients_patient_id_seq'), primary_key=True)
     code_patient  = Column(String(20), unique=True)  # Le code automatique
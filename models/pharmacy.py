@@ -2,13 +2,70 @@
 
 from datetime import datetime
 from sqlalchemy import (
-    Column, Integer, String, DateTime, Numeric, ForeignKey, Text
+    Column, Integer, String, DateTime, Numeric, ForeignKey, Text, Index,
+    FetchedValue, event, text
 )
 from sqlalchemy.orm import relationship
 from .database import Base  # supposons que Base = declarative_base()
 
+# Statuts 'à surveiller', couverts par l'index partiel ix_pharmacy_low_stock
+LOW_STOCK_STATUSES = ('critique', 'épuisé')
+
+_STATUS_CASE = (
+    "CASE WHEN {p}quantity <= 0 THEN 'épuisé' "
+    "WHEN {p}quantity <= {p}threshold THEN 'critique' ELSE 'normal' END"
+)
+
+# stock_status est maintenu par la base (trigger) à partir de quantity / threshold
+STOCK_STATUS_TRIGGER_DDL = {
+    "postgresql": [
+        f"""
+        CREATE OR REPLACE FUNCTION pharmacy_stock_status() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            NEW.stock_status := {_STATUS_CASE.format(p='NEW.')};
+            RETURN NEW;
+        END $$
+        """,
+        "DROP TRIGGER IF EXISTS trg_pharmacy_stock_status ON pharmacy",
+        """
+        CREATE TRIGGER trg_pharmacy_stock_status
+        BEFORE INSERT OR UPDATE OF quantity, threshold, stock_status ON pharmacy
+        FOR EACH ROW EXECUTE FUNCTION pharmacy_stock_status()
+        """,
+    ],
+    "sqlite": [
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_pharmacy_stock_status_ai AFTER INSERT ON pharmacy
+        BEGIN
+            UPDATE pharmacy SET stock_status = {_STATUS_CASE.format(p='NEW.')}
+            WHERE medication_id = NEW.medication_id;
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_pharmacy_stock_status_au
+        AFTER UPDATE OF quantity, threshold, stock_status ON pharmacy
+        WHEN NEW.stock_status IS NOT {_STATUS_CASE.format(p='NEW.')}
+        BEGIN
+            UPDATE pharmacy SET stock_status = {_STATUS_CASE.format(p='NEW.')}
+            WHERE medication_id = NEW.medication_id;
+        END
+        """,
+    ],
+}
+
+
 class Pharmacy(Base):
     __tablename__ = 'pharmacy'
+    __table_args__ = (
+        # Index partiel : les alertes de stock bas sont une simple lecture d'index
+        Index(
+            "ix_pharmacy_low_stock", "stock_status", "drug_name",
+            postgresql_where=text("stock_status IN ('critique', 'épuisé')"),
+            sqlite_where=text("stock_status IN ('critique', 'épuisé')"),
+        ),
+        Index("ix_pharmacy_expiry_date", "expiry_date"),
+    )
 
     medication_id    = Column(Integer, primary_key=True, autoincrement=True)
     patient_id       = Column(Integer, ForeignKey('patients.patient_id'), nullable=True)
@@ -19,7 +76,9 @@ class Pharmacy(Base):
     forme            = Column(String(50), nullable=False, default='Autre')
     dosage_mg        = Column(Numeric(10, 2), nullable=True)
     expiry_date      = Column(DateTime, nullable=True)
-    stock_status     = Column(String(20), nullable=False, default='normal')
+    # Calculé par la base (trigger), relu par l'ORM après chaque écriture
+    stock_status     = Column(String(20), nullable=False, server_default='normal',
+                              server_onupdate=FetchedValue())
     prescribed_by    = Column(Integer, ForeignKey('users.user_id'), nullable=True)
     name_dr          = Column(String(100), nullable=True)
     created_at       = Column(DateTime, nullable=False, default=datetime.utcnow)
@@ -30,6 +89,8 @@ class Pharmacy(Base):
     prescriber = relationship('User')
 
     movements = relationship('StockMovement', back_populates='product', cascade='all, delete-orphan')
+    lots      = relationship('PharmacyLot', back_populates='product', cascade='all, delete-orphan',
+                             order_by='PharmacyLot.expiry_date')
 
     def __repr__(self):
         return (
@@ -37,13 +98,39 @@ class Pharmacy(Base):
             f"qty={self.quantity}, status={self.stock_status})>"
         )
 
-    def update_stock_status(self):
+    def compute_stock_status(self) -> str:
         """
-        Met à jour le champ stock_status en fonction de quantity et threshold.
+        Statut attendu pour quantity / threshold (même règle que le trigger),
+        utile pour un aperçu avant enregistrement.
         """
-        if self.quantity <= 0:
-            self.stock_status = 'épuisé'
-        elif self.quantity <= self.threshold:
-            self.stock_status = 'critique'
-        else:
-            self.stock_status = 'normal'
+        if (self.quantity or 0) <= 0:
+            return 'épuisé'
+        if self.quantity <= (self.threshold or 0):
+            return 'critique'
+        return 'normal'
+
+
+def install_stock_status_trigger(connection) -> bool:
+    """
+    Installe (ou remplace) le trigger de stock_status puis recalcule les lignes
+    existantes. Idempotent ; False si le dialecte n'est pas pris en charge.
+    """
+    ddl = STOCK_STATUS_TRIGGER_DDL.get(connection.dialect.name)
+    if ddl is None:
+        return False
+    for stmt in ddl:
+        connection.execute(text(stmt))
+    connection.execute(text(f"UPDATE pharmacy SET stock_status = {_STATUS_CASE.format(p='')}"))
+    return True
+
+
+# Base neuve : le trigger est créé avec la table (Base.metadata.create_all) ;
+# base existante : migration 017_stock_status_trigger (models.migrations)
+event.listen(
+    Pharmacy.__table__, "after_create",
+    lambda target, connection, **kw: install_stock_status_trigger(connection)
+)
+
+
+# Classe cible de Pharmacy.lots : enregistrée avec le modèle produit
+from .pharmacy_lot import PharmacyLot  # noqa: E402,F401
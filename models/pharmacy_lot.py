@@ -0,0 +1,42 @@
+# models/pharmacy_lot.py
+
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, text
+from sqlalchemy.orm import relationship
+from .database import Base
+
+
+class PharmacyLot(Base):
+    """
+    Lot (arrivage) d'un produit de la pharmacie, avec sa propre quantité restante
+    et sa date de péremption. Pharmacy.quantity reste le cumul des lots, tenu à jour
+    dans la même transaction que les lots (voir StockLotRepository).
+    """
+    __tablename__ = 'pharmacy_lot'
+    __table_args__ = (
+        # Allocation FEFO : lots d'un produit par date de péremption croissante
+        Index("ix_pharmacy_lot_fefo", "medication_id", "expiry_date"),
+        # « Périme dans N jours » : seuls les lots encore en stock sont indexés
+        Index(
+            "ix_pharmacy_lot_expiry_in_stock", "expiry_date",
+            postgresql_where=text("quantity > 0"),
+            sqlite_where=text("quantity > 0"),
+        ),
+    )
+
+    lot_id           = Column(Integer, primary_key=True, autoincrement=True)
+    medication_id    = Column(Integer, ForeignKey('pharmacy.medication_id', ondelete='CASCADE'), nullable=False)
+    lot_number       = Column(String(50), nullable=True)
+    quantity         = Column(Integer, nullable=False, default=0)
+    initial_quantity = Column(Integer, nullable=False, default=0)
+    expiry_date      = Column(DateTime, nullable=True)
+    received_at      = Column(DateTime, nullable=False, default=datetime.utcnow)
+    created_by       = Column(String(100), nullable=True)
+
+    product = relationship('Pharmacy', back_populates='lots')
+
+    def __repr__(self):
+        return (
+            f"<PharmacyLot(id={self.lot_id}, med_id={self.medication_id}, "
+            f"qty={self.quantity}, expiry={self.expiry_date})>"
+        )
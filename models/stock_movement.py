@@ -2,13 +2,17 @@
 
 from datetime import datetime
 from sqlalchemy import (
-    Column, Integer, String, DateTime, Text, ForeignKey
+    Column, Integer, String, DateTime, Text, ForeignKey, Index
 )
 from sqlalchemy.orm import relationship
 from .database import Base
 
 class StockMovement(Base):
     __tablename__ = 'stock_movement'
+    __table_args__ = (
+        # Cumuls de stock : mouvements récents (StockAnalyticsRepository.refresh)
+        Index("ix_stock_movement_created_at", "created_at"),
+    )
 
     movement_id   = Column(Integer, primary_key=True, autoincrement=True)
     medication_id = Column(Integer, ForeignKey('pharmacy.medication_id', ondelete='CASCADE'), nullable=False)
@@ -0,0 +1,35 @@
+# models/stock_movement_bucket.py
+
+from sqlalchemy import Column, Integer, String, Date, ForeignKey, Index
+from .database import Base
+
+
+class StockMovementBucket(Base):
+    """
+    Cumul des mouvements de stock d'un produit sur une période ('day' ou 'week',
+    la semaine commençant le lundi). Recalculé par StockAnalyticsRepository.refresh()
+    sur une fenêtre glissante : les jours depuis le dernier rafraîchissement,
+    plus quelques jours de recouvrement pour les mouvements arrivés en retard,
+    sont ré-agrégés et remplacent leurs cumuls ; l'historique plus ancien n'est pas relu.
+     - qty_in / qty_out : entrées / sorties brutes (tous types de mouvement)
+     - consumed : consommation nette des ventes (ventes - annulations)
+    """
+    __tablename__ = 'stock_movement_bucket'
+    __table_args__ = (
+        # Fenêtres glissantes : toutes les périodes récentes, tous produits confondus
+        Index("ix_stock_bucket_period", "granularity", "period_start"),
+    )
+
+    granularity   = Column(String(5), primary_key=True)
+    medication_id = Column(Integer, ForeignKey('pharmacy.medication_id', ondelete='CASCADE'), primary_key=True)
+    period_start  = Column(Date, primary_key=True)
+    qty_in        = Column(Integer, nullable=False, default=0)
+    qty_out       = Column(Integer, nullable=False, default=0)
+    consumed      = Column(Integer, nullable=False, default=0)
+    movements     = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return (
+            f"<StockMovementBucket({self.granularity} {self.period_start}, "
+            f"med_id={self.medication_id}, consumed={self.consumed})>"
+        )
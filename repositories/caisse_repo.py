@@ -1,17 +1,67 @@
 # repositories/caisse_repo.py
 
-from sqlalchemy.orm import Session
-from sqlalchemy import func, or_
-from datetime import datetime, date
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import func, or_, and_, insert, update, delete
+from datetime import datetime, date, timedelta
+from decimal import Decimal
+from collections import defaultdict
 
 from models.caisse import Caisse
 from models.caisse_item import CaisseItem
-from models.pharmacy import Pharmacy
+from models.patient import Patient
+from repositories.cash_summary_repo import CashSummaryRepository
+from repositories.stock_ledger_repo import StockLedgerRepository
+
+# Types de ligne qui font sortir un produit du stock pharmacie
+STOCK_ITEM_TYPES = ("médicament", "medication", "carnet", "booklet")
+
+
+def stock_deltas(lines, sign: int = -1) -> dict:
+    """
+    Variations de stock {medication_id: ±quantité} d'un ensemble de lignes
+    (dicts de saisie ou CaisseItem), cumulées par produit.
+    sign=-1 pour une vente, +1 pour une remise en stock.
+    """
+    deltas = {}
+    for line in lines:
+        get = line.get if isinstance(line, dict) else lambda k: getattr(line, k)
+        if (get("item_type") or "").lower() in STOCK_ITEM_TYPES:
+            ref_id = get("item_ref_id")
+            deltas[ref_id] = deltas.get(ref_id, 0) + sign * get("quantity")
+    return deltas
+
+
+def _line_key(line) -> tuple:
+    """Clé de comparaison d'une ligne (dict de saisie ou CaisseItem) pour le diff des mises à jour."""
+    get = line.get if isinstance(line, dict) else lambda k: getattr(line, k)
+    return (
+        get("item_type"), get("item_ref_id"), Decimal(str(get("unit_price"))),
+        get("quantity"), Decimal(str(get("line_total"))), get("note") or None
+    )
+
+
+def _item_rows(transaction_id: int, lines) -> list:
+    """Lignes CaisseItem prêtes pour un INSERT multi-lignes."""
+    return [
+        {
+            "transaction_id": transaction_id,
+            "item_type":      line["item_type"],
+            "item_ref_id":    line["item_ref_id"],
+            "unit_price":     line["unit_price"],
+            "quantity":       line["quantity"],
+            "line_total":     line["line_total"],
+            "note":           line.get("note"),
+            "status":         'active',
+        }
+        for line in lines
+    ]
 
 
 class CaisseRepository:
     def __init__(self, session: Session):
         self.session = session
+        self.summary_repo = CashSummaryRepository(session)
+        self.ledger = StockLedgerRepository(session)
 
     def list_all(self):
         """
@@ -116,6 +166,79 @@ class CaisseRepository:
 
         return query.order_by(Caisse.paid_at.desc()).all()
 
+    def list_page(
+        self,
+        date_from: date = None,
+        date_to: date = None,
+        status: str = None,
+        payment_method: str = None,
+        term: str = None,
+        after: tuple[datetime, int] | None = None,
+        limit: int = 50
+    ) -> tuple[list[Caisse], tuple[datetime, int] | None]:
+        """
+        Page de transactions filtrée côté serveur, triée par (paid_at, transaction_id) DESC.
+         - date_from / date_to : bornes inclusives sur la date de paid_at
+         - status : 'active', 'cancelled' ou None (tous statuts)
+         - payment_method : ignoré si None, 'Tous' ou 'All'
+         - term : recherche partielle sur transaction_type ou created_by_name
+         - after : curseur (paid_at, transaction_id) de la dernière ligne déjà affichée
+        Le patient est chargé dans la même requête (projection patient_id + code_patient)
+        pour que tx.patient_by_id.code_patient ne déclenche pas une requête par ligne.
+        Renvoie (transactions, curseur_suivant) ; curseur_suivant vaut None en fin de liste.
+        """
+        query = (
+            self.session
+                .query(Caisse)
+                .options(
+                    joinedload(Caisse.patient_by_id)
+                        .load_only(Patient.patient_id, Patient.code_patient)
+                )
+        )
+
+        # Bornes semi-ouvertes sur paid_at (pas de func.date) pour utiliser l'index
+        if date_from is not None:
+            query = query.filter(
+                Caisse.paid_at >= datetime.combine(date_from, datetime.min.time())
+            )
+        if date_to is not None:
+            query = query.filter(
+                Caisse.paid_at < datetime.combine(date_to + timedelta(days=1), datetime.min.time())
+            )
+        if status:
+            query = query.filter(Caisse.status == status)
+        if payment_method and payment_method.lower() not in ("tous", "all"):
+            query = query.filter(Caisse.payment_method == payment_method)
+        if term:
+            term_like = f"%{term.lower()}%"
+            query = query.filter(
+                or_(
+                    func.lower(Caisse.transaction_type).like(term_like),
+                    func.lower(Caisse.created_by_name).like(term_like)
+                )
+            )
+        if after is not None:
+            last_paid_at, last_id = after
+            query = query.filter(
+                or_(
+                    Caisse.paid_at < last_paid_at,
+                    and_(Caisse.paid_at == last_paid_at, Caisse.transaction_id < last_id)
+                )
+            )
+
+        # On lit une ligne de plus pour savoir s'il reste une page
+        rows = (
+            query
+                .order_by(Caisse.paid_at.desc(), Caisse.transaction_id.desc())
+                .limit(limit + 1)
+                .all()
+        )
+        if len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        last = rows[-1]
+        return rows, (last.paid_at, last.transaction_id)
+
     def get_total_transactions(
         self,
         date_from: datetime | None = None,
@@ -170,45 +293,27 @@ class CaisseRepository:
         self.session.add(tx)
         self.session.flush()  # pour récupérer tx.transaction_id immédiatement
 
-        # 2) Création des lignes CaisseItem
         items = data.get("items", [])
-        for line in items:
-            item_type = line["item_type"]
-            ref_id    = line["item_ref_id"]
-            unit_price= line["unit_price"]
-            qty       = line["quantity"]
-            line_tot  = line["line_total"]
-            item_note = line.get("note")
-
-            # 2.a) Si c’est une vente de Médicament ou de Carnet, on décrémente le stock
-            if item_type.lower() in ("médicament", "medication", "carnet", "booklet"):
-                med = self.session.get(Pharmacy, ref_id)
-                if not med:
-                    raise ValueError(f"Produit introuvable pour ID={ref_id}")
-                if med.quantity < qty:
-                    raise ValueError(
-                        f"Stock insuffisant pour produit ID={ref_id}. "
-                        f"Demandé={qty}, disponible={med.quantity}"
-                    )
-                med.quantity -= qty
-                med.update_stock_status()
-                self.session.add(med)
-
-            # 2.b) Création du CaisseItem
-            caisse_item = CaisseItem(
-                transaction_id = tx.transaction_id,
-                item_type      = item_type,
-                item_ref_id    = ref_id,
-                unit_price     = unit_price,
-                quantity       = qty,
-                line_total     = line_tot,
-                note           = item_note,
-                status         = 'active'
+        try:
+            # 2) Sortie de stock des Médicaments / Carnets : UPDATE conditionnels + mouvements
+            self.ledger.apply(
+                stock_deltas(items), 'sale', created_by=current_user.username,
+                note=f"Vente caisse transaction #{tx.transaction_id}"
             )
-            self.session.add(caisse_item)
 
-        # 3) Commit final
-        self.session.commit()
+            # 3) Création des lignes CaisseItem (un seul INSERT multi-lignes)
+            if items:
+                self.session.execute(insert(CaisseItem), _item_rows(tx.transaction_id, items))
+
+            # 4) Une transaction antidatée rouvre la clôture du jour concerné
+            self.summary_repo.invalidate_days([tx.paid_at])
+
+            # 5) Commit final
+            self.session.commit()
+        except Exception:
+            # En-tête déjà flushé : rien ne doit rester en attente dans la session partagée
+            self.session.rollback()
+            raise
         return tx
 
     def update_transaction(self, transaction_id: int, data: dict, current_user) -> Caisse:
@@ -224,21 +329,9 @@ class CaisseRepository:
         if tx.status == 'cancelled':
             raise ValueError(f"Impossible de modifier une transaction annulée (ID={transaction_id}).")
 
-        # 2) Rétablir d'abord le stock des anciennes lignes (avant MAJ)
-        existing_items = list(tx.items)
-        for old_item in existing_items:
-            if old_item.item_type.lower() in ("médicament", "medication", "carnet", "booklet"):
-                med = self.session.get(Pharmacy, old_item.item_ref_id)
-                if med:
-                    med.quantity += old_item.quantity
-                    med.update_stock_status()
-                    self.session.add(med)
-        # Supprimer les anciennes lignes
-        for old_item in existing_items:
-            self.session.delete(old_item)
-        self.session.flush()
-
-        # 3) Mettre à jour les champs de l’en-tête
+        old_paid_at = tx.paid_at
+
+        # 2) Mettre à jour les champs de l’en-tête
         if "amount" in data:
             tx.amount = data["amount"]
         if "advance_amount" in data:
@@ -257,43 +350,51 @@ class CaisseRepository:
             tx.paid_at = data["paid_at"]
         # status reste inchangé (normalement 'active')
 
-        # 4) Réinsérer les nouvelles lignes
-        new_items = data.get("items", [])
-        for line in new_items:
-            item_type = line["item_type"]
-            ref_id    = line["item_ref_id"]
-            unit_price= line["unit_price"]
-            qty       = line["quantity"]
-            line_tot  = line["line_total"]
-            item_note = line.get("note")
-
-            if item_type.lower() in ("médicament", "medication", "carnet", "booklet"):
-                med = self.session.get(Pharmacy, ref_id)
-                if not med:
-                    raise ValueError(f"Produit introuvable pour ID={ref_id}")
-                if med.quantity < qty:
-                    raise ValueError(
-                        f"Stock insuffisant pour produit ID={ref_id}. "
-                        f"Demandé={qty}, disponible={med.quantity}"
+        # 3) Diff des lignes : les lignes identiques sont conservées, seules les
+        #    lignes retirées sont supprimées et les lignes ajoutées insérées
+        if "items" in data:
+            new_items = data.get("items") or []
+            old_by_key = defaultdict(list)
+            for item in tx.items:
+                old_by_key[_line_key(item)].append(item)
+            to_insert = []
+            for line in new_items:
+                same = old_by_key.get(_line_key(line))
+                if same:
+                    same.pop()          # ligne inchangée : conservée telle quelle
+                else:
+                    to_insert.append(line)
+            to_delete = [item for group in old_by_key.values() for item in group]
+
+            # 4) Stock : seule la variation nette par produit est appliquée
+            deltas = stock_deltas(to_delete, sign=+1)
+            for ref_id, d in stock_deltas(to_insert).items():
+                deltas[ref_id] = deltas.get(ref_id, 0) + d
+
+        try:
+            if "items" in data:
+                self.ledger.apply(
+                    deltas, 'sale_update', created_by=current_user.username,
+                    note=f"Modification transaction #{transaction_id}"
+                )
+                if to_delete:
+                    self.session.execute(
+                        delete(CaisseItem)
+                            .where(CaisseItem.item_id.in_([it.item_id for it in to_delete]))
+                            .execution_options(synchronize_session=False)
                     )
-                med.quantity -= qty
-                med.update_stock_status()
-                self.session.add(med)
-
-            new_item = CaisseItem(
-                transaction_id = transaction_id,
-                item_type      = item_type,
-                item_ref_id    = ref_id,
-                unit_price     = unit_price,
-                quantity       = qty,
-                line_total     = line_tot,
-                note           = item_note,
-                status         = 'active'
-            )
-            self.session.add(new_item)
+                if to_insert:
+                    self.session.execute(insert(CaisseItem), _item_rows(transaction_id, to_insert))
+                self.session.expire(tx, ["items"])
+
+            # 5) Rouvrir la clôture des journées touchées (ancienne et nouvelle date)
+            self.summary_repo.invalidate_days([old_paid_at, tx.paid_at])
 
-        # 5) Commit final
-        self.session.commit()
+            # 6) Commit final
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
         return tx
 
     def cancel_transaction(self, transaction_id: int, current_user) -> Caisse:
@@ -310,26 +411,35 @@ class CaisseRepository:
         if tx.status == 'cancelled':
             return tx
 
-        # 1) Rétablir le stock des lignes existantes
-        for item in tx.items:
-            if item.item_type.lower() in ("médicament", "medication", "carnet", "booklet"):
-                med = self.session.get(Pharmacy, item.item_ref_id)
-                if med:
-                    med.quantity += item.quantity
-                    med.update_stock_status()
-                    self.session.add(med)
-
-        # 2) Marquer la transaction comme annulée
-        tx.status = 'cancelled'
-        self.session.add(tx)
+        # Erreur de stock ou de verrou : la session partagée ne doit pas rester
+        # dans une transaction en échec avec un stock à moitié rétabli
+        try:
+            # 1) Rétablir le stock des lignes existantes
+            self.ledger.apply(
+                stock_deltas(tx.items, sign=+1), 'sale_cancel', created_by=current_user.username,
+                note=f"Annulation transaction #{transaction_id}"
+            )
+
+            # 2) Marquer la transaction comme annulée
+            tx.status = 'cancelled'
+            self.session.add(tx)
 
-        # 3) Marquer chaque ligne comme annulée
-        for item in tx.items:
-            item.status = 'cancelled'
-            self.session.add(item)
+            # 3) Marquer chaque ligne comme annulée (un seul UPDATE)
+            self.session.execute(
+                update(CaisseItem)
+                    .where(CaisseItem.transaction_id == transaction_id)
+                    .values(status='cancelled')
+                    .execution_options(synchronize_session=False)
+            )
+            self.session.expire(tx, ["items"])
+
+            self.summary_repo.invalidate_days([tx.paid_at])
 
-        # 4) Commit
-        self.session.commit()
+            # 4) Commit
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
         return tx
 
     def delete_transaction(self, transaction_id: int) -> Caisse:
@@ -338,6 +448,7 @@ class CaisseRepository:
         """
         tx = self.get_by_id(transaction_id)
         if tx:
+            self.summary_repo.invalidate_days([tx.paid_at])
             self.session.delete(tx)
             self.session.commit()
         return tx
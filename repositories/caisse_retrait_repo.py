@@ -3,6 +3,7 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from models.retrait import CaisseRetrait
+from repositories.cash_summary_repo import CashSummaryRepository
 from datetime import datetime
 
 
@@ -14,6 +15,7 @@ class CaisseRetraitRepository:
 
     def __init__(self, session: Session):
         self.session = session
+        self.summary_repo = CashSummaryRepository(session)
 
     def list_all(self) -> list[CaisseRetrait]:
         """
@@ -42,9 +44,12 @@ class CaisseRetraitRepository:
         new_retrait = CaisseRetrait(
             amount=amount,
             justification=justification,
-            handled_by=handled_by
+            handled_by=handled_by,
+            retrait_at=datetime.utcnow()
         )
         self.session.add(new_retrait)
+        # retrait_at est en UTC : peut tomber sur une journée locale déjà clôturée
+        self.summary_repo.invalidate_days([new_retrait.retrait_at])
         self.session.commit()
         return new_retrait
 
@@ -132,6 +137,7 @@ class CaisseRetraitRepository:
         retrait.cancelled_at         = datetime.utcnow()
         retrait.cancel_justification = justification
 
+        self.summary_repo.invalidate_days([retrait.retrait_at])
         self.session.commit()
         return retrait
 
@@ -0,0 +1,247 @@
+# repositories/cash_summary_repo.py
+
+from datetime import datetime, date, timedelta
+from sqlalchemy.orm import Session
+from sqlalchemy import func, select, insert, literal, union_all, String
+from sqlalchemy.dialects import postgresql, sqlite
+
+from models.caisse import Caisse
+from models.retrait import CaisseRetrait
+from models.caisse_cloture import CaisseCloture, CaisseClotureLigne, CaisseClotureVersion
+
+
+def utc_today() -> date:
+    """
+    Journée comptable courante. paid_at et retrait_at sont enregistrés en UTC
+    (datetime.utcnow) : les bornes de journée le sont aussi, sinon une journée
+    locale pourrait être clôturée avant la fin de la journée UTC correspondante.
+    """
+    return datetime.utcnow().date()
+
+
+def _as_date(value) -> date:
+    # func.date() renvoie un date sous PostgreSQL mais une chaîne sous SQLite
+    if isinstance(value, str):
+        return date.fromisoformat(value[:10])
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+class CashSummaryRepository:
+    """
+    Accès SQL pour les totaux de caisse :
+     - agrégation groupée transactions + retraits en une seule requête (UNION ALL),
+     - lecture / écriture des clôtures journalières (caisse_cloture*).
+    Les lignes renvoyées sont des dicts :
+      {day, kind, status, payment_method, transaction_type, total, nb}
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def aggregate(self, day_from: date, day_to: date) -> list[dict]:
+        """
+        Totaux groupés par jour / type de ligne / statut / mode de paiement / type
+        de transaction, pour les journées [day_from .. day_to] (inclusives).
+        Transactions et retraits sont lus dans la même requête.
+        """
+        start = datetime.combine(day_from, datetime.min.time())
+        end   = datetime.combine(day_to + timedelta(days=1), datetime.min.time())
+
+        tx_day = func.date(Caisse.paid_at)
+        q_tx = (
+            select(
+                tx_day.label("day"),
+                literal("tx", String).label("kind"),
+                Caisse.status.label("status"),
+                Caisse.payment_method.label("payment_method"),
+                Caisse.transaction_type.label("transaction_type"),
+                func.coalesce(func.sum(Caisse.amount), 0).label("total"),
+                func.count().label("nb"),
+            )
+            .where(Caisse.paid_at >= start, Caisse.paid_at < end)
+            .group_by(tx_day, Caisse.status, Caisse.payment_method, Caisse.transaction_type)
+        )
+
+        rt_day = func.date(CaisseRetrait.retrait_at)
+        q_rt = (
+            select(
+                rt_day.label("day"),
+                literal("retrait", String).label("kind"),
+                CaisseRetrait.status.label("status"),
+                literal(None, String).label("payment_method"),
+                literal(None, String).label("transaction_type"),
+                func.coalesce(func.sum(CaisseRetrait.amount), 0).label("total"),
+                func.count().label("nb"),
+            )
+            .where(CaisseRetrait.retrait_at >= start, CaisseRetrait.retrait_at < end)
+            .group_by(rt_day, CaisseRetrait.status)
+        )
+
+        result = self.session.execute(union_all(q_tx, q_rt))
+        return [
+            {
+                "day":              _as_date(row.day),
+                "kind":             row.kind,
+                "status":           row.status,
+                "payment_method":   row.payment_method,
+                "transaction_type": row.transaction_type,
+                "total":            float(row.total or 0),
+                "nb":               int(row.nb or 0),
+            }
+            for row in result
+        ]
+
+    def list_closed_days(self, day_from: date, day_to: date) -> set[date]:
+        """Renvoie l'ensemble des journées déjà clôturées dans [day_from .. day_to]."""
+        rows = (
+            self.session
+                .query(CaisseCloture.closure_date)
+                .filter(CaisseCloture.closure_date.between(day_from, day_to))
+                .all()
+        )
+        return {r.closure_date for r in rows}
+
+    def list_closure_lines(self, day_from: date, day_to: date) -> list[dict]:
+        """Lignes figées des journées clôturées dans [day_from .. day_to]."""
+        rows = (
+            self.session
+                .query(CaisseClotureLigne)
+                .filter(CaisseClotureLigne.closure_date.between(day_from, day_to))
+                .all()
+        )
+        return [
+            {
+                "day":              l.closure_date,
+                "kind":             l.kind,
+                "status":           l.status,
+                "payment_method":   l.payment_method,
+                "transaction_type": l.transaction_type,
+                "total":            float(l.total or 0),
+                "nb":               l.nb,
+            }
+            for l in rows
+        ]
+
+    def day_versions(self, days) -> dict:
+        """Version courante des journées `days` (0 si jamais modifiée), à lire avant l'agrégation."""
+        days = list(days)
+        if not days:
+            return {}
+        rows = (
+            self.session
+                .query(CaisseClotureVersion.closure_date, CaisseClotureVersion.version)
+                .filter(CaisseClotureVersion.closure_date.in_(days))
+                .all()
+        )
+        versions = {d: 0 for d in days}
+        versions.update({_as_date(d): v for d, v in rows})
+        return versions
+
+    def close_days(self, days: list[date], lines: list[dict], versions: dict) -> set:
+        """
+        Enregistre la clôture des journées `days` avec leurs lignes agrégées ;
+        renvoie les journées non clôturées car modifiées entre-temps.
+
+        `versions` est le résultat de day_versions() lu avant l'agrégation. Les
+        lignes de version sont créées puis verrouillées (FOR UPDATE) : une
+        modification en cours (invalidate_days non encore committé) fait attendre
+        ce verrou, puis sa version incrémentée écarte la journée. Seules les
+        journées dont la version n'a pas bougé sont clôturées ; les autres seront
+        ré-agrégées à la prochaine lecture.
+
+        Écriture sur sa propre connexion et sa propre transaction : appelée depuis
+        une lecture (CashSummaryService.get_summary), elle ne committe ni n'annule
+        la session de l'appelant. Si un autre poste a déjà clôturé une journée,
+        INSERT ... ON CONFLICT DO NOTHING la laisse telle quelle (la clôture
+        existante fait foi) et ses lignes ne sont pas réécrites.
+        """
+        if not days:
+            return set()
+        now = datetime.utcnow()
+        engine = self.session.get_bind()
+        with engine.begin() as conn:
+            dialect_name = conn.dialect.name
+            conn.execute(
+                self._insert(dialect_name, CaisseClotureVersion)
+                    .values([{"closure_date": d, "version": 0} for d in days])
+                    .on_conflict_do_nothing(index_elements=[CaisseClotureVersion.closure_date])
+            )
+            current = {
+                _as_date(d): v
+                for d, v in conn.execute(
+                    select(CaisseClotureVersion.closure_date, CaisseClotureVersion.version)
+                        .where(CaisseClotureVersion.closure_date.in_(days))
+                        .with_for_update()
+                )
+            }
+            stable = [d for d in days if current.get(d, 0) == versions.get(d, 0)]
+            if not stable:
+                return set(days)
+            closed = set(conn.execute(
+                self._insert(dialect_name, CaisseCloture)
+                    .values([{"closure_date": d, "closed_at": now} for d in stable])
+                    .on_conflict_do_nothing(index_elements=[CaisseCloture.closure_date])
+                    .returning(CaisseCloture.closure_date)
+            ).scalars())
+            mappings = [
+                {
+                    "closure_date":     l["day"],
+                    "kind":             l["kind"],
+                    "status":           l["status"],
+                    "payment_method":   l["payment_method"],
+                    "transaction_type": l["transaction_type"],
+                    "total":            l["total"],
+                    "nb":               l["nb"],
+                }
+                for l in lines if _as_date(l["day"]) in closed
+            ]
+            if mappings:
+                conn.execute(insert(CaisseClotureLigne), mappings)
+        return set(days) - set(stable)
+
+    @staticmethod
+    def _insert(dialect_name: str, model):
+        if dialect_name == "postgresql":
+            return postgresql.insert(model)
+        if dialect_name == "sqlite":
+            return sqlite.insert(model)
+        raise NotImplementedError(f"Clôtures de caisse non supportées pour le dialecte {dialect_name}")
+
+    def invalidate_days(self, days) -> None:
+        """
+        Supprime la clôture des journées passées touchées par une modification
+        (annulation, édition, suppression). Elles seront ré-agrégées à la prochaine
+        lecture. Ne committe pas : l'appelant committe avec sa propre modification.
+
+        La version de chaque journée est incrémentée d'abord : jusqu'au commit, la
+        ligne reste verrouillée et close_days attend puis écarte la journée au lieu
+        de la figer avec les totaux d'avant la modification.
+        """
+        days = {_as_date(d) for d in days if d is not None}
+        days = sorted(d for d in days if d < utc_today())
+        if not days:
+            return
+        upsert = self._insert(self.session.get_bind().dialect.name, CaisseClotureVersion)
+        self.session.execute(
+            upsert
+                .values([{"closure_date": d, "version": 1} for d in days])
+                .on_conflict_do_update(
+                    index_elements=[CaisseClotureVersion.closure_date],
+                    set_={"version": CaisseClotureVersion.version + 1},
+                )
+        )
+        # Lignes d'abord : ne dépend pas du ON DELETE CASCADE (absent sous SQLite sans PRAGMA)
+        (
+            self.session
+                .query(CaisseClotureLigne)
+                .filter(CaisseClotureLigne.closure_date.in_(days))
+                .delete(synchronize_session=False)
+        )
+        (
+            self.session
+                .query(CaisseCloture)
+                .filter(CaisseCloture.closure_date.in_(days))
+                .delete(synchronize_session=False)
+        )
@@ -0,0 +1,56 @@
+# repositories/counter_repo.py
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects import postgresql, sqlite
+from models.code_counter import CodeCounter
+
+
+class CounterRepository:
+    """
+    Attribution de valeurs de compteur (table code_counters) en un aller-retour :
+    UPDATE ... SET last_value = last_value + 1 RETURNING last_value.
+
+    L'incrément est exécuté et committé sur sa propre connexion, comme une séquence
+    PostgreSQL : le verrou sur la ligne ne dure que le temps de l'incrément et une
+    valeur n'est jamais redistribuée, même si la transaction appelante échoue
+    (il peut donc y avoir des trous, jamais de doublons).
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def next_value(self, scope: str, seed=None) -> int:
+        """
+        Renvoie la prochaine valeur du compteur `scope`.
+        seed : callable(connection) -> int, dernière valeur déjà utilisée, appelé
+               uniquement à la création du compteur (reprise de l'existant).
+        """
+        engine = self.session.get_bind()
+        with engine.begin() as conn:
+            value = conn.execute(
+                update(CodeCounter)
+                    .where(CodeCounter.scope == scope)
+                    .values(last_value=CodeCounter.last_value + 1)
+                    .returning(CodeCounter.last_value)
+            ).scalar()
+            if value is not None:
+                return value
+
+            # Première utilisation : création du compteur. ON CONFLICT couvre le cas
+            # où un autre poste le crée au même instant.
+            start = seed(conn) if seed else 0
+            stmt = self._insert(conn.dialect.name).values(scope=scope, last_value=start + 1)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[CodeCounter.scope],
+                set_={"last_value": CodeCounter.last_value + 1}
+            ).returning(CodeCounter.last_value)
+            return conn.execute(stmt).scalar_one()
+
+    @staticmethod
+    def _insert(dialect_name: str):
+        if dialect_name == "postgresql":
+            return postgresql.insert(CodeCounter)
+        if dialect_name == "sqlite":
+            return sqlite.insert(CodeCounter)
+        raise NotImplementedError(f"Compteurs non supportés pour le dialecte {dialect_name}")
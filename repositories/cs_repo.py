@@ -1,8 +1,9 @@
 # repositories/consultation_spirituel_repo.py
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, contains_eager
 from models.consultation_spirituelle import ConsultationSpirituel
-from datetime import datetime
-from sqlalchemy import desc
+from models.patient import Patient
+from datetime import datetime, date, timedelta
+from sqlalchemy import desc, func, or_, select
 #from models.consultation_spirituelle import ConsultationSpirituel
 
 class ConsultationSpirituelRepository:
@@ -13,6 +14,96 @@ class ConsultationSpirituelRepository:
     def list_all(self):
         return self.session.query(ConsultationSpirituel).all()
 
+    def _filtered_query(self, type_filter: str = None, term: str = None,
+                        date_from: date = None, date_to: date = None):
+        """
+        Consultations filtrées, patient chargé par la même requête (JOIN) et
+        limité aux colonnes affichées (code, nom, prénom).
+         - type_filter : ignoré si None ou 'Tous'
+         - term : recherche partielle sur code patient, nom ou prénom
+         - date_from / date_to : bornes inclusives sur consultation_date
+        """
+        CS = ConsultationSpirituel
+        query = (
+            self.session.query(CS)
+                .join(CS.patient)
+                .options(
+                    contains_eager(CS.patient).load_only(
+                        Patient.patient_id, Patient.code_patient,
+                        Patient.first_name, Patient.last_name
+                    )
+                )
+        )
+        if type_filter and type_filter != "Tous":
+            query = query.filter(CS.type_consultation == type_filter)
+        if term:
+            like = f"%{term.lower()}%"
+            query = query.filter(or_(
+                func.lower(Patient.code_patient).like(like),
+                func.lower(Patient.last_name).like(like),
+                func.lower(Patient.first_name).like(like)
+            ))
+        # Bornes semi-ouvertes (pas de func.date) pour rester sur l'index
+        if date_from is not None:
+            query = query.filter(CS.consultation_date >= datetime.combine(date_from, datetime.min.time()))
+        if date_to is not None:
+            query = query.filter(
+                CS.consultation_date < datetime.combine(date_to + timedelta(days=1), datetime.min.time())
+            )
+        return query
+
+    def list_page(self, type_filter: str = None, term: str = None,
+                  date_from: date = None, date_to: date = None,
+                  page: int = 1, per_page: int = 100):
+        """
+        Page de consultations (plus récentes d'abord) et nombre total de
+        consultations correspondant aux filtres : (consultations, total).
+        """
+        query = self._filtered_query(type_filter, term, date_from, date_to)
+        total = self.count_filtered(type_filter, term, date_from, date_to)
+        rows = (
+            query
+                .order_by(ConsultationSpirituel.consultation_date.desc(),
+                          ConsultationSpirituel.consultation_id.desc())
+                .offset((max(1, page) - 1) * per_page)
+                .limit(per_page)
+                .all()
+        )
+        return rows, total
+
+    def count_filtered(self, type_filter: str = None, term: str = None,
+                       date_from: date = None, date_to: date = None) -> int:
+        return self._filtered_query(type_filter, term, date_from, date_to).order_by(None).count()
+
+    def list_filtered(self, type_filter: str = None, term: str = None,
+                      date_from: date = None, date_to: date = None):
+        """Toutes les consultations correspondant aux filtres (export)."""
+        return (
+            self._filtered_query(type_filter, term, date_from, date_to)
+                .order_by(ConsultationSpirituel.consultation_date.desc(),
+                          ConsultationSpirituel.consultation_id.desc())
+                .all()
+        )
+
+    def iter_filtered(self, type_filter: str = None, term: str = None,
+                      date_from: date = None, date_to: date = None,
+                      batch_size: int = 1000):
+        """Comme list_filtered, mais lu par lots (curseur serveur) pour les gros exports."""
+        yield from (
+            self._filtered_query(type_filter, term, date_from, date_to)
+                .order_by(ConsultationSpirituel.consultation_date.desc(),
+                          ConsultationSpirituel.consultation_id.desc())
+                .yield_per(batch_size)
+        )
+
+    def list_types(self) -> list:
+        """Types de consultation présents en base (SELECT DISTINCT), triés."""
+        return list(self.session.execute(
+            select(ConsultationSpirituel.type_consultation)
+                .distinct()
+                .order_by(ConsultationSpirituel.type_consultation)
+        ).scalars())
+
     def find_by_patient(self, patient_id: int):
         return (self.session.query(ConsultationSpirituel)
                 .filter_by(patient_id=patient_id).all())
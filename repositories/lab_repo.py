@@ -1,15 +1,63 @@
-from sqlalchemy.orm import Session, joinedload, subqueryload
+from sqlalchemy.orm import Session, joinedload, subqueryload, selectinload
 from models.lab import (
     Examen, Parametre, ReferenceRange, 
     LabResult, LabResultDetail
 )
-from typing import List, Optional, Dict
-from datetime import datetime
-from sqlalchemy import func, desc
+from typing import List, Optional, Dict, Iterable
+from datetime import datetime, date
+from decimal import Decimal, InvalidOperation
+from sqlalchemy import func, desc, select, insert
+from models.patient import Patient
+from service.reference_range_index import reference_range_index
+from repositories.counter_repo import CounterRepository
+
+
+def age_on(birth_date: Optional[date], day: Optional[date] = None) -> Optional[int]:
+    """Âge révolu à la date `day` (aujourd'hui par défaut)."""
+    if birth_date is None:
+        return None
+    day = day or date.today()
+    return day.year - birth_date.year - ((day.month, day.day) < (birth_date.month, birth_date.day))
+
+
+def normalize_sex(sex: Optional[str]) -> str:
+    """'M' / 'F' (première lettre, majuscule), 'X' si inconnu."""
+    return (sex or 'X').strip()[:1].upper() or 'X'
+
+
+def parse_numeric(value) -> Optional[Decimal]:
+    """Valeur numérique d'une saisie ('12,5' → 12.5), None si non numérique ou non finie (NaN, Infinity)."""
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        number = Decimal(str(value).strip().replace(',', '.'))
+    except InvalidOperation:
+        return None
+    return number if number.is_finite() else None
+
+
+def interpret_value(value, rr):
+    """(interpretation, flagged) d'une valeur pour la plage rr ; None si non interprétable."""
+    if rr is None or value is None:
+        return None
+    if rr.valeur_min <= value <= rr.valeur_max:
+        return "normal", False
+    return "abnormal", True
+
+
+def apply_interpretation(detail: LabResultDetail, rr) -> bool:
+    """Renseigne interpretation / flagged d'après la plage ; False si non interprétable."""
+    found = interpret_value(detail.valeur_num, rr)
+    if found is None:
+        return False
+    detail.interpretation, detail.flagged = found
+    return True
+
 
 class LabRepository:
     def __init__(self, session: Session):
         self.session = session
+        self.counters = CounterRepository(session)
         
     
     # Examens
@@ -65,6 +113,7 @@ class LabRepository:
         ref_range = ReferenceRange(**data)
         self.session.add(ref_range)
         self.session.commit()
+        reference_range_index.invalidate()
         self.session.refresh(ref_range)
         return ref_range
 
@@ -91,6 +140,60 @@ class LabRepository:
         self.session.refresh(result)
         return result
     
+    def create_result_with_details(self, data: dict, details: List[dict], interpret: bool = True,
+                                   patient_age: Optional[int] = None,
+                                   patient_sex: Optional[str] = None) -> int:
+        """
+        Crée l'en-tête et tous ses détails dans une seule transaction :
+        INSERT ... RETURNING pour l'en-tête, puis un INSERT multi-lignes (executemany)
+        pour les détails. En cas d'erreur rien n'est conservé.
+        valeur_num est déduite de valeur_text si absente ; avec interpret=True les
+        détails sont interprétés à l'insertion (reference_range_index), l'âge et le
+        sexe étant ceux du patient s'ils ne sont pas fournis.
+        Renvoie le result_id créé.
+        """
+        rows = []
+        for d in details:
+            row = {
+                'parametre_id': d['parametre_id'],
+                'valeur_text':  d['valeur_text'],
+                'valeur_num':   d.get('valeur_num'),
+            }
+            if row['valeur_num'] is None:
+                row['valeur_num'] = parse_numeric(d['valeur_text'])
+            row['interpretation'] = d.get('interpretation')
+            row['flagged'] = d.get('flagged', False)
+            rows.append(row)
+
+        try:
+            if interpret:
+                patient_id = data.get('patient_id')
+                if patient_id is not None and (patient_age is None or patient_sex is None):
+                    birth, gender = self.session.execute(
+                        select(Patient.birth_date, Patient.gender).where(Patient.patient_id == patient_id)
+                    ).one_or_none() or (None, None)
+                    patient_age = patient_age if patient_age is not None else age_on(birth)
+                    patient_sex = patient_sex or gender
+                sex = normalize_sex(patient_sex)
+                for row in rows:
+                    rr = reference_range_index.lookup(self.session, row['parametre_id'], patient_age, sex)
+                    found = interpret_value(row['valeur_num'], rr)
+                    if found is not None:
+                        row['interpretation'], row['flagged'] = found
+
+            result_id = self.session.execute(
+                insert(LabResult).values(**data).returning(LabResult.result_id)
+            ).scalar_one()
+            if rows:
+                for row in rows:
+                    row['result_id'] = result_id
+                self.session.execute(insert(LabResultDetail), rows)
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+        return result_id
+
     def update_lab_result(self, result_id: int, data: dict) -> Optional[LabResult]:
         result = self.session.get(LabResult, result_id)
         if result:
@@ -134,6 +237,54 @@ class LabRepository:
                 .all()
         )
     
+    def list_worklist(self, status: str, page: int = 1, per_page: int = 50,
+                      oldest_first: bool = True):
+        """
+        Liste de travail légère : uniquement les colonnes de synthèse du résultat,
+        du patient (dont birth_date / gender) et le nom de l'examen, sans charger
+        les détails. Triée par test_date, paginée (index (status, test_date)).
+        """
+        order = LabResult.test_date.asc() if oldest_first else LabResult.test_date.desc()
+        return (
+            self.session
+                .query(
+                    LabResult.result_id,
+                    LabResult.code_lab_patient,
+                    LabResult.test_date,
+                    LabResult.status,
+                    Patient.first_name,
+                    Patient.last_name,
+                    Patient.birth_date,
+                    Patient.gender,
+                    Examen.nom.label("examen_name"),
+                )
+                .outerjoin(Patient, Patient.patient_id == LabResult.patient_id)
+                .outerjoin(Examen, Examen.id == LabResult.examen_id)
+                .filter(LabResult.status == status)
+                .order_by(order, LabResult.result_id)
+                .offset((max(page, 1) - 1) * per_page)
+                .limit(per_page)
+                .all()
+        )
+
+    def count_by_status(self, status: str) -> int:
+        return (
+            self.session
+                .query(func.count(LabResult.result_id))
+                .filter(LabResult.status == status)
+                .scalar()
+        )
+
+    def get_patient_profile(self, result_id: int):
+        """(birth_date, gender) du patient d'un résultat, sans charger le résultat."""
+        return (
+            self.session
+                .query(Patient.birth_date, Patient.gender)
+                .join(LabResult, LabResult.patient_id == Patient.patient_id)
+                .filter(LabResult.result_id == result_id)
+                .one_or_none()
+        ) or (None, None)
+
     # Détails de résultats
     def add_result_detail(self, data: dict) -> LabResultDetail:
         detail = LabResultDetail(**data)
@@ -151,60 +302,124 @@ class LabRepository:
             return detail
         return None
     
+    def _interpret_details(self, details, patient_age, patient_sex) -> int:
+        """
+        Interprétation en mémoire des détails via reference_range_index
+        (aucune requête une fois l'index chargé) ; renvoie le nombre interprétés.
+        """
+        sex = normalize_sex(patient_sex)
+        done = 0
+        for detail in details:
+            rr = reference_range_index.lookup(self.session, detail.parametre_id, patient_age, sex)
+            done += apply_interpretation(detail, rr)
+        return done
+
     def interpret_result(self, detail_id: int, patient_age: int, patient_sex: str) -> Optional[LabResultDetail]:
         detail = self.session.get(LabResultDetail, detail_id)
-        if not detail or not detail.valeur_num:
+        if not detail or detail.valeur_num is None:
             return None
         
-        # Trouver la plage de référence appropriée
-        ref_range = self.session.query(ReferenceRange).filter(
-            ReferenceRange.parametre_id == detail.parametre_id,
-            ReferenceRange.sexe.in_(['X', patient_sex]),
-            ReferenceRange.age_min <= patient_age,
-            ReferenceRange.age_max >= patient_age
-        ).first()
-        
-        if ref_range:
-            if ref_range.valeur_min <= detail.valeur_num <= ref_range.valeur_max:
-                detail.interpretation = "normal"
-                detail.flagged = False
-            else:
-                detail.interpretation = "abnormal"
-                detail.flagged = True
+        # Plage de référence appropriée : recherchée dans l'index en mémoire
+        if self._interpret_details([detail], patient_age, patient_sex):
             self.session.commit()
         return detail
     
-    def complete_result(self, result_id: int, patient_age: int, patient_sex: str) -> Optional[LabResult]:
+    def complete_result(self, result_id: int, patient_age: Optional[int] = None,
+                        patient_sex: Optional[str] = None) -> Optional[LabResult]:
+        """
+        Interprète tous les détails du résultat et le passe en 'completed' :
+        plages lues dans reference_range_index, un seul commit.
+        Âge / sexe : ceux fournis, sinon ceux du patient.
+        """
         result = self.get_full_lab_result(result_id)
         if not result:
             return None
-        
-        for detail in result.details:
-            self.interpret_result(detail.detail_id, patient_age, patient_sex)
-        
+
+        if patient_age is None and result.patient is not None:
+            patient_age = age_on(result.patient.birth_date)
+        if patient_sex is None and result.patient is not None:
+            patient_sex = result.patient.gender
+
+        self._interpret_details(result.details, patient_age, patient_sex)
         result.status = 'completed'
         self.session.commit()
         return result
+
+    def preview_interpretation(self, parametre_id: int, value, patient_age: Optional[int] = None,
+                               patient_sex: Optional[str] = None):
+        """
+        Interprétation d'une valeur saisie, sans rien écrire (aperçu dans les
+        formulaires). Renvoie (plage, interpretation, flagged) ou None.
+        """
+        rr = reference_range_index.lookup(self.session, parametre_id, patient_age, normalize_sex(patient_sex))
+        found = interpret_value(value, rr)
+        if found is None:
+            return None
+        return (rr, *found)
+
+    def complete_results(self, result_ids: Iterable[int]) -> List[LabResult]:
+        """
+        Validation par lot (fin de service) : interprète et clôture tous les
+        résultats donnés, avec l'âge / sexe de chaque patient.
+        2 requêtes (résultats + patients, détails) et un seul commit.
+        """
+        ids = list({rid for rid in result_ids if rid is not None})
+        if not ids:
+            return []
+        results = (
+            self.session
+                .query(LabResult)
+                .options(joinedload(LabResult.patient), selectinload(LabResult.details))
+                .filter(LabResult.result_id.in_(ids))
+                .all()
+        )
+        today = date.today()
+        for r in results:
+            patient = r.patient
+            self._interpret_details(
+                r.details,
+                age_on(patient.birth_date, today) if patient else None,
+                patient.gender if patient else None
+            )
+            r.status = 'completed'
+        self.session.commit()
+        return results
     
 
     def generate_lab_code(self, patient_id: Optional[int]) -> str:
+        """
+        Code labo du jour : MMJJJ-rang (EXT- pour un patient externe).
+        Le rang vient d'un compteur par jour ('lab:AAAAMMJJ') incrémenté en une
+        instruction UPDATE ... RETURNING : pas de doublon entre deux postes.
+        """
         today = datetime.now()
         month = today.strftime("%m")
         doy_str = f"{today.timetuple().tm_yday:03d}"
-        # count des tests déjà enregistrés aujourd'hui
-        start = today.replace(hour=0, minute=0, second=0, microsecond=0)
-        end   = today.replace(hour=23, minute=59, second=59, microsecond=999999)
-        count_today = (
-            self.session
-                .query(func.count(LabResult.result_id))
-                .filter(LabResult.test_date.between(start, end))
-                .scalar()
-            or 0
+        rank = self.counters.next_value(
+            f"lab:{today:%Y%m%d}",
+            seed=lambda conn: self._max_rank_for_day(conn, today)
         )
-        rank = count_today + 1
         base = f"{month}{doy_str}-{rank}"
         return f"EXT-{base}" if patient_id is None else base
 
+    @staticmethod
+    def _max_rank_for_day(conn, day: datetime) -> int:
+        """
+        Plus grand rang déjà attribué ce jour-là (0 si aucun) : initialise le
+        compteur du jour sur une base qui contient déjà des résultats.
+        """
+        start = day.replace(hour=0, minute=0, second=0, microsecond=0)
+        end   = day.replace(hour=23, minute=59, second=59, microsecond=999999)
+        codes = conn.execute(
+            select(LabResult.code_lab_patient).where(LabResult.test_date.between(start, end))
+        ).scalars()
+        best = 0
+        for code in codes:
+            rest = (code or "").rsplit("-", 1)[-1]
+            if rest.isdigit():
+                best = max(best, int(rest))
+        return best
+
     
 
 
@@ -254,6 +469,7 @@ class LabRepository:
         for key, val in data.items():
             setattr(rr, key, val)
         self.session.commit()
+        reference_range_index.invalidate()
         self.session.refresh(rr)
         return rr
 
@@ -264,4 +480,5 @@ class LabRepository:
             return False
         self.session.delete(rr)
         self.session.commit()
+        reference_range_index.invalidate()
         return True
\ No newline at end of file
@@ -2,7 +2,10 @@ from sqlalchemy import text, func, desc
 from models.database import DatabaseManager
 from sqlalchemy.orm import Session
 from models.medical_record import MedicalRecord
-from sqlalchemy.orm import joinedload
+from models.patient import Patient
+from sqlalchemy.orm import joinedload, contains_eager
+from sqlalchemy import or_
+from datetime import datetime
 from datetime import date, timedelta
 from typing import List
 
@@ -12,12 +15,77 @@ class MedicalRecordRepository:
         self.model = MedicalRecord
 
 
-    def list_records(self, patient_id=None, page=1, per_page=20):
-        #q = self.session.query(MedicalRecord).options(joinedload(MedicalRecord.patient))
-        q = self.session.query(MedicalRecord)
+    def _records_query(self, patient_id=None, date_from: date = None, date_to: date = None,
+                       motif_code: str = None, severity: str = None, search: str = None):
+        """
+        Dossiers filtrés côté base, patient chargé dans la même requête (JOIN,
+        colonnes code / nom / prénom seulement).
+         - date_from / date_to : bornes inclusives sur consultation_date
+         - motif_code, severity : égalité stricte (None = pas de filtre)
+         - search : recherche partielle sur code patient, nom, prénom ou « nom prénom »
+        """
+        q = (
+            self.session.query(MedicalRecord)
+                .join(MedicalRecord.patient)
+                .options(
+                    contains_eager(MedicalRecord.patient).load_only(
+                        Patient.patient_id, Patient.code_patient,
+                        Patient.first_name, Patient.last_name
+                    )
+                )
+        )
         if patient_id:
-            q = q.filter_by(patient_id=patient_id)
-        return q.offset((page-1)*per_page).limit(per_page).all()
+            q = q.filter(MedicalRecord.patient_id == patient_id)
+        # Bornes semi-ouvertes (pas de func.date) : index (…, consultation_date) utilisable
+        if date_from is not None:
+            q = q.filter(MedicalRecord.consultation_date >= datetime.combine(date_from, datetime.min.time()))
+        if date_to is not None:
+            q = q.filter(
+                MedicalRecord.consultation_date < datetime.combine(date_to + timedelta(days=1), datetime.min.time())
+            )
+        if motif_code:
+            q = q.filter(MedicalRecord.motif_code == motif_code)
+        if severity:
+            q = q.filter(MedicalRecord.severity == severity)
+        if search:
+            like = f"%{search.lower()}%"
+            q = q.filter(or_(
+                func.lower(Patient.code_patient).like(like),
+                func.lower(Patient.last_name).like(like),
+                func.lower(Patient.first_name).like(like),
+                func.lower(Patient.last_name + ' ' + Patient.first_name).like(like)
+            ))
+        return q
+
+    def list_records(self, patient_id=None, page=1, per_page=20, **filters):
+        """
+        Dossiers filtrés (voir _records_query), du plus récent au plus ancien.
+        per_page=None : tous les dossiers correspondants (export).
+        """
+        q = (
+            self._records_query(patient_id, **filters)
+                .order_by(MedicalRecord.consultation_date.desc(), MedicalRecord.record_id.desc())
+        )
+        if per_page is not None:
+            q = q.offset((page-1)*per_page).limit(per_page)
+        return q.all()
+
+    def iter_records(self, patient_id=None, batch_size: int = 1000, **filters):
+        """
+        Mêmes dossiers et même ordre que list_records(per_page=None), lus par
+        lots de `batch_size` (curseur serveur) : l'export ne charge jamais
+        toute la sélection en mémoire.
+        """
+        q = (
+            self._records_query(patient_id, **filters)
+                .order_by(MedicalRecord.consultation_date.desc(), MedicalRecord.record_id.desc())
+                .yield_per(batch_size)
+        )
+        yield from q
+
+    def count_records(self, patient_id=None, **filters) -> int:
+        """Nombre de dossiers correspondant aux mêmes filtres que list_records."""
+        return self._records_query(patient_id, **filters).order_by(None).count()
 
     def get(self, record_id):
         return self.session.get(MedicalRecord, record_id)
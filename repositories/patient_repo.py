@@ -2,15 +2,63 @@
 from datetime import date
 from sqlalchemy import text
 from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
 from models.database import DatabaseManager
 from models.patient import Patient
-from sqlalchemy import func
+from sqlalchemy import func, select
 from models.user import User
 from models.application_role import ApplicationRole
+from repositories.counter_repo import CounterRepository
+from repositories.patient_search_repo import PatientSearchRepository
+
+def patient_to_dict(p: Patient) -> dict:
+    """Représentation dict d'un Patient (partagée par les repositories sync et async)."""
+    return {
+        'patient_id': p.patient_id,
+        'code_patient': p.code_patient,
+        'first_name': p.first_name,
+        'last_name': p.last_name,
+        'birth_date': p.birth_date,
+        'gender': p.gender,
+        'national_id': p.national_id,
+        'contact_phone': p.contact_phone,
+        'assurance': p.assurance,
+        'residence': p.residence,
+        'father_name': p.father_name,
+        'mother_name': p.mother_name
+    }
+
+
+def normalize_patient_code(code: str) -> str:
+    """trim + majuscules + préfixe 'AH2-' si absent."""
+    raw = code.strip().upper()
+    if not raw.startswith("AH2-"):
+        raw = "AH2-" + raw
+    return raw
+
+
+def created_by_role(role_name: str):
+    """
+    Critère « patient créé par un utilisateur du rôle role_name », sous forme de
+    sous-requête IN sur les user_id du rôle (index patients.created_by) plutôt
+    qu'une jointure users / application_roles sur toute la table patients.
+    """
+    creators = (
+        select(User.user_id)
+            .join(ApplicationRole, User.role_id == ApplicationRole.role_id)
+            .where(func.lower(ApplicationRole.role_name) == role_name.lower())
+    )
+    return Patient.created_by.in_(creators)
+
 
 class PatientRepository:
+    # Nombre de tentatives si le code attribué existe déjà (code saisi hors compteur)
+    CODE_RETRIES = 5
+
     def __init__(self, session: Session):
         self.session = session
+        self.counters = CounterRepository(session)
+        self.search = PatientSearchRepository(session)
 
     def generate_patient_code(
         self,
@@ -33,22 +81,33 @@ class PatientRepository:
         last_initial = (last_name or 'X')[0].upper()
 
         base_code = f"{prefix}{ymd}{last_initial}{parent_initial}"
-        code = base_code
-        i = 1
-        while self.session.query(Patient).filter(Patient.code_patient == code).first():
-            i += 1
-            code = f"{base_code}{i}"
 
-        return code
+        # Compteur par préfixe : 1 → base_code, n → base_code + n (un seul aller-retour)
+        suffix = self.counters.next_value(
+            f"patient:{base_code}",
+            seed=lambda conn: self._max_code_suffix(conn, base_code)
+        )
+        return base_code if suffix == 1 else f"{base_code}{suffix}"
+
+    @staticmethod
+    def _max_code_suffix(conn, base_code: str) -> int:
+        """
+        Plus grand suffixe déjà utilisé pour base_code (0 si aucun), en une requête
+        LIKE 'base%'. Sert à initialiser le compteur sur une base existante.
+        """
+        codes = conn.execute(
+            select(Patient.code_patient).where(Patient.code_patient.like(f"{base_code}%"))
+        ).scalars()
+        best = 0
+        for code in codes:
+            rest = code[len(base_code):]
+            if rest == "":
+                best = max(best, 1)
+            elif rest.isdigit():
+                best = max(best, int(rest))
+        return best
 
     def create_patient(self, data: dict, current_user) -> int:
-        code = self.generate_patient_code(
-            birth_date  = data['birth_date'],
-            last_name   = data['last_name'],
-            first_name  = data['first_name'],
-            mother_name = data.get('mother_name', '')
-            
-        )
         sql = text("""
             CALL public.create_patient(
                 :code_patient, :first_name, :last_name, :birth_date,
@@ -58,7 +117,6 @@ class PatientRepository:
                    ) """
         )
         params = {
-            'code_patient'  : code,
             'first_name'    : data['first_name'],
             'last_name'     : data['last_name'],
             'birth_date'    : data['birth_date'],
@@ -74,10 +132,25 @@ class PatientRepository:
             'last_updated_by': current_user.user_id,
             'last_updated_by_name':current_user.username
         }
-        self.session.execute(sql, params)
-        new_id = self.session.execute(text("SELECT currval('patients_patient_id_seq')")).scalar_one()
-        self.session.commit()
-        return new_id, code
+        for attempt in range(self.CODE_RETRIES):
+            code = self.generate_patient_code(
+                birth_date  = data['birth_date'],
+                last_name   = data['last_name'],
+                first_name  = data['first_name'],
+                mother_name = data.get('mother_name', '')
+                
+            )
+            params['code_patient'] = code
+            try:
+                self.session.execute(sql, params)
+                new_id = self.session.execute(text("SELECT currval('patients_patient_id_seq')")).scalar_one()
+                self.session.commit()
+                return new_id, code
+            except IntegrityError as e:
+                # Code déjà pris (créé hors compteur) : le compteur a avancé, on réessaie
+                self.session.rollback()
+                if 'code_patient' not in str(e.orig) or attempt == self.CODE_RETRIES - 1:
+                    raise
 
     def update_patient(self, patient_id: int, data: dict, current_user) -> int:
         sql = text("""
@@ -112,32 +185,74 @@ class PatientRepository:
         p = self.session.query(Patient).get(patient_id)
         if not p:
             return None
-        return {
-            'patient_id': p.patient_id,
-            'code_patient': p.code_patient,
-            'first_name': p.first_name,
-            'last_name': p.last_name,
-            'birth_date': p.birth_date,
-            'gender': p.gender,
-            'national_id': p.national_id,
-            'contact_phone': p.contact_phone,
-            'assurance': p.assurance,
-            'residence': p.residence,
-            'father_name': p.father_name,
-            'mother_name': p.mother_name
-        }
+        return patient_to_dict(p)
 
-    def list_patients(self, page: int=1, per_page: int=10, search: str=None):
-        query = self.session.query(Patient)
+    def get_codes_by_ids(self, ids) -> dict:
+        """
+        Renvoie {patient_id: code_patient} pour tous les IDs fournis, en une seule requête.
+        Les IDs None ou inexistants sont ignorés.
+        """
+        ids = {pid for pid in ids if pid is not None}
+        if not ids:
+            return {}
+        rows = (
+            self.session
+                .query(Patient.patient_id, Patient.code_patient)
+                .filter(Patient.patient_id.in_(ids))
+                .all()
+        )
+        return {pid: code for pid, code in rows}
+
+    def list_patients(self, page: int=1, per_page: int=10, search: str=None,
+                      creator_role: str=None):
+        """
+        Page de patients triés par nom ; avec `search`, recherche classée.
+        creator_role : restreint aux patients créés par un utilisateur de ce rôle.
+        """
         if search:
-            term = f"%{search}%"
-            query = query.filter(
-                Patient.first_name.ilike(term) |
-                Patient.last_name.ilike(term) |
-                Patient.national_id.ilike(term) |
-                Patient.code_patient.ilike(term)
-            )
+            return self.search_patients(search, page, per_page, creator_role)[0]
+        query = self.session.query(Patient)
+        if creator_role:
+            query = query.filter(created_by_role(creator_role))
         return query.order_by(Patient.last_name).offset((page-1)*per_page).limit(per_page).all()
+
+    def iter_patients(self, search: str=None, creator_role: str=None,
+                      batch_size: int=1000):
+        """
+        Tous les patients (même tri et mêmes filtres que list_patients), lus
+        par lots de `batch_size` pour l'export : curseur serveur (yield_per)
+        sans recherche, pages successives de la recherche classée sinon.
+        """
+        if search:
+            page = 1
+            while True:
+                rows, total = self.search_patients(search, page, batch_size, creator_role)
+                yield from rows
+                if not rows or page * batch_size >= total:
+                    return
+                page += 1
+        query = self.session.query(Patient)
+        if creator_role:
+            query = query.filter(created_by_role(creator_role))
+        yield from query.order_by(Patient.last_name, Patient.patient_id).yield_per(batch_size)
+
+    def count_patients(self, search: str=None, creator_role: str=None) -> int:
+        """Nombre de patients que iter_patients renverrait."""
+        if search:
+            return self.search_patients(search, 1, 1, creator_role)[1]
+        query = self.session.query(func.count(Patient.patient_id))
+        if creator_role:
+            query = query.filter(created_by_role(creator_role))
+        return query.scalar()
+
+    def search_patients(self, term: str, page: int=1, per_page: int=10,
+                        creator_role: str=None):
+        """
+        Recherche classée par pertinence (index trigrammes / FTS5, voir
+        PatientSearchRepository). Renvoie (patients de la page, total).
+        """
+        filters = (created_by_role(creator_role),) if creator_role else ()
+        return self.search.search(term, page, per_page, filters=filters)
     
     def find_by_code(self, code: str):
         """
@@ -151,9 +266,7 @@ class PatientRepository:
             return None
 
         # 1) Normalisation de la saisie :
-        raw = code.strip().upper()
-        if not raw.startswith("AH2-"):
-            raw = "AH2-" + raw
+        raw = normalize_patient_code(code)
 
         # 2) Requête case-insensitive sur code_patient
         return (
@@ -166,13 +279,11 @@ class PatientRepository:
     def find_by_creator_role(self, role_name: str):
         """
         Renvoie tous les patients dont le créateur a pour role_name (secrétaire, etc.).
+        Sans pagination : préférer list_patients(creator_role=...) pour les écrans.
         """
         return (
             self.session.query(Patient)
-                .join(User, Patient.created_by == User.user_id)
-                .join(ApplicationRole, User.role_id == ApplicationRole.role_id)
-                # on compare sur role_name, pas name
-                .filter(func.lower(ApplicationRole.role_name) == role_name.lower())
+                .filter(created_by_role(role_name))
                 .order_by(Patient.last_name)
                 .all()
         )
@@ -0,0 +1,52 @@
+# repositories/patient_repo_async.py
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.patient import Patient
+from repositories.patient_repo import patient_to_dict, normalize_patient_code, created_by_role
+from repositories.patient_search_repo import PatientSearchRepository
+
+
+class AsyncPatientRepository:
+    """
+    Variante asynchrone (AsyncSession) des lectures de PatientRepository,
+    utilisée par les endpoints async de l'API. Même sémantique que la version sync.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_by_id(self, patient_id: int) -> dict:
+        p = await self.session.get(Patient, patient_id)
+        if not p:
+            return None
+        return patient_to_dict(p)
+
+    async def list_patients(self, page: int=1, per_page: int=10, search: str=None,
+                            creator_role: str=None):
+        """
+        Même recherche / pagination que PatientRepository.list_patients.
+        Avec `search`, la recherche classée de PatientSearchRepository (index
+        trigrammes / FTS5, mêmes résultats et même ordre que la route sync) est
+        exécutée telle quelle via run_sync, sur la connexion de la session async.
+        creator_role : restreint aux patients créés par un utilisateur de ce rôle.
+        """
+        filters = (created_by_role(creator_role),) if creator_role else ()
+        if search:
+            patients, _ = await self.session.run_sync(
+                lambda session: PatientSearchRepository(session).search(search, page, per_page, filters=filters)
+            )
+            return patients
+        stmt = select(Patient).where(*filters)
+        stmt = stmt.order_by(Patient.last_name).offset((page-1)*per_page).limit(per_page)
+        result = await self.session.execute(stmt)
+        return result.scalars().all()
+
+    async def find_by_code(self, code: str):
+        """Voir PatientRepository.find_by_code (normalisation identique)."""
+        if not code:
+            return None
+        raw = normalize_patient_code(code)
+        result = await self.session.execute(
+            select(Patient).where(func.upper(Patient.code_patient) == raw).limit(1)
+        )
+        return result.scalars().first()
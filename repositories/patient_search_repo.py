@@ -0,0 +1,236 @@
+# repositories/patient_search_repo.py
+import re
+import logging
+import threading
+import unicodedata
+from sqlalchemy import text, func, or_, desc, literal, literal_column, select, table, column
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import OperationalError, ProgrammingError
+from models.patient import Patient
+
+# PostgreSQL : pg_trgm + unaccent, document indexé = nom, prénom, CNI et code
+# sans accents et en minuscules (fonctions IMMUTABLE pour pouvoir être indexées).
+PG_SEARCH_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE EXTENSION IF NOT EXISTS unaccent",
+    """
+    CREATE OR REPLACE FUNCTION public.f_unaccent(text) RETURNS text
+    LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT AS
+    $$ SELECT public.unaccent('public.unaccent', $1) $$
+    """,
+    """
+    CREATE OR REPLACE FUNCTION public.patient_search_doc(text, text, text, text) RETURNS text
+    LANGUAGE sql IMMUTABLE PARALLEL SAFE AS
+    $$ SELECT public.f_unaccent(lower(
+           coalesce($1, '') || ' ' || coalesce($2, '') || ' ' ||
+           coalesce($3, '') || ' ' || coalesce($4, ''))) $$
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_patients_search_trgm ON public.patients
+    USING gin (public.patient_search_doc(first_name, last_name, national_id, code_patient) gin_trgm_ops)
+    """,
+]
+
+# SQLite : table FTS5 (rowid = patient_id) tenue à jour par triggers,
+# tokenizer unicode61 sans diacritiques.
+_SQLITE_DOC = "coalesce({p}.first_name,'') || ' ' || coalesce({p}.last_name,'') || ' ' || " \
+              "coalesce({p}.national_id,'') || ' ' || coalesce({p}.code_patient,'')"
+SQLITE_SEARCH_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS patients_fts "
+    "USING fts5(doc, tokenize = 'unicode61 remove_diacritics 2')",
+    f"""
+    CREATE TRIGGER IF NOT EXISTS patients_fts_ai AFTER INSERT ON patients BEGIN
+        INSERT INTO patients_fts(rowid, doc) VALUES (new.patient_id, {_SQLITE_DOC.format(p='new')});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS patients_fts_au AFTER UPDATE ON patients BEGIN
+        UPDATE patients_fts SET doc = {_SQLITE_DOC.format(p='new')} WHERE rowid = old.patient_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS patients_fts_ad AFTER DELETE ON patients BEGIN
+        DELETE FROM patients_fts WHERE rowid = old.patient_id;
+    END
+    """,
+    f"""
+    INSERT INTO patients_fts(rowid, doc)
+    SELECT p.patient_id, {_SQLITE_DOC.format(p='p')} FROM patients p
+    WHERE p.patient_id NOT IN (SELECT rowid FROM patients_fts)
+    """,
+]
+
+
+def install_search_indexes(conn) -> bool:
+    """
+    Installe les objets de recherche du dialecte de `conn` (extensions,
+    fonctions, index / table FTS et triggers). Idempotent ; appelée par la
+    migration 008_patient_search_index et DatabaseManager.create_search_indexes.
+
+    Le DDL passe dans un savepoint : sans le droit CREATE EXTENSION (ou sans
+    FTS5), il est annulé seul, un avertissement est journalisé et la fonction
+    renvoie False. La recherche se replie alors sur ILIKE ; l'index peut être
+    installé plus tard par un administrateur (create_search_indexes).
+    """
+    ddl = {"postgresql": PG_SEARCH_DDL, "sqlite": SQLITE_SEARCH_DDL}.get(conn.dialect.name)
+    if ddl is None:
+        return False
+    try:
+        with conn.begin_nested():
+            for stmt in ddl:
+                conn.execute(text(stmt))
+    except (OperationalError, ProgrammingError) as e:
+        logging.getLogger(__name__).warning("Index de recherche patient non installé : %s", e)
+        return False
+    with PatientSearchRepository._lock:
+        PatientSearchRepository._available.pop(str(conn.engine.url), None)
+    return True
+
+
+def normalize_search_term(term: str) -> str:
+    """Minuscules, sans accents ni espaces superflus ('Éléonore  ' → 'eleonore')."""
+    decomposed = unicodedata.normalize("NFKD", term or "")
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.lower().split())
+
+
+# Table virtuelle FTS5 (rowid = patient_id ; rank = score bm25)
+patients_fts = table("patients_fts", column("rowid"), column("rank"))
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class PatientSearchRepository:
+    """
+    Recherche patient classée et paginée, appuyée sur un index :
+      - PostgreSQL : index GIN trigrammes (pg_trgm) sur patient_search_doc(),
+        insensible aux accents et tolérant aux fautes de frappe ;
+      - SQLite : table FTS5 'patients_fts' (préfixes de mots, classement bm25 via la colonne rank) ;
+      - sinon, ou si l'index n'est pas installé : ILIKE sur les 4 colonnes.
+    search() renvoie (patients, total) où total est le nombre total de correspondances ;
+    `filters` : critères SQLAlchemy supplémentaires sur Patient (ex. créateur).
+    """
+
+    # Disponibilité de l'index, vérifiée une fois par base (URL) et par processus
+    _available = {}
+    _lock = threading.Lock()
+
+    def __init__(self, session: Session):
+        self.session = session
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def dialect(self) -> str:
+        return self.session.get_bind().dialect.name
+
+    def ensure_indexes(self) -> bool:
+        """Installe les objets de recherche sur sa propre transaction (voir install_search_indexes)."""
+        with self.session.get_bind().begin() as conn:
+            return install_search_indexes(conn)
+
+    def _index_available(self) -> bool:
+        """Index installé (par la migration) ? Vérifié une fois par base ; aucun DDL ici."""
+        engine = self.session.get_bind()
+        key = str(engine.url)
+        with self._lock:
+            if key in self._available:
+                return self._available[key]
+        if self.dialect == "postgresql":
+            check = "SELECT to_regprocedure('public.patient_search_doc(text,text,text,text)') IS NOT NULL"
+        elif self.dialect == "sqlite":
+            check = "SELECT count(*) FROM sqlite_master WHERE type = 'table' AND name = 'patients_fts'"
+        else:
+            check = None
+        ok = False
+        if check is not None:
+            with engine.connect() as conn:
+                ok = bool(conn.execute(text(check)).scalar())
+        with self._lock:
+            self._available[key] = ok
+        return ok
+
+    def search(self, term: str, page: int = 1, per_page: int = 10, filters=()):
+        """
+        Patients correspondant à `term`, du plus pertinent au moins pertinent.
+        Renvoie (liste de Patient de la page, nombre total de correspondances).
+        """
+        q = normalize_search_term(term)
+        if not q:
+            return [], 0
+        page = max(page, 1)
+        offset = (page - 1) * per_page
+        search_indexed = {"postgresql": self._search_trigram, "sqlite": self._search_fts}.get(self.dialect)
+        try:
+            if search_indexed is not None and self._index_available():
+                # Savepoint : sous PostgreSQL, une erreur annule toute la transaction
+                # et le repli ILIKE échouerait à son tour (InFailedSqlTransaction)
+                with self.session.begin_nested():
+                    return search_indexed(q, offset, per_page, filters)
+        except (OperationalError, ProgrammingError) as e:
+            # ProgrammingError : fonction pg_trgm / unaccent absente (UndefinedFunction)
+            self.logger.warning("Recherche indexée indisponible, repli ILIKE : %s", e)
+        return self._search_like(term.strip(), offset, per_page, filters)
+
+    def _search_trigram(self, q: str, offset: int, limit: int, filters):
+        doc = func.patient_search_doc(
+            Patient.first_name, Patient.last_name, Patient.national_id, Patient.code_patient
+        )
+        matches = or_(
+            literal(q).op("<%")(doc),                       # mot proche (fautes de frappe)
+            doc.like(f"%{_escape_like(q)}%", escape="\\"),  # sous-chaîne exacte
+        )
+        rows = (
+            self.session
+                .query(Patient, func.count().over().label("total"))
+                .filter(matches, *filters)
+                .order_by(desc(func.word_similarity(q, doc)), Patient.last_name, Patient.patient_id)
+                .offset(offset)
+                .limit(limit)
+                .all()
+        )
+        if rows:
+            return [p for p, _ in rows], rows[0].total
+        if not offset:
+            return [], 0
+        # Page au-delà de la dernière : le total vient d'un COUNT séparé
+        return [], self.session.query(func.count(Patient.patient_id)).filter(matches, *filters).scalar()
+
+    def _search_fts(self, q: str, offset: int, limit: int, filters):
+        tokens = re.findall(r"\w+", q)
+        if not tokens:
+            return [], 0
+        match = " ".join(f'"{tok}"*' for tok in tokens)
+        stmt = (
+            select(patients_fts.c.rowid.label("patient_id"), func.count().over().label("total"))
+                .where(literal_column("patients_fts").op("MATCH")(match))
+        )
+        if filters:
+            stmt = stmt.join(Patient, Patient.patient_id == patients_fts.c.rowid).where(*filters)
+        rows = self.session.execute(
+            stmt.order_by(patients_fts.c.rank, patients_fts.c.rowid).offset(offset).limit(limit)
+        ).all()
+        if not rows:
+            if not offset:
+                return [], 0
+            count = stmt.with_only_columns(func.count()).order_by(None)
+            return [], self.session.execute(count).scalar()
+        ids = [r.patient_id for r in rows]
+        by_id = {
+            p.patient_id: p
+            for p in self.session.query(Patient).filter(Patient.patient_id.in_(ids))
+        }
+        return [by_id[i] for i in ids if i in by_id], rows[0].total
+
+    def _search_like(self, term: str, offset: int, limit: int, filters):
+        like = f"%{term}%"
+        query = self.session.query(Patient).filter(
+            Patient.first_name.ilike(like) |
+            Patient.last_name.ilike(like) |
+            Patient.national_id.ilike(like) |
+            Patient.code_patient.ilike(like),
+            *filters
+        )
+        total = query.order_by(None).count()
+        return query.order_by(Patient.last_name).offset(offset).limit(limit).all(), total
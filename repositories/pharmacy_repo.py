@@ -2,13 +2,17 @@
 
 from sqlalchemy.orm import Session
 from sqlalchemy import func, or_  
-from models.pharmacy import Pharmacy
+from models.pharmacy import Pharmacy, LOW_STOCK_STATUSES
 from models.stock_movement import StockMovement
-from datetime import datetime
+from repositories.stock_lot_repo import StockLotRepository
+from repositories.stock_analytics_repo import StockAnalyticsRepository
+from datetime import datetime, timedelta
 
 class PharmacyRepository:
     def __init__(self, session: Session):
         self.session = session
+        self.lots = StockLotRepository(session)
+        self.analytics = StockAnalyticsRepository(session)
 
     def list_all(self):
         return self.session.query(Pharmacy).all()
@@ -16,21 +20,74 @@ class PharmacyRepository:
     def get_by_id(self, medication_id: int) -> Pharmacy:
         return self.session.get(Pharmacy, medication_id)
     
-    def search(self, term=None, type_filter=None, status_filter=None):
+    # Colonnes de tri autorisées (le nom de colonne vient de l'interface)
+    SORTABLE = {
+        'drug_name':       Pharmacy.drug_name,
+        'quantity':        Pharmacy.quantity,
+        'expiry_date':     Pharmacy.expiry_date,
+        'stock_status':    Pharmacy.stock_status,
+        'medication_type': Pharmacy.medication_type,
+    }
+
+    def _search_query(self, term=None, type_filter=None, status_filter=None,
+                      expires_within_days=None, expired=False):
         query = self.session.query(Pharmacy)
         if term:
             like_pattern = f"%{term.lower()}%"
             query = query.filter(
                 or_(
                     func.lower(Pharmacy.drug_name).like(like_pattern),
-                    func.lower(Pharmacy.medication_type).like(like_pattern)
+                    func.lower(Pharmacy.medication_type).like(like_pattern),
+                    func.lower(Pharmacy.forme).like(like_pattern)
                 )
             )
         if type_filter and type_filter != "Tous":
             query = query.filter(Pharmacy.medication_type == type_filter)
         if status_filter and status_filter != "Tous":
             query = query.filter(Pharmacy.stock_status == status_filter)
-        return query.all()
+        # Fenêtres de péremption, évaluées sur les lots encore en stock
+        # (index partiel ix_pharmacy_lot_expiry_in_stock)
+        now = datetime.utcnow()
+        if expired:
+            query = query.filter(Pharmacy.medication_id.in_(
+                StockLotRepository.products_expiring_between(end=now)
+            ))
+        elif expires_within_days is not None:
+            query = query.filter(Pharmacy.medication_id.in_(
+                StockLotRepository.products_expiring_between(
+                    now, now + timedelta(days=expires_within_days)
+                )
+            ))
+        return query
+
+    def _ordered(self, query, sort_by=None, descending=False):
+        col = self.SORTABLE.get(sort_by, Pharmacy.drug_name)
+        col = col.desc() if descending else col.asc()
+        # medication_id départage les égalités : pagination stable
+        return query.order_by(col, Pharmacy.medication_id)
+
+    def search(self, term=None, type_filter=None, status_filter=None,
+               expires_within_days=None, expired=False, sort_by=None, descending=False):
+        query = self._search_query(term, type_filter, status_filter, expires_within_days, expired)
+        return self._ordered(query, sort_by, descending).all()
+
+    def search_page(self, term=None, type_filter=None, status_filter=None,
+                    expires_within_days=None, expired=False, sort_by=None, descending=False,
+                    page: int = 1, per_page: int = 50):
+        """
+        Recherche filtrée, triée et paginée côté base.
+        Renvoie (produits de la page, nombre total de produits correspondants).
+        """
+        query = self._search_query(term, type_filter, status_filter, expires_within_days, expired)
+        total = query.order_by(None).count()
+        page = max(1, page)
+        rows = (
+            self._ordered(query, sort_by, descending)
+            .offset((page - 1) * per_page)
+            .limit(per_page)
+            .all()
+        )
+        return rows, total
 
 
     def create(self, data: dict, current_user=None) -> Pharmacy:
@@ -43,6 +100,7 @@ class PharmacyRepository:
           - forme (str)
           - dosage_mg (float) [facultatif]
           - expiry_date (datetime) [facultatif]
+          - lot_number (str) [facultatif] : numéro du lot initial
           - prescribed_by, name_dr…
         """
         prod = Pharmacy(
@@ -53,14 +111,20 @@ class PharmacyRepository:
             forme           = data.get('forme', 'Autre'),   # ← prendre la forme depuis data
             dosage_mg       = data.get('dosage_mg'),
             expiry_date     = data.get('expiry_date'),
-            stock_status    = 'normal',
             prescribed_by   = data.get('prescribed_by'),
             name_dr         = data.get('name_dr')
         )
-        prod.update_stock_status()
         self.session.add(prod)
         self.session.commit()
 
+        # Le stock initial forme le premier lot du produit
+        if prod.quantity > 0:
+            self.lots.receive(
+                prod.medication_id, prod.quantity, prod.expiry_date,
+                lot_number=data.get('lot_number'),
+                created_by=current_user.username if current_user else 'système'
+            )
+
         movement = StockMovement(
             medication_id = prod.medication_id,
             change_qty    = prod.quantity,
@@ -81,11 +145,36 @@ class PharmacyRepository:
         old_qty = prod.quantity
         new_qty = data.get('quantity', old_qty)
 
+        # Correction de quantité : répercutée sur les lots (hausse = nouveau lot,
+        # baisse = sortie FEFO, lots périmés compris)
+        if new_qty != old_qty:
+            try:
+                if new_qty > old_qty:
+                    self.lots.receive(
+                        medication_id, new_qty - old_qty,
+                        data.get('expiry_date', prod.expiry_date),
+                        lot_number=data.get('lot_number'),
+                        created_by=current_user.username if current_user else 'système'
+                    )
+                else:
+                    self.lots.allocate({medication_id: new_qty - old_qty}, {medication_id: old_qty},
+                                       skip_expired=False)
+            except ValueError:
+                self.session.rollback()
+                raise
+
+        # Produit à lot unique : la date saisie dans la fiche est celle du lot
+        if 'expiry_date' in data and data['expiry_date'] != prod.expiry_date and new_qty == old_qty:
+            in_stock = self.lots.list_for_product(medication_id)
+            if len(in_stock) == 1:
+                in_stock[0].expiry_date = data['expiry_date']
+
         # Mettre à jour tous les champs passés, y compris 'forme'
+        # (stock_status est recalculé par la base)
         for key, value in data.items():
-            setattr(prod, key, value)
+            if key not in ('stock_status', 'lot_number'):
+                setattr(prod, key, value)
 
-        prod.update_stock_status()
         self.session.commit()
 
         if new_qty != old_qty:
@@ -113,10 +202,12 @@ class PharmacyRepository:
             self.session.commit()
         return prod
 
-    def renew_stock(self, medication_id: int, added_quantity: int, current_user=None) -> Pharmacy:
+    def renew_stock(self, medication_id: int, added_quantity: int, current_user=None,
+                    expiry_date=None, lot_number: str = None) -> Pharmacy:
         """
-        Réapprovisionne le produit existant : on ajoute added_quantity à quantity,
-        met à jour stock_status, et crée une ligne dans stock_movement.
+        Réapprovisionne le produit existant : l'arrivage devient un nouveau lot
+        (avec sa propre péremption), added_quantity s'ajoute à quantity
+        (stock_status suit par trigger) et une ligne est créée dans stock_movement.
         """
         if added_quantity <= 0:
             raise ValueError("La quantité ajoutée doit être strictement positive.")
@@ -127,7 +218,11 @@ class PharmacyRepository:
 
         old_qty = prod.quantity
         prod.quantity = old_qty + added_quantity
-        prod.update_stock_status()
+        self.lots.receive(
+            medication_id, added_quantity, expiry_date,
+            lot_number=lot_number,
+            created_by=current_user.username if current_user else 'système'
+        )
 
         self.session.commit()
 
@@ -147,10 +242,31 @@ class PharmacyRepository:
 
     def get_critical_or_empty(self):
         """
-        Retourne la liste des produits dont stock_status est 'critique' ou 'épuisé'.
+        Retourne la liste des produits dont stock_status est 'critique' ou 'épuisé'
+        (même prédicat que l'index partiel ix_pharmacy_low_stock).
         """
         return (
             self.session.query(Pharmacy)
-            .filter(Pharmacy.stock_status.in_(('critique','épuisé')))
+            .filter(Pharmacy.stock_status.in_(LOW_STOCK_STATUSES))
+            .order_by(Pharmacy.stock_status, Pharmacy.drug_name)
             .all()
         )
+
+    def list_lots(self, medication_id: int):
+        """Lots en stock du produit, dans l'ordre où ils seront vendus (FEFO)."""
+        return self.lots.list_for_product(medication_id)
+
+    def get_expiring_lots(self, days: int = 30, include_expired: bool = False):
+        """Lots en stock périmant dans les `days` prochains jours (et périmés si demandé)."""
+        return self.lots.expiring_within(days, include_expired)
+
+    def forecast_consumption(self, window_days: int = 28):
+        """Consommation moyenne et jours de stock restants, tous produits (cumuls rafraîchis)."""
+        return self.analytics.forecast(window_days)
+
+    def get_reorder_suggestions(self, window_days: int = 28, lead_time_days: int = 7,
+                                cover_days: int = 30):
+        return self.analytics.reorder_suggestions(window_days, lead_time_days, cover_days)
+
+    def get_consumption_series(self, medication_id: int, granularity: str = 'week', periods: int = 12):
+        return self.analytics.consumption_series(medication_id, granularity, periods)
@@ -0,0 +1,231 @@
+# repositories/stock_analytics_repo.py
+
+import math
+from datetime import datetime, date, timedelta
+from sqlalchemy import select, insert, func, case, literal, and_
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects import postgresql, sqlite
+from models.pharmacy import Pharmacy
+from models.stock_movement import StockMovement
+from models.stock_movement_bucket import StockMovementBucket
+from models.code_counter import CodeCounter
+
+# Mouvements écrits par la caisse : leur somme (signe inversé) est la consommation
+SALE_MOVEMENT_TYPES = ('sale', 'sale_update', 'sale_cancel')
+
+# Dernier jour cumulé (date.toordinal()), ligne de code_counters
+WATERMARK_SCOPE = 'rollup:stock_movement:day'
+
+
+def _as_date(value) -> date:
+    """func.date() renvoie une date (PostgreSQL) ou une chaîne 'AAAA-MM-JJ' (SQLite)."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def week_start(day: date) -> date:
+    """Lundi de la semaine de `day`."""
+    return day - timedelta(days=day.weekday())
+
+
+class StockAnalyticsRepository:
+    """
+    Analyse des mouvements de stock.
+
+    refresh() recalcule les cumuls de stock_movement_bucket (par produit, par
+    jour et par semaine) sur une fenêtre récente : du dernier jour cumulé moins
+    `overlap_days` jours de recouvrement jusqu'à aujourd'hui. Les cumuls de la
+    fenêtre sont remplacés, jamais incrémentés : relire un mouvement est sans
+    effet, et un mouvement committé en retard par une transaction lente (donc
+    invisible au passage précédent) est compté au passage suivant tant qu'il
+    est daté dans la fenêtre. Le filigrane (dernier jour cumulé) est conservé
+    dans code_counters et verrouillé pendant le rafraîchissement. Les tables
+    sont créées par la migration 019_stock_movement_bucket (models.migrations).
+
+    forecast() et reorder_suggestions() calculent pour tous les produits, en une
+    requête agrégée sur les cumuls journaliers, la consommation moyenne sur une
+    fenêtre glissante et le nombre de jours de stock restants.
+    """
+
+    def __init__(self, session: Session, overlap_days: int = 2):
+        self.session = session
+        self.overlap_days = overlap_days
+
+    @staticmethod
+    def _insert(dialect_name: str, model):
+        if dialect_name == "postgresql":
+            return postgresql.insert(model)
+        if dialect_name == "sqlite":
+            return sqlite.insert(model)
+        raise NotImplementedError(f"Cumuls de stock non supportés pour le dialecte {dialect_name}")
+
+    # ------------------------------------------------------------ cumuls
+
+    def _lock_watermark(self, conn) -> int:
+        conn.execute(
+            self._insert(conn.dialect.name, CodeCounter)
+                .values(scope=WATERMARK_SCOPE, last_value=0)
+                .on_conflict_do_nothing(index_elements=[CodeCounter.scope])
+        )
+        return conn.execute(
+            select(CodeCounter.last_value)
+                .where(CodeCounter.scope == WATERMARK_SCOPE)
+                .with_for_update()
+        ).scalar_one()
+
+    def refresh(self) -> int:
+        """
+        Recalcule les cumuls de la fenêtre récente. Renvoie le nombre de cumuls
+        (produit, jour) réécrits. S'exécute sur sa propre connexion et sa propre
+        transaction : la session de l'appelant n'est ni committée ni annulée.
+        """
+        today = date.today()
+        m, b = StockMovement, StockMovementBucket.__table__
+        with self.session.get_bind().begin() as conn:
+            last_day = self._lock_watermark(conn)
+            if last_day:
+                start = date.fromordinal(last_day) - timedelta(days=self.overlap_days)
+            else:
+                # Premier passage : tout l'historique
+                first = conn.execute(select(func.min(m.created_at))).scalar()
+                start = _as_date(first) if first is not None else today
+            start = min(start, today)
+
+            # 1) Jours de la fenêtre : remplacés par un GROUP BY sur leurs seuls mouvements
+            day = func.date(m.created_at)
+            rows = conn.execute(
+                select(
+                    m.medication_id, day,
+                    func.sum(case((m.change_qty > 0, m.change_qty), else_=0)),
+                    func.sum(case((m.change_qty < 0, -m.change_qty), else_=0)),
+                    func.sum(case((m.movement_type.in_(SALE_MOVEMENT_TYPES), -m.change_qty), else_=0)),
+                    func.count()
+                )
+                .where(m.created_at >= datetime.combine(start, datetime.min.time()))
+                .group_by(m.medication_id, day)
+            ).all()
+            conn.execute(b.delete().where(b.c.granularity == 'day', b.c.period_start >= start))
+            if rows:
+                conn.execute(insert(b), [
+                    {'granularity': 'day', 'medication_id': med_id, 'period_start': _as_date(d),
+                     'qty_in': q_in or 0, 'qty_out': q_out or 0, 'consumed': consumed or 0, 'movements': n}
+                    for med_id, d, q_in, q_out, consumed, n in rows
+                ])
+
+            # 2) Semaines touchées : recalculées à partir des jours (déjà agrégés)
+            first_week = week_start(start)
+            weeks = {}
+            for med_id, d, q_in, q_out, consumed, n in conn.execute(
+                select(b.c.medication_id, b.c.period_start, b.c.qty_in, b.c.qty_out,
+                       b.c.consumed, b.c.movements)
+                    .where(b.c.granularity == 'day', b.c.period_start >= first_week)
+            ):
+                acc = weeks.setdefault((med_id, week_start(_as_date(d))), [0, 0, 0, 0])
+                acc[0] += q_in
+                acc[1] += q_out
+                acc[2] += consumed
+                acc[3] += n
+            conn.execute(b.delete().where(b.c.granularity == 'week', b.c.period_start >= first_week))
+            if weeks:
+                conn.execute(insert(b), [
+                    {'granularity': 'week', 'medication_id': med_id, 'period_start': start_,
+                     'qty_in': acc[0], 'qty_out': acc[1], 'consumed': acc[2], 'movements': acc[3]}
+                    for (med_id, start_), acc in weeks.items()
+                ])
+
+            conn.execute(
+                CodeCounter.__table__.update()
+                    .where(CodeCounter.scope == WATERMARK_SCOPE)
+                    .values(last_value=today.toordinal())
+            )
+        return len(rows)
+
+    def consumption_series(self, medication_id: int, granularity: str = 'week',
+                           periods: int = 12, average_over: int = 4) -> list:
+        """
+        Série des `periods` dernières périodes d'un produit (périodes sans
+        mouvement comprises, à 0), avec la moyenne mobile de la consommation
+        sur `average_over` périodes : [{'period_start', 'consumed', 'moving_avg'}].
+        """
+        step = timedelta(days=7 if granularity == 'week' else 1)
+        last = week_start(date.today()) if granularity == 'week' else date.today()
+        starts = [last - step * i for i in range(periods + average_over - 2, -1, -1)]
+        found = dict(self.session.execute(
+            select(StockMovementBucket.period_start, StockMovementBucket.consumed)
+                .where(StockMovementBucket.granularity == granularity,
+                       StockMovementBucket.medication_id == medication_id,
+                       StockMovementBucket.period_start >= starts[0])
+        ).all())
+        values = [found.get(s, 0) for s in starts]
+        series = []
+        for i in range(average_over - 1, len(starts)):
+            window = values[i - average_over + 1:i + 1]
+            series.append({
+                'period_start': starts[i],
+                'consumed':     values[i],
+                'moving_avg':   sum(window) / average_over,
+            })
+        return series
+
+    # ------------------------------------------------------------ prévisions
+
+    def forecast(self, window_days: int = 28, refresh: bool = True) -> list:
+        """
+        Pour chaque produit : consommation sur les `window_days` derniers jours,
+        moyenne journalière et jours de stock restants (None sans consommation).
+        Une seule requête : LEFT JOIN des cumuls journaliers, GROUP BY produit.
+        """
+        if refresh:
+            self.refresh()
+        since = date.today() - timedelta(days=window_days - 1)
+        b = StockMovementBucket
+        consumed = func.coalesce(func.sum(b.consumed), 0)
+        rows = self.session.execute(
+            select(
+                Pharmacy.medication_id, Pharmacy.drug_name, Pharmacy.quantity,
+                Pharmacy.threshold, Pharmacy.stock_status,
+                consumed.label('consumed'),
+                (consumed * literal(1.0) / window_days).label('avg_daily'),
+                case(
+                    (consumed > 0, Pharmacy.quantity * literal(1.0) * window_days / consumed),
+                    else_=None
+                ).label('days_remaining'),
+            )
+            .select_from(Pharmacy)
+            .outerjoin(b, and_(
+                b.medication_id == Pharmacy.medication_id,
+                b.granularity == 'day',
+                b.period_start >= since
+            ))
+            .group_by(Pharmacy.medication_id, Pharmacy.drug_name, Pharmacy.quantity,
+                      Pharmacy.threshold, Pharmacy.stock_status)
+            .order_by(Pharmacy.drug_name)
+        ).mappings().all()
+        return [dict(r) for r in rows]
+
+    def reorder_suggestions(self, window_days: int = 28, lead_time_days: int = 7,
+                            cover_days: int = 30) -> list:
+        """
+        Produits à recommander : stock inférieur au point de commande
+        (consommation pendant le délai de livraison + seuil de sécurité).
+        La quantité suggérée couvre le délai + `cover_days` jours, seuil compris.
+        Triés par jours de stock restants croissants.
+        """
+        out = []
+        for row in self.forecast(window_days):
+            avg = float(row['avg_daily'] or 0)
+            reorder_point = avg * lead_time_days + (row['threshold'] or 0)
+            if row['quantity'] > reorder_point:
+                continue
+            target = avg * (lead_time_days + cover_days) + (row['threshold'] or 0)
+            suggested = max(1, math.ceil(target - row['quantity']))
+            out.append({
+                **row,
+                'reorder_point':     math.ceil(reorder_point),
+                'suggested_quantity': suggested,
+            })
+        out.sort(key=lambda r: (r['days_remaining'] is None, r['days_remaining'] or 0, r['drug_name']))
+        return out
@@ -0,0 +1,111 @@
+# repositories/stock_ledger_repo.py
+
+from datetime import datetime
+from sqlalchemy import insert, select, bindparam
+from sqlalchemy.orm import Session
+from models.pharmacy import Pharmacy
+from models.stock_movement import StockMovement
+from repositories.stock_lot_repo import StockLotRepository, InsufficientStockError
+
+
+class StockLedgerRepository:
+    """
+    Journal de stock de la pharmacie : applique des variations de quantité et
+    écrit les lignes stock_movement correspondantes, dans la transaction de
+    l'appelant (pas de commit ici).
+
+    Nombre d'allers-retours constant quel que soit le nombre de produits :
+      1. SELECT ... WHERE medication_id IN (...) ORDER BY medication_id FOR UPDATE
+         (les lignes sont verrouillées dans un ordre fixe : pas d'interblocage
+         entre deux caisses) ;
+      2. contrôle du stock disponible en mémoire ;
+      3. allocation FEFO sur les lots du produit (StockLotRepository : un SELECT
+         FOR UPDATE et un UPDATE en lot) ;
+      4. un UPDATE exécuté en lot (executemany), resté conditionnel
+         (quantity + :delta >= 0) ; stock_status suit par trigger (models.pharmacy) ;
+      5. un INSERT multi-lignes dans stock_movement.
+    Deux ventes simultanées des dernières boîtes ne peuvent pas rendre le stock négatif.
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+        self.lots = StockLotRepository(session)
+
+    def lock_quantities(self, medication_ids) -> dict:
+        """{medication_id: quantity} des produits demandés, verrouillés (FOR UPDATE) par id croissant."""
+        ids = sorted({mid for mid in medication_ids if mid is not None})
+        if not ids:
+            return {}
+        rows = self.session.execute(
+            select(Pharmacy.medication_id, Pharmacy.quantity)
+                .where(Pharmacy.medication_id.in_(ids))
+                .order_by(Pharmacy.medication_id)
+                .with_for_update()
+        ).all()
+        return {mid: qty for mid, qty in rows}
+
+    def apply(self, deltas: dict, movement_type: str, created_by: str, note: str = None) -> dict:
+        """
+        deltas : {medication_id: variation} (négative pour une sortie).
+        Une entrée sur un produit supprimé est ignorée.
+        Lève InsufficientStockError si une sortie dépasse le stock disponible ;
+        l'appelant doit alors annuler sa transaction (rollback).
+        Renvoie {medication_id: nouvelle quantité}.
+        """
+        deltas = {mid: d for mid, d in deltas.items() if d}
+        if not deltas:
+            return {}
+        current = self.lock_quantities(deltas)
+
+        new_quantities = {}
+        for med_id in sorted(deltas):
+            delta = deltas[med_id]
+            if med_id not in current:
+                if delta > 0:
+                    continue    # produit supprimé entre-temps : rien à remettre en stock
+                raise InsufficientStockError(med_id, -delta)
+            if current[med_id] + delta < 0:
+                raise InsufficientStockError(med_id, -delta, current[med_id])
+            new_quantities[med_id] = current[med_id] + delta
+        if not new_quantities:
+            return {}
+
+        # Les lots suivent la même variation (les lots périmés ne sont pas vendus)
+        self.lots.allocate({mid: deltas[mid] for mid in new_quantities}, current)
+
+        now = datetime.utcnow()
+        table = Pharmacy.__table__
+        new_qty = table.c.quantity + bindparam('b_delta')
+        result = self.session.execute(
+            table.update()
+                .where(table.c.medication_id == bindparam('b_id'))
+                .where(new_qty >= 0)
+                .values(quantity=new_qty, updated_at=now),
+            [{'b_id': mid, 'b_delta': deltas[mid]} for mid in new_quantities]
+        )
+        # Garde-fou si FOR UPDATE n'est pas supporté (SQLite) : une ligne non mise à
+        # jour signifie qu'un autre poste a consommé le stock entre-temps
+        dialect = self.session.get_bind().dialect
+        if dialect.supports_sane_multi_rowcount and result.rowcount < len(new_quantities):
+            raise ValueError("Stock modifié par un autre poste pendant la vente, veuillez réessayer.")
+        for med_id in new_quantities:
+            self._expire_loaded(med_id)
+
+        self.session.execute(insert(StockMovement), [
+            {
+                'medication_id': med_id,
+                'change_qty':    deltas[med_id],
+                'movement_type': movement_type,
+                'note':          note,
+                'created_by':    created_by,
+                'created_at':    now,
+            }
+            for med_id in new_quantities
+        ])
+        return new_quantities
+
+    def _expire_loaded(self, med_id: int):
+        """Les Pharmacy déjà chargées dans la session relisent leur quantité au prochain accès."""
+        obj = self.session.identity_map.get(self.session.identity_key(Pharmacy, med_id))
+        if obj is not None:
+            self.session.expire(obj, ['quantity', 'stock_status', 'updated_at'])
@@ -0,0 +1,196 @@
+# repositories/stock_lot_repo.py
+
+from datetime import datetime, timedelta
+from sqlalchemy import select, or_, bindparam
+from sqlalchemy.orm import Session, joinedload
+from models.pharmacy import Pharmacy
+from models.pharmacy_lot import PharmacyLot
+
+
+class InsufficientStockError(ValueError):
+    """Stock insuffisant (ou produit introuvable) pour une sortie de stock."""
+
+    def __init__(self, medication_id: int, requested: int, available=None):
+        self.medication_id = medication_id
+        self.requested = requested
+        self.available = available
+        if available is None:
+            msg = f"Produit introuvable pour ID={medication_id}"
+        else:
+            msg = (
+                f"Stock insuffisant pour produit ID={medication_id}. "
+                f"Demandé={requested}, disponible={available}"
+            )
+        super().__init__(msg)
+
+
+class StockLotRepository:
+    """
+    Lots de la pharmacie (table pharmacy_lot) et allocation FEFO
+    (first-expired-first-out) : une sortie de stock consomme d'abord les lots
+    qui périment le plus tôt, les lots périmés ne sont pas vendus.
+
+    Pharmacy.quantity reste le cumul des lots ; ce dépôt ne touche qu'aux lots,
+    la quantité produit est mise à jour par l'appelant dans la même transaction
+    (StockLedgerRepository, PharmacyRepository). Une éventuelle part de stock
+    « hors lot » (quantity - somme des lots) est consommée en dernier.
+    Pas de commit ici. La table et la reprise du stock existant en lots
+    d'ouverture relèvent de la migration 018_pharmacy_lot (models.migrations).
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    # ------------------------------------------------------------------ entrées
+
+    def receive(self, medication_id: int, quantity: int, expiry_date=None,
+                lot_number: str = None, created_by: str = None) -> PharmacyLot:
+        """Nouveau lot (réception, création de produit, correction à la hausse)."""
+        lot = PharmacyLot(
+            medication_id    = medication_id,
+            lot_number       = lot_number,
+            quantity         = quantity,
+            initial_quantity = quantity,
+            expiry_date      = expiry_date,
+            received_at      = datetime.utcnow(),
+            created_by       = created_by,
+        )
+        self.session.add(lot)
+        return lot
+
+    # ------------------------------------------------------------ allocation
+
+    def lock_lots(self, medication_ids) -> dict:
+        """
+        {medication_id: [(lot_id, quantity, expiry_date, initial_quantity), ...]} en ordre FEFO
+        (péremption croissante, lots sans date en dernier), verrouillés FOR UPDATE.
+        Les lots vides et périmés sont ignorés : ils ne servent plus à rien.
+        """
+        ids = sorted({mid for mid in medication_ids if mid is not None})
+        if not ids:
+            return {}
+        now = datetime.utcnow()
+        rows = self.session.execute(
+            select(PharmacyLot.lot_id, PharmacyLot.medication_id,
+                   PharmacyLot.quantity, PharmacyLot.expiry_date, PharmacyLot.initial_quantity)
+                .where(PharmacyLot.medication_id.in_(ids))
+                .where(or_(
+                    PharmacyLot.quantity > 0,
+                    PharmacyLot.expiry_date.is_(None),
+                    PharmacyLot.expiry_date >= now
+                ))
+                .order_by(PharmacyLot.medication_id,
+                          PharmacyLot.expiry_date.is_(None),
+                          PharmacyLot.expiry_date,
+                          PharmacyLot.lot_id)
+                .with_for_update()
+        ).all()
+        lots = {}
+        for lot_id, med_id, qty, expiry, initial in rows:
+            lots.setdefault(med_id, []).append((lot_id, qty, expiry, initial))
+        return lots
+
+    def allocate(self, deltas: dict, product_quantities: dict, skip_expired: bool = True) -> dict:
+        """
+        Répercute sur les lots des variations de stock produit.
+         - deltas : {medication_id: variation} (négative pour une sortie)
+         - product_quantities : {medication_id: quantité produit avant variation}
+         - skip_expired : une vente ne puise pas dans les lots périmés ;
+           une correction d'inventaire (False) les consomme en premier.
+        Une entrée (retour, annulation) reprend le chemin inverse d'une vente : elle
+        recomplète les lots non périmés dans l'ordre FEFO, jusqu'à leur quantité
+        initiale, le surplus allant au dernier d'entre eux.
+        Lève InsufficientStockError si le stock utilisable ne couvre pas une sortie.
+        Renvoie {lot_id: variation} appliqué.
+        """
+        lots = self.lock_lots(deltas)
+        now = datetime.utcnow()
+        changes = {}
+        for med_id in sorted(deltas):
+            delta = deltas[med_id]
+            med_lots = lots.get(med_id, [])
+            usable = [l for l in med_lots if not (skip_expired and l[2] is not None and l[2] < now)]
+            if delta > 0:
+                valid = [l for l in med_lots if l[2] is None or l[2] >= now]
+                left = delta
+                for lot_id, qty, _, initial in valid:
+                    put = min(left, max(0, initial - qty))
+                    if put:
+                        changes[lot_id] = changes.get(lot_id, 0) + put
+                        left -= put
+                if left and valid:
+                    changes[valid[-1][0]] = changes.get(valid[-1][0], 0) + left
+                continue
+
+            need = -delta
+            untracked = max(0, product_quantities.get(med_id, 0) - sum(l[1] for l in med_lots))
+            available = sum(l[1] for l in usable) + untracked
+            if need > available:
+                raise InsufficientStockError(med_id, need, available)
+            for lot_id, qty, _, _ in usable:
+                if need <= 0:
+                    break
+                take = min(qty, need)
+                if take:
+                    changes[lot_id] = changes.get(lot_id, 0) - take
+                    need -= take
+            # Le reste éventuel provient du stock hors lot : rien à écrire côté lots
+
+        if changes:
+            table = PharmacyLot.__table__
+            new_qty = table.c.quantity + bindparam('b_delta')
+            self.session.execute(
+                table.update()
+                    .where(table.c.lot_id == bindparam('b_id'))
+                    .where(new_qty >= 0)
+                    .values(quantity=new_qty),
+                [{'b_id': lot_id, 'b_delta': d} for lot_id, d in changes.items()]
+            )
+            for lot_id in changes:
+                obj = self.session.identity_map.get(self.session.identity_key(PharmacyLot, lot_id))
+                if obj is not None:
+                    self.session.expire(obj, ['quantity'])
+        return changes
+
+    # ------------------------------------------------------------- lectures
+
+    def list_for_product(self, medication_id: int):
+        """Lots en stock d'un produit, en ordre FEFO."""
+        return (
+            self.session.query(PharmacyLot)
+                .filter(PharmacyLot.medication_id == medication_id, PharmacyLot.quantity > 0)
+                .order_by(PharmacyLot.expiry_date.is_(None), PharmacyLot.expiry_date, PharmacyLot.lot_id)
+                .all()
+        )
+
+    def expiring_within(self, days: int, include_expired: bool = False):
+        """
+        Lots encore en stock qui périment dans les `days` prochains jours
+        (et déjà périmés si include_expired), avec leur produit, par péremption croissante.
+        Lecture de l'index partiel ix_pharmacy_lot_expiry_in_stock.
+        """
+        now = datetime.utcnow()
+        query = (
+            self.session.query(PharmacyLot)
+                .options(joinedload(PharmacyLot.product))
+                .filter(PharmacyLot.quantity > 0)
+                .filter(PharmacyLot.expiry_date < now + timedelta(days=days))
+        )
+        if not include_expired:
+            query = query.filter(PharmacyLot.expiry_date >= now)
+        return query.order_by(PharmacyLot.expiry_date, PharmacyLot.lot_id).all()
+
+    @staticmethod
+    def products_expiring_between(start=None, end=None):
+        """
+        Sous-requête des medication_id ayant un lot en stock dont la péremption
+        tombe dans [start, end[ (bornes facultatives), pour filtrer les produits.
+        """
+        stmt = select(PharmacyLot.medication_id).where(PharmacyLot.quantity > 0)
+        if start is not None:
+            stmt = stmt.where(PharmacyLot.expiry_date >= start)
+        if end is not None:
+            stmt = stmt.where(PharmacyLot.expiry_date < end)
+        else:
+            stmt = stmt.where(PharmacyLot.expiry_date.is_not(None))
+        return stmt
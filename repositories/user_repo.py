@@ -5,6 +5,7 @@ from sqlalchemy.exc import SQLAlchemyError
 from models.user import User   
 from models.application_role import ApplicationRole
 from models.medical_speciality import MedicalSpecialty
+from service.principal_cache import principal_cache
 import logging
 
 class UserRepository:
@@ -36,6 +37,33 @@ class UserRepository:
             raise
 
 
+    def update_user(self, user_id: int, data: dict) -> User | None:
+        """
+        Met à jour les champs fournis (full_name, postgres_role, is_active, role_id,
+        specialty_id, password) et invalide l'utilisateur dans le cache des principaux.
+        Renvoie None si l'utilisateur n'existe pas.
+        """
+        user = self.session.get(User, user_id)
+        if not user:
+            return None
+        for field in ('full_name', 'postgres_role', 'is_active', 'role_id', 'specialty_id'):
+            if field in data:
+                setattr(user, field, data[field])
+        if data.get('password'):
+            user.set_password(data['password'])
+        try:
+            self.session.commit()
+        except SQLAlchemyError:
+            self.session.rollback()
+            logging.exception(f"Erreur mise à jour de l'utilisateur {user_id}")
+            raise
+        principal_cache.invalidate(user_id)
+        return user
+
+    def set_active(self, user_id: int, is_active: bool) -> User | None:
+        """Active / désactive un utilisateur (voir update_user)."""
+        return self.update_user(user_id, {'is_active': is_active})
+
     def get_user_by_id(self, user_id: int) -> User | None:
         """
         Renvoie un utilisateur par ID, ou None s’il n’existe pas.
@@ -120,6 +148,7 @@ class UserRepository:
         try:
             self.session.delete(user)
             self.session.commit()
+            principal_cache.invalidate(user_id)
             return True
         except SQLAlchemyError:
             self.session.rollback()
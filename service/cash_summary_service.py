@@ -0,0 +1,93 @@
+from datetime import date, timedelta
+import logging
+
+from repositories.cash_summary_repo import CashSummaryRepository, utc_today
+
+
+class CashSummaryService:
+    """
+    Totaux de caisse (transactions, retraits, net) sur une fenêtre de dates.
+
+    Les journées passées sont lues dans la table de clôture (caisse_cloture*) :
+    elles sont agrégées une seule fois, à la première lecture, puis figées.
+    Seule la journée en cours est recalculée, via la requête groupée
+    CashSummaryRepository.aggregate (transactions + retraits en un aller-retour).
+    Les journées sont des journées UTC, comme paid_at et retrait_at (utc_today).
+    """
+
+    def __init__(self, repo: CashSummaryRepository):
+        self.repo = repo
+        self.logger = logging.getLogger(__name__)
+
+    def get_summary(self, date_from: date, date_to: date, statuses=None) -> dict:
+        """
+        Renvoie :
+         {
+           'total_transactions': float,
+           'total_retraits':     float,
+           'net':                float,
+           'by_day':              {date: {'transactions', 'retraits', 'net'}},
+           'by_payment_method':   {payment_method: float},
+           'by_transaction_type': {transaction_type: float},
+         }
+        statuses : statuts à prendre en compte (ex. ('active',)) ; None = tous statuts.
+        """
+        if date_from > date_to:
+            date_from, date_to = date_to, date_from
+
+        today = utc_today()
+        lines = []
+
+        # 1) Journées passées : clôtures existantes, en clôturant d'abord celles qui manquent
+        closed_end = min(date_to, today - timedelta(days=1))
+        if date_from <= closed_end:
+            closed = self.repo.list_closed_days(date_from, closed_end)
+            missing = [
+                date_from + timedelta(days=i)
+                for i in range((closed_end - date_from).days + 1)
+                if date_from + timedelta(days=i) not in closed
+            ]
+            if missing:
+                versions = self.repo.day_versions(missing)
+                fresh = self.repo.aggregate(min(missing), max(missing))
+                skipped = self.repo.close_days(missing, fresh, versions)
+                # Journées modifiées pendant l'agrégation : non figées, on affiche le calcul direct
+                lines.extend(l for l in fresh if l["day"] in skipped)
+            lines.extend(self.repo.list_closure_lines(date_from, closed_end))
+
+        # 2) Journée en cours (ou futures) : calcul direct
+        live_start = max(date_from, today)
+        if live_start <= date_to:
+            lines.extend(self.repo.aggregate(live_start, date_to))
+
+        return self._summarize(lines, statuses)
+
+    @staticmethod
+    def _summarize(lines: list[dict], statuses=None) -> dict:
+        by_day, by_method, by_type = {}, {}, {}
+        total_tx = total_rt = 0.0
+
+        for l in lines:
+            if statuses is not None and l["status"] not in statuses:
+                continue
+            day = by_day.setdefault(l["day"], {"transactions": 0.0, "retraits": 0.0, "net": 0.0})
+            if l["kind"] == "retrait":
+                total_rt += l["total"]
+                day["retraits"] += l["total"]
+            else:
+                total_tx += l["total"]
+                day["transactions"] += l["total"]
+                by_method[l["payment_method"]] = by_method.get(l["payment_method"], 0.0) + l["total"]
+                by_type[l["transaction_type"]] = by_type.get(l["transaction_type"], 0.0) + l["total"]
+
+        for day in by_day.values():
+            day["net"] = day["transactions"] - day["retraits"]
+
+        return {
+            "total_transactions":  total_tx,
+            "total_retraits":      total_rt,
+            "net":                 total_tx - total_rt,
+            "by_day":              dict(sorted(by_day.items())),
+            "by_payment_method":   by_method,
+            "by_transaction_type": by_type,
+        }
@@ -0,0 +1,180 @@
+import itertools
+import threading
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+# États d'un job (libellés affichés tels quels dans la liste des exports)
+PENDING = "En attente"
+RUNNING = "En cours"
+DONE = "Terminé"
+FAILED = "Échec"
+CANCELLED = "Annulé"
+FINISHED_STATES = (DONE, FAILED, CANCELLED)
+
+
+class ExportCancelled(Exception):
+    """Levée dans le thread d'export quand le job a été annulé."""
+
+
+class ExportJob:
+    """
+    Un export en arrière-plan. `task(job)` s'exécute hors du thread UI :
+    elle ouvre sa propre session, fait passer ses lignes par job.track()
+    (progression + point d'annulation) et renvoie le chemin du fichier.
+    Les abonnés (subscribe) sont appelés depuis le thread d'export : les vues
+    les relaient vers le thread UI (after() en Tk, signaux en Qt).
+    """
+
+    def __init__(self, job_id: int, label: str, task):
+        self.job_id = job_id
+        self.label = label
+        self.task = task
+        self.status = PENDING
+        self.done = 0
+        self.total = None
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+        self._cancel = threading.Event()
+        self._listeners = []
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    @property
+    def progress(self):
+        """Avancement entre 0 et 1, ou None tant que le total est inconnu."""
+        if not self.total:
+            return None
+        return min(1.0, self.done / self.total)
+
+    def cancel(self) -> None:
+        """Demande l'annulation : prise en compte à la prochaine ligne traitée."""
+        self._cancel.set()
+
+    def subscribe(self, listener) -> None:
+        """listener(job) à chaque changement d'état ou de progression."""
+        self._listeners.append(listener)
+
+    def _notify(self) -> None:
+        for listener in list(self._listeners):
+            try:
+                listener(self)
+            except Exception:
+                self.logger.exception("Abonné du job d'export %s en erreur", self.job_id)
+
+    def check(self) -> None:
+        if self._cancel.is_set():
+            raise ExportCancelled()
+
+    def track(self, rows, total: int = None, every: int = 200):
+        """
+        Relaie `rows` en comptant les lignes : annulation vérifiée à chaque
+        ligne, abonnés notifiés toutes les `every` lignes.
+        """
+        if total is not None:
+            self.total = total
+            self._notify()
+        for row in rows:
+            self.check()
+            yield row
+            self.done += 1
+            if self.done % every == 0:
+                self._notify()
+
+    def run(self) -> None:
+        """Exécute la tâche (dans un thread du pool) et fixe l'état final."""
+        if self._cancel.is_set():
+            self._finish(CANCELLED)
+            return
+        self.status = RUNNING
+        self._notify()
+        try:
+            self.result = self.task(self)
+        except ExportCancelled:
+            self._finish(CANCELLED)
+        except Exception as e:
+            self.logger.exception("Export « %s » en échec", self.label)
+            self.error = e
+            self._finish(FAILED)
+        else:
+            self._finish(DONE)
+
+    def _finish(self, status: str) -> None:
+        self.status = status
+        self.finished_at = time.time()
+        self._notify()
+
+    def __repr__(self):
+        return f"<ExportJob {self.job_id} {self.label!r} {self.status} {self.done}/{self.total}>"
+
+
+class ExportJobManager:
+    """
+    Liste des exports du poste et pool de threads qui les exécute.
+    Les tâches (requêtes en yield_per + rendu PDF/Excel) partagent des objets
+    SQLAlchemy non sérialisables : un pool de threads plutôt que de processus.
+    """
+
+    def __init__(self, max_workers: int = 2):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="export")
+        self._jobs = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def create(self, label: str, task) -> ExportJob:
+        """Enregistre un job sans le lancer (exécuteur fourni par l'appelant, ex. QThreadPool)."""
+        job = ExportJob(next(self._ids), label, task)
+        with self._lock:
+            self._jobs[job.job_id] = job
+        return job
+
+    def submit(self, label: str, task, listener=None) -> ExportJob:
+        """Enregistre le job et le confie au pool ; listener : voir ExportJob.subscribe."""
+        job = self.create(label, task)
+        if listener is not None:
+            job.subscribe(listener)
+        self._pool.submit(job.run)
+        return job
+
+    def jobs(self) -> list:
+        """Jobs du plus récent au plus ancien."""
+        with self._lock:
+            return sorted(self._jobs.values(), key=lambda j: j.job_id, reverse=True)
+
+    def get(self, job_id: int):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: int) -> bool:
+        job = self.get(job_id)
+        if job is None or job.finished:
+            return False
+        job.cancel()
+        return True
+
+    def clear_finished(self) -> int:
+        """Retire de la liste les jobs terminés, annulés ou en échec."""
+        with self._lock:
+            done = [jid for jid, job in self._jobs.items() if job.finished]
+            for jid in done:
+                del self._jobs[jid]
+        return len(done)
+
+    def shutdown(self) -> None:
+        """Annule les jobs en cours (fermeture de l'application) sans attendre la fin."""
+        for job in self.jobs():
+            job.cancel()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+# Instance partagée par les vues Tk et Qt du processus
+export_manager = ExportJobManager()
@@ -0,0 +1,86 @@
+import threading
+import time
+import logging
+
+
+class Principal:
+    """
+    Instantané léger de l'utilisateur authentifié (indépendant de toute session
+    SQLAlchemy), suffisant pour les contrôleurs : user_id, username, rôle, ...
+    """
+
+    __slots__ = ("user_id", "username", "full_name", "is_active", "role_id", "role_name", "specialty_id")
+
+    def __init__(self, user_id, username, full_name=None, is_active=True,
+                 role_id=None, role_name=None, specialty_id=None):
+        self.user_id = user_id
+        self.username = username
+        self.full_name = full_name
+        self.is_active = is_active
+        self.role_id = role_id
+        self.role_name = role_name
+        self.specialty_id = specialty_id
+
+    @classmethod
+    def from_user(cls, user) -> "Principal":
+        role = getattr(user, "application_role", None)
+        return cls(
+            user_id      = user.user_id,
+            username     = user.username,
+            full_name    = user.full_name,
+            is_active    = user.is_active,
+            role_id      = user.role_id,
+            role_name    = role.role_name if role else None,
+            specialty_id = user.specialty_id,
+        )
+
+    def __repr__(self):
+        return f"<Principal(id={self.user_id}, username={self.username}, role={self.role_name})>"
+
+
+class PrincipalCache:
+    """
+    Cache en mémoire (TTL) des utilisateurs authentifiés, indexé par le `sub` du JWT.
+    UserRepository appelle invalidate() dès qu'un utilisateur est modifié,
+    désactivé ou supprimé — mais seulement dans le processus courant. Une
+    modification faite ailleurs (application de bureau, autre worker de l'API)
+    n'est vue qu'à l'expiration de l'entrée : le TTL (PRINCIPAL_CACHE_TTL côté
+    API) borne ce délai.
+    """
+
+    def __init__(self, ttl_seconds: float = 60.0):
+        self.ttl = ttl_seconds
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    def get(self, sub):
+        key = str(sub)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, principal = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            return principal
+
+    def put(self, sub, principal: Principal) -> Principal:
+        if self.ttl <= 0:
+            return principal
+        with self._lock:
+            self._entries[str(sub)] = (time.monotonic() + self.ttl, principal)
+        return principal
+
+    def invalidate(self, sub) -> None:
+        with self._lock:
+            self._entries.pop(str(sub), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# Instance partagée par le processus (API et UserRepository)
+principal_cache = PrincipalCache()
@@ -0,0 +1,91 @@
+import bisect
+import threading
+import time
+import logging
+from collections import namedtuple
+from models.lab import ReferenceRange
+
+# Copie détachée d'une plage de référence (indépendante de toute session)
+RangeEntry = namedtuple(
+    "RangeEntry", "id parametre_id sexe age_min age_max valeur_min valeur_max"
+)
+
+
+class ReferenceRangeIndex:
+    """
+    Index en mémoire des plages de référence du laboratoire.
+    Toutes les plages sont chargées en une requête, rangées par (parametre_id, sexe)
+    et triées par age_min : la plage d'un âge se trouve par recherche dichotomique.
+    LabRepository appelle invalidate() à chaque création / modification /
+    suppression de plage ; le TTL couvre les modifications faites depuis un autre poste.
+    """
+
+    def __init__(self, ttl_seconds: float = 600.0):
+        self.ttl = ttl_seconds
+        self._buckets = None     # {(parametre_id, sexe): ([age_min...], [RangeEntry...])}
+        self._expires_at = 0.0
+        self._generation = 0     # incrémenté par invalidate()
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._buckets = None
+            self._generation += 1
+
+    def _load(self, session) -> dict:
+        buckets = {}
+        rows = session.query(ReferenceRange).order_by(
+            ReferenceRange.parametre_id, ReferenceRange.sexe, ReferenceRange.age_min
+        )
+        for rr in rows:
+            entry = RangeEntry(rr.id, rr.parametre_id, rr.sexe, rr.age_min, rr.age_max,
+                               rr.valeur_min, rr.valeur_max)
+            starts, entries = buckets.setdefault((rr.parametre_id, rr.sexe), ([], []))
+            starts.append(entry.age_min)
+            entries.append(entry)
+        self.logger.debug("ReferenceRangeIndex : %d groupes chargés", len(buckets))
+        return buckets
+
+    def _get_buckets(self, session) -> dict:
+        with self._lock:
+            if self._buckets is not None and time.monotonic() < self._expires_at:
+                return self._buckets
+            generation = self._generation
+        buckets = self._load(session)
+        with self._lock:
+            # Invalidé pendant le chargement : ce résultat peut précéder la
+            # modification, il sert à cet appel mais n'est pas mis en cache
+            if self._generation == generation:
+                self._buckets = buckets
+                self._expires_at = time.monotonic() + self.ttl
+        return buckets
+
+    @staticmethod
+    def _find(bucket, age):
+        starts, entries = bucket
+        if age is None:
+            # Âge inconnu : seule une plage unique est sans ambiguïté
+            return entries[0] if len(entries) == 1 else None
+        i = bisect.bisect_right(starts, age) - 1
+        # Plages éventuellement chevauchantes : on remonte jusqu'à celle qui couvre l'âge
+        while i >= 0:
+            if entries[i].age_max >= age:
+                return entries[i]
+            i -= 1
+        return None
+
+    def lookup(self, session, parametre_id: int, age, sex: str):
+        """Plage applicable (sexe du patient prioritaire sur 'X'), ou None."""
+        buckets = self._get_buckets(session)
+        for key in ((parametre_id, sex), (parametre_id, 'X')):
+            bucket = buckets.get(key)
+            if bucket:
+                entry = self._find(bucket, age)
+                if entry is not None:
+                    return entry
+        return None
+
+
+# Instance partagée par le processus (LabRepository et vues de saisie)
+reference_range_index = ReferenceRangeIndex()
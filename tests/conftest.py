@@ -0,0 +1,38 @@
+# tests/conftest.py
+"""
+Fixtures communes : base SQLite en mémoire créée depuis les modèles.
+
+    python -m pytest -q          # depuis la racine du dépôt
+"""
+import os
+import sys
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import models.user, models.application_role, models.medical_speciality            # noqa: E402,F401
+import models.patient, models.prescription, models.medical_record, models.appointment  # noqa: E402,F401
+import models.pharmacy, models.pharmacy_lot, models.stock_movement                  # noqa: E402,F401
+import models.caisse, models.caisse_item, models.retrait, models.lab                # noqa: E402,F401
+import models.consultation_spirituelle                                              # noqa: E402,F401
+from models.database import Base                                                    # noqa: E402
+
+# Colonnes ARRAY : table propre à PostgreSQL, absente de la base de test
+PG_ONLY_TABLES = {"consultation_spirituel"}
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(
+        engine, tables=[t for name, t in Base.metadata.tables.items() if name not in PG_ONLY_TABLES]
+    )
+    db = sessionmaker(bind=engine)()
+    try:
+        yield db
+    finally:
+        db.close()
+        engine.dispose()
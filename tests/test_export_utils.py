@@ -0,0 +1,33 @@
+# tests/test_export_utils.py
+import pytest
+
+pytest.importorskip("openpyxl")
+pytest.importorskip("reportlab")
+
+from utils.export_utils import iter_chunks, stream_pdf_table  # noqa: E402
+
+
+def test_iter_chunks_splits_any_iterable():
+    assert list(iter_chunks(iter(range(7)), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
+    assert list(iter_chunks([], 3)) == []
+    assert list(iter_chunks(range(6), 3)) == [[0, 1, 2], [3, 4, 5]]
+
+
+def test_stream_pdf_table_consumes_a_generator(tmp_path):
+    consumed = []
+
+    def rows():
+        for i in range(1200):
+            consumed.append(i)
+            yield [i, f"ligne {i}", i * 2]
+
+    path = tmp_path / "export.pdf"
+    stream_pdf_table(str(path), "Export", ["#", "Libellé", "Valeur"], rows(), chunk_size=250)
+    assert len(consumed) == 1200
+    assert path.read_bytes().startswith(b"%PDF")
+
+
+def test_stream_pdf_table_empty(tmp_path):
+    path = tmp_path / "empty.pdf"
+    stream_pdf_table(str(path), "Vide", ["A"], iter(()))
+    assert path.read_bytes().startswith(b"%PDF")
@@ -0,0 +1,97 @@
+# tests/test_lab.py
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from models.lab import Examen, Parametre, ReferenceRange
+from repositories.lab_repo import age_on, parse_numeric, interpret_value
+from service.reference_range_index import ReferenceRangeIndex, RangeEntry
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("12,5", Decimal("12.5")),
+    (" 3 ", Decimal("3")),
+    (7, Decimal("7")),
+    ("abc", None),
+    ("", None),
+    (None, None),
+    (True, None),
+    ("NaN", None),
+    ("sNaN", None),
+    ("Infinity", None),
+    ("-inf", None),
+])
+def test_parse_numeric(value, expected):
+    assert parse_numeric(value) == expected
+
+
+def test_age_on_before_and_after_birthday():
+    born = date(2000, 6, 15)
+    assert age_on(born, date(2020, 6, 14)) == 19
+    assert age_on(born, date(2020, 6, 15)) == 20
+    assert age_on(None, date(2020, 1, 1)) is None
+
+
+def test_age_on_leap_day():
+    assert age_on(date(2000, 2, 29), date(2001, 2, 28)) == 0
+    assert age_on(date(2000, 2, 29), date(2001, 3, 1)) == 1
+
+
+def test_interpret_value():
+    rr = RangeEntry(1, 1, 'X', 0, 120, Decimal("3.5"), Decimal("5"))
+    assert interpret_value(Decimal("3.5"), rr) == ("normal", False)
+    assert interpret_value(Decimal("5"), rr) == ("normal", False)
+    assert interpret_value(Decimal("5.1"), rr) == ("abnormal", True)
+    assert interpret_value(None, rr) is None
+    assert interpret_value(Decimal("4"), None) is None
+
+
+@pytest.fixture
+def ranges(session):
+    examen = Examen(code="NFS", nom="Numération", categorie="Hématologie")
+    param = Parametre(examen=examen, nom_parametre="Hb", unite="g/dL", type_valeur="num")
+    session.add_all([
+        examen, param,
+        ReferenceRange(parametre=param, sexe='M', age_min=0, age_max=17, valeur_min=11, valeur_max=15),
+        ReferenceRange(parametre=param, sexe='M', age_min=18, age_max=64, valeur_min=13, valeur_max=17),
+        ReferenceRange(parametre=param, sexe='M', age_min=65, age_max=120, valeur_min=12, valeur_max=16),
+        ReferenceRange(parametre=param, sexe='X', age_min=0, age_max=120, valeur_min=10, valeur_max=18),
+    ])
+    session.commit()
+    return param.id
+
+
+def test_lookup_bisects_by_age(session, ranges):
+    index = ReferenceRangeIndex()
+    assert index.lookup(session, ranges, 10, 'M').valeur_min == 11
+    assert index.lookup(session, ranges, 18, 'M').valeur_min == 13
+    assert index.lookup(session, ranges, 64, 'M').valeur_min == 13
+    assert index.lookup(session, ranges, 80, 'M').valeur_min == 12
+
+
+def test_lookup_falls_back_to_unisex_range(session, ranges):
+    index = ReferenceRangeIndex()
+    assert index.lookup(session, ranges, 30, 'F').sexe == 'X'
+    assert index.lookup(session, ranges, 200, 'M') is None
+    assert index.lookup(session, ranges + 1, 30, 'M') is None
+
+
+def test_lookup_unknown_age_needs_a_single_range(session, ranges):
+    index = ReferenceRangeIndex()
+    # Trois plages 'M' : ambigu, on retombe sur la plage unique 'X'
+    assert index.lookup(session, ranges, None, 'M').sexe == 'X'
+
+
+def test_invalidate_during_load_is_not_cached(session, ranges):
+    index = ReferenceRangeIndex()
+    load = index._load
+
+    def load_then_invalidate(s):
+        buckets = load(s)
+        index.invalidate()
+        return buckets
+
+    index._load = load_then_invalidate
+    assert index.lookup(session, ranges, 30, 'M') is not None
+    assert index._buckets is None
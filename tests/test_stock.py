@@ -0,0 +1,96 @@
+# tests/test_stock.py
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+from models.caisse_item import CaisseItem
+from models.pharmacy import Pharmacy
+from models.pharmacy_lot import PharmacyLot
+from repositories.caisse_repo import stock_deltas, _line_key
+from repositories.stock_lot_repo import StockLotRepository, InsufficientStockError
+
+
+def test_stock_deltas_sums_stock_lines_per_product():
+    lines = [
+        {"item_type": "médicament", "item_ref_id": 1, "quantity": 2},
+        {"item_type": "Medication", "item_ref_id": 1, "quantity": 3},
+        {"item_type": "carnet", "item_ref_id": 2, "quantity": 1},
+        {"item_type": "consultation", "item_ref_id": 9, "quantity": 1},
+        {"item_type": None, "item_ref_id": 9, "quantity": 1},
+    ]
+    assert stock_deltas(lines) == {1: -5, 2: -1}
+    assert stock_deltas(lines, sign=1) == {1: 5, 2: 1}
+
+
+def test_stock_deltas_accepts_caisse_items():
+    items = [CaisseItem(item_type="booklet", item_ref_id=4, quantity=2, unit_price=1, line_total=2)]
+    assert stock_deltas(items) == {4: -2}
+
+
+def test_line_key_matches_dict_and_item():
+    line = {"item_type": "médicament", "item_ref_id": 1, "unit_price": 2.5,
+            "quantity": 2, "line_total": 5, "note": ""}
+    item = CaisseItem(item_type="médicament", item_ref_id=1, unit_price=Decimal("2.50"),
+                      quantity=2, line_total=Decimal("5.00"), note=None)
+    assert _line_key(line) == _line_key(item)
+    assert _line_key({**line, "quantity": 3}) != _line_key(item)
+
+
+@pytest.fixture
+def product(session):
+    now = datetime.utcnow()
+    product = Pharmacy(drug_name="Paracétamol", quantity=0, threshold=0, medication_type="comprimé")
+    session.add(product)
+    session.flush()
+    lots = {
+        "expired": PharmacyLot(medication_id=product.medication_id, quantity=5, initial_quantity=5,
+                               expiry_date=now - timedelta(days=1)),
+        "soon":    PharmacyLot(medication_id=product.medication_id, quantity=3, initial_quantity=10,
+                               expiry_date=now + timedelta(days=10)),
+        "later":   PharmacyLot(medication_id=product.medication_id, quantity=4, initial_quantity=4,
+                               expiry_date=now + timedelta(days=100)),
+        "undated": PharmacyLot(medication_id=product.medication_id, quantity=2, initial_quantity=2),
+    }
+    session.add_all(lots.values())
+    product.quantity = sum(l.quantity for l in lots.values())
+    session.commit()
+    return product.medication_id, {name: lot.lot_id for name, lot in lots.items()}
+
+
+def _quantities(session, lot_ids):
+    return {name: session.get(PharmacyLot, lot_id).quantity for name, lot_id in lot_ids.items()}
+
+
+def test_allocate_sale_consumes_earliest_expiry_first(session, product):
+    med_id, lots = product
+    changes = StockLotRepository(session).allocate({med_id: -5}, {med_id: 14})
+    assert changes == {lots["soon"]: -3, lots["later"]: -2}
+    assert _quantities(session, lots) == {"expired": 5, "soon": 0, "later": 2, "undated": 2}
+
+
+def test_allocate_sale_skips_expired_lots(session, product):
+    med_id, lots = product
+    with pytest.raises(InsufficientStockError) as err:
+        StockLotRepository(session).allocate({med_id: -10}, {med_id: 14})
+    assert err.value.available == 9
+
+
+def test_allocate_inventory_correction_consumes_expired_first(session, product):
+    med_id, lots = product
+    changes = StockLotRepository(session).allocate({med_id: -6}, {med_id: 14}, skip_expired=False)
+    assert changes == {lots["expired"]: -5, lots["soon"]: -1}
+
+
+def test_allocate_uses_untracked_stock_last(session, product):
+    med_id, lots = product
+    # 4 unités « hors lot » : produit à 18 pour 14 en lots
+    changes = StockLotRepository(session).allocate({med_id: -12}, {med_id: 18})
+    assert changes == {lots["soon"]: -3, lots["later"]: -4, lots["undated"]: -2}
+
+
+def test_allocate_return_refills_lots_up_to_initial_quantity(session, product):
+    med_id, lots = product
+    changes = StockLotRepository(session).allocate({med_id: 9}, {med_id: 14})
+    # « soon » recomplété jusqu'à 10, le surplus sur le dernier lot valide
+    assert changes == {lots["soon"]: 7, lots["undated"]: 2}
@@ -0,0 +1,86 @@
+# tests/test_tree_model.py
+from view.tree_model import TreeModel
+
+
+class FakeTree:
+    """Treeview minimal (mode non virtuel) qui journalise les opérations."""
+
+    def __init__(self):
+        self.items = {}
+        self.order = []
+        self.selected = ()
+        self.calls = []
+
+    def get_children(self, item=""):
+        return tuple(self.order)
+
+    def insert(self, parent, index, iid, values, tags):
+        self.calls.append(("insert", iid))
+        self.items[iid] = (values, tags)
+        self.order.insert(index, iid)
+
+    def item(self, iid, values, tags):
+        self.calls.append(("item", iid))
+        self.items[iid] = (values, tags)
+
+    def delete(self, *iids):
+        self.calls.append(("delete",) + iids)
+        for iid in iids:
+            del self.items[iid]
+            self.order.remove(iid)
+
+    def move(self, iid, parent, index):
+        self.calls.append(("move", iid))
+        self.order.remove(iid)
+        self.order.insert(index, iid)
+
+    def selection(self):
+        return self.selected
+
+
+def test_set_rows_only_applies_differences():
+    tree = FakeTree()
+    model = TreeModel(tree)
+    model.set_rows([(1, ("a",), ()), (2, ("b",), ()), (3, ("c",), "warn")])
+    assert tree.order == ["1", "2", "3"]
+    assert tree.items["3"] == (("c",), ("warn",))
+
+    tree.calls.clear()
+    model.set_rows([(1, ("a",), ()), (2, ("B",), ()), (3, ("c",), ("warn",))])
+    assert tree.calls == [("item", "2")]
+
+    tree.calls.clear()
+    model.set_rows([(1, ("a",), ()), (2, ("B",), ())])
+    assert tree.calls == [("delete", "3")]
+
+
+def test_set_rows_inserts_new_keys_and_reorders():
+    tree = FakeTree()
+    model = TreeModel(tree)
+    model.set_rows([(1, ("a",), ()), (2, ("b",), ())])
+    tree.calls.clear()
+    model.set_rows([(3, ("c",), ()), (2, ("b",), ()), (1, ("a",), ())])
+    assert ("insert", "3") in tree.calls
+    assert not any(c[0] in ("item", "delete") for c in tree.calls)
+    assert tree.order == ["3", "2", "1"]
+    assert model.keys() == ["3", "2", "1"]
+    assert model.get(2) == ("b",)
+
+
+def test_set_rows_identical_is_a_no_op():
+    tree = FakeTree()
+    model = TreeModel(tree)
+    rows = [(i, (i, f"v{i}"), ()) for i in range(5)]
+    model.set_rows(rows)
+    tree.calls.clear()
+    model.set_rows(rows)
+    assert tree.calls == []
+
+
+def test_stripes_follow_row_rank():
+    tree = FakeTree()
+    model = TreeModel(tree, stripes=("even", "odd"))
+    model.set_rows([(1, ("a",), ()), (2, ("b",), ())])
+    assert tree.items["2"][1] == ("odd",)
+    model.set_rows([(2, ("b",), ())])
+    assert tree.items["2"][1] == ("even",)
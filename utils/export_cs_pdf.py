@@ -1,8 +1,13 @@
 # utils/exportcs_pdf.py
 from fpdf import FPDF
 import os
+from utils.pdf_export import table_header, ensure_row_fits
 
 def export_cs_to_pdf(cs_list, title="Rapport Consultations Spirituelles"):
+    """
+    `cs_list` peut être un générateur (iter_consultations_filtered du contrôleur) :
+    une ligne par consultation, en-tête répété à chaque page.
+    """
     pdf = FPDF(orientation='L', unit='mm', format='A4')
     pdf.add_page()
     # Header
@@ -16,12 +21,8 @@ def export_cs_to_pdf(cs_list, title="Rapport Consultations Spirituelles"):
     # Tableau
     cols = ["Patient","Type","Inscrit le","Rdv le","Montant","Observation"]
     widths = [40,50,30,30,30,60]
-    pdf.set_font('Arial','B',12)
-    for i,col in enumerate(cols):
-        pdf.cell(widths[i], 8, col, border=1, align='C')
-    pdf.ln()
+    table_header(pdf, cols, widths)
 
-    pdf.set_font('Arial','',10)
     for cs in cs_list:
         # Extraire les valeurs
         pat  = cs.patient.code_patient if cs.patient else ""
@@ -31,6 +32,7 @@ def export_cs_to_pdf(cs_list, title="Rapport Consultations Spirituelles"):
         amt  = f"{cs.fr_amount_paid:.2f}" if cs.fr_amount_paid is not None else ""
         obs  = cs.fr_observation or ""
         vals = [pat, typ, reg, rdv, amt, obs]
+        ensure_row_fits(pdf, 6, cols, widths)
         for i,val in enumerate(vals):
             txt = str(val)
             # découper si trop long
@@ -1,81 +1,155 @@
+from itertools import islice
+from typing import Iterable, Iterator
+
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font
 from reportlab.lib.pagesizes import A4
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+from reportlab.lib.units import inch
+from reportlab.pdfgen.canvas import Canvas
+from reportlab.platypus import Frame, Table, TableStyle, Paragraph, Spacer
+from reportlab.platypus.doctemplate import LayoutError
 from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.lib import colors
 
-def export_medical_records_to_excel(records: list[dict], file_path: str):
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Dossiers Médicaux"
+# Lignes par tableau PDF : chaque tableau est mis en page puis libéré,
+# la mémoire ne dépend pas du nombre total de lignes exportées.
+EXPORT_CHUNK_SIZE = 500
+
+TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0,0), (-1,0), colors.lightblue),
+    ('TEXTCOLOR', (0,0), (-1,0), colors.white),
+    ('ALIGN', (0,0), (-1,-1), 'CENTER'),
+    ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0,0), (-1,-1), 8),
+    ('BOTTOMPADDING', (0,0), (-1,0), 6),
+    ('GRID', (0,0), (-1,-1), 0.25, colors.black),
+])
+
+
+def iter_chunks(rows: Iterable, size: int = EXPORT_CHUNK_SIZE) -> Iterator[list]:
+    """Découpe un itérable (générateur, curseur yield_per…) en listes d'au plus `size` éléments."""
+    it = iter(rows)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def medical_record_rows(records) -> Iterator[dict]:
+    """Convertit des MedicalRecord (patient chargé) en dicts d'export, un par un."""
+    for r in records:
+        yield {
+            'record_id': r.record_id,
+            'consultation_date': r.consultation_date,
+            'patient_name': f"{r.patient.last_name} {r.patient.first_name}" if r.patient else "",
+            'motif_code': r.motif_code,
+            'severity': r.severity,
+            'bp': r.bp,
+            'temperature': r.temperature,
+            'weight': r.weight,
+            'height': r.height,
+            'diagnosis': r.diagnosis,
+            'treatment': r.treatment
+        }
+
+
+def _record_values(rec: dict, date_format: str) -> list:
+    d = rec.get("consultation_date")
+    return [
+        rec.get("record_id"),
+        d.strftime(date_format) if d else "",
+        rec.get("patient_name", ""),
+        rec.get("motif_code", ""),
+        rec.get("severity", ""),
+        rec.get("bp", ""),
+        rec.get("temperature", ""),
+        rec.get("weight", ""),
+        rec.get("height", ""),
+        rec.get("diagnosis", ""),
+        rec.get("treatment", "")
+    ]
+
+
+def export_medical_records_to_excel(records: Iterable[dict], file_path: str):
+    """
+    Classeur en mode write_only : chaque ligne est écrite dans le flux puis
+    oubliée, `records` peut être un générateur de n'importe quelle taille.
+    """
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Dossiers Médicaux")
 
     headers = [
         "ID", "Date consultation", "Patient", "Motif", "Gravité",
         "Tension", "Température", "Poids", "Taille", "Diagnostic", "Traitement"
     ]
-    ws.append(headers)
-    for cell in ws[1]:
+    header_cells = []
+    for h in headers:
+        cell = WriteOnlyCell(ws, value=h)
         cell.font = Font(bold=True)
+        header_cells.append(cell)
+    ws.append(header_cells)
 
     for rec in records:
-        ws.append([
-            rec.get("record_id"),
-            rec.get("consultation_date").strftime("%Y-%m-%d %H:%M"),
-            rec.get("patient_name", ""),
-            rec.get("motif_code", ""),
-            rec.get("severity", ""),
-            rec.get("bp", ""),
-            rec.get("temperature", ""),
-            rec.get("weight", ""),
-            rec.get("height", ""),
-            rec.get("diagnosis", ""),
-            rec.get("treatment", "")
-        ])
+        ws.append(_record_values(rec, "%Y-%m-%d %H:%M"))
 
     wb.save(file_path)
 
 
-def export_medical_records_to_pdf(records: list[dict], file_path: str):
-    doc = SimpleDocTemplate(file_path, pagesize=A4)
-    elements = []
+def stream_pdf_table(file_path: str, title: str, headers: list, rows: Iterable[list],
+                     style: TableStyle = TABLE_STYLE, pagesize=A4,
+                     chunk_size: int = EXPORT_CHUNK_SIZE):
+    """
+    Écrit un tableau PDF à partir d'un flux de lignes, par tableaux de
+    `chunk_size` lignes (en-tête répété à chaque page). Un tableau n'est
+    construit que lorsque le précédent est entièrement placé.
+    """
+    canv = Canvas(file_path, pagesize=pagesize, pageCompression=1)
+    width, height = pagesize
     styles = getSampleStyleSheet()
 
-    title = Paragraph("Liste des dossiers médicaux", styles['Title'])
-    elements.append(title)
-    elements.append(Spacer(1, 12))
+    def new_frame():
+        return Frame(inch, inch, width - 2*inch, height - 2*inch)
+
+    pending = [Paragraph(title, styles['Title']), Spacer(1, 12)]
+    chunks = iter_chunks(rows, chunk_size)
+    frame, page_empty = new_frame(), True
+    while True:
+        if not pending:
+            chunk = next(chunks, None)
+            if chunk is None:
+                break
+            table = Table([headers] + chunk, repeatRows=1)
+            table.setStyle(style)
+            pending.append(table)
+
+        head = pending[0]
+        if frame.add(head, canv):
+            pending.pop(0)
+            page_empty = False
+            continue
+        # Ne tient pas en entier : on place la partie qui tient sur la page
+        parts = frame.split(head, canv)
+        if parts and frame.add(parts[0], canv):
+            pending[0:1] = parts[1:]
+            page_empty = False
+        elif page_empty:
+            raise LayoutError(f"Élément trop grand pour une page : {head.identity()}")
+        canv.showPage()
+        frame, page_empty = new_frame(), True
 
+    canv.save()  # termine la dernière page si elle n'est pas vide
+
+
+def export_medical_records_to_pdf(records: Iterable[dict], file_path: str):
     headers = [
-        "ID", "Date", "Patient", "Motif", "Gravité", 
+        "ID", "Date", "Patient", "Motif", "Gravité",
         "Tension", "Temp", "Poids", "Taille", "Diagnostic", "Traitement"
     ]
-    data = [headers]
-
-    for rec in records:
-        data.append([
-            rec.get("record_id"),
-            rec.get("consultation_date").strftime("%Y-%m-%d"),
-            rec.get("patient_name", ""),
-            rec.get("motif_code", ""),
-            rec.get("severity", ""),
-            rec.get("bp", ""),
-            rec.get("temperature", ""),
-            rec.get("weight", ""),
-            rec.get("height", ""),
-            rec.get("diagnosis", ""),
-            rec.get("treatment", "")
-        ])
-
-    table = Table(data, repeatRows=1)
-    table.setStyle(TableStyle([
-        ('BACKGROUND', (0,0), (-1,0), colors.lightblue),
-        ('TEXTCOLOR', (0,0), (-1,0), colors.white),
-        ('ALIGN', (0,0), (-1,-1), 'CENTER'),
-        ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0,0), (-1,-1), 8),
-        ('BOTTOMPADDING', (0,0), (-1,0), 6),
-        ('GRID', (0,0), (-1,-1), 0.25, colors.black),
-    ]))
-
-    elements.append(table)
-    doc.build(elements)
+    stream_pdf_table(
+        file_path,
+        "Liste des dossiers médicaux",
+        headers,
+        (_record_values(rec, "%Y-%m-%d") for rec in records),
+    )
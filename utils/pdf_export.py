@@ -2,7 +2,28 @@
 from fpdf import FPDF
 import os
 
+
+def table_header(pdf: FPDF, cols, widths):
+    """En-tête du tableau (gras), répété en haut de chaque nouvelle page."""
+    pdf.set_font('Arial','B',12)
+    for i,col in enumerate(cols):
+        pdf.cell(widths[i], 8, col, border=1, align='C')
+    pdf.ln()
+    pdf.set_font('Arial','',10)
+
+
+def ensure_row_fits(pdf: FPDF, row_height, cols, widths):
+    """Nouvelle page (avec en-tête) si la prochaine ligne dépasserait le bas de page."""
+    if pdf.get_y() + row_height > pdf.page_break_trigger:
+        pdf.add_page()
+        table_header(pdf, cols, widths)
+
+
 def export_patients_to_pdf(patients, title="Rapport Patients"):
+    """
+    `patients` peut être un générateur (PatientController.iter_patients) :
+    les lignes sont écrites au fil de l'eau, sans liste intermédiaire.
+    """
     pdf = FPDF(orientation='L', unit='mm', format='A4')
     pdf.add_page()
     # En-tête officiel
@@ -12,18 +33,15 @@ def export_patients_to_pdf(patients, title="Rapport Patients"):
     pdf.cell(0, 10, title, ln=1, align='C')
     pdf.ln(10)
     # Tableau
-    pdf.set_font('Arial','B',12)
     cols = ["ID","Code","Nom","Prénom","Naissance","Téléphone"]
     widths = [20,40,40,40,30,40]
-    for i,col in enumerate(cols):
-        pdf.cell(widths[i], 8, col, border=1, align='C')
-    pdf.ln()
-    pdf.set_font('Arial','',10)
+    table_header(pdf, cols, widths)
     for p in patients:
         vals = [
             str(p.patient_id), p.code_patient, p.last_name, p.first_name,
             p.birth_date.strftime("%Y-%m-%d"), p.contact_phone or ""
         ]
+        ensure_row_fits(pdf, 6, cols, widths)
         for i,val in enumerate(vals):
             pdf.cell(widths[i],6, val, border=1)
         pdf.ln()
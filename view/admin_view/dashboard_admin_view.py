@@ -6,6 +6,7 @@ from tkinter import ttk, messagebox
 from PIL import Image
 from datetime import date
 from view.admin_view.user_form_view import UserFormView
+from view.tree_model import TreeModel
 
 class AdminDashboardView(ctk.CTkFrame):
     def __init__(self, parent, user, controller, on_logout=None):
@@ -220,6 +221,7 @@ class AdminDashboardView(ctk.CTkFrame):
             self.tree.column(c, anchor="center")
         self.tree.tag_configure('odd',  background='#FFFFFF')
         self.tree.tag_configure('even', background='#F3F4F6')
+        self.user_model = TreeModel(self.tree, stripes=('even', 'odd'))
 
         vsb = ttk.Scrollbar(
             self.content, orient="vertical",
@@ -233,30 +235,24 @@ class AdminDashboardView(ctk.CTkFrame):
         self._load_users()
 
     def _load_users(self):
-        for iid in self.tree.get_children():
-            self.tree.delete(iid)
-
         term = self.user_search.get().lower().strip()
         users = (self.user_controller.search_users(term)
                  if term else self.user_controller.list_users())
 
-        for i, u in enumerate(users):
-            tag = 'even' if i%2==0 else 'odd'
+        rows = []
+        for u in users:
             role = (u.application_role.role_name
                     if getattr(u, 'application_role', None) else '')
             spec = (u.specialty.name
                     if getattr(u, 'specialty', None) else '')
-            self.tree.insert(
-                '',
-                'end',
-                iid=u.user_id,
-                tags=(tag,),
-                values=(u.user_id, u.username, role, spec,
-                        'Oui' if u.is_active else 'Non')
-            )
-
-        self.btn_edit_toolbar.configure(state="disabled")
-        self.btn_delete_toolbar.configure(state="disabled")
+            rows.append((u.user_id,
+                         (u.user_id, u.username, role, spec,
+                          'Oui' if u.is_active else 'Non'),
+                         ()))
+
+        # Mise à jour par différence : la sélection survit au rafraîchissement
+        self.user_model.set_rows(rows)
+        self._on_user_select()
 
     def _on_user_select(self, _=None):
         ok = bool(self.tree.selection())
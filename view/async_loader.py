@@ -0,0 +1,171 @@
+# view/async_loader.py
+import copy
+import queue
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from tkinter import messagebox
+from sqlalchemy.orm import Session
+
+# Intervalle de relève de la file de résultats (ms) et lots livrés par relève
+POLL_MS = 30
+BATCHES_PER_TICK = 1
+
+# Threads de chargement partagés par toutes les vues Tk
+_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="tk-loader")
+logger = logging.getLogger(__name__)
+
+
+def bound_to(controller, session: Session):
+    """
+    Copie du contrôleur dont le repository travaille sur `session`.
+    Un contrôleur qui porte d'autres objets liés à sa session fournit
+    with_session(session) (ex. CaisseController et son service de synthèse).
+    """
+    if hasattr(controller, "with_session"):
+        return controller.with_session(session)
+    clone = copy.copy(controller)
+    clone.repo = type(controller.repo)(session)
+    return clone
+
+
+class LoadResult:
+    """Retour de fetch : lignes à afficher + informations annexes (total, curseur…) pour on_done."""
+
+    __slots__ = ("rows", "meta")
+
+    def __init__(self, rows, meta=None):
+        self.rows = rows
+        self.meta = meta
+
+
+class AsyncLoader:
+    """
+    Chargement de données hors du thread Tk pour une vue :
+     - fetch(ctrl) s'exécute dans un thread du pool, avec une copie du
+       contrôleur liée à une session dédiée (la session de l'UI n'est jamais
+       partagée) ; il renvoie des valeurs prêtes à afficher (tuples, dicts),
+       la conversion des objets ORM se faisant tant que la session est ouverte ;
+     - les lignes arrivent dans le thread Tk par lots de `batch_size`
+       (on_batch), relevés via after() : la fenêtre reste réactive ;
+     - chaque load() rend les chargements précédents périmés : leurs
+       résultats sont ignorés et leur thread s'arrête au lot suivant ;
+     - `status_label` affiche `loading_text` pendant le chargement.
+    """
+
+    def __init__(self, widget, controller, batch_size: int = 100,
+                 status_label=None, loading_text: str = "Chargement…"):
+        self.widget = widget
+        self.controller = controller
+        self.bind = controller.repo.session.get_bind()
+        self.batch_size = batch_size
+        self.status_label = status_label
+        self.loading_text = loading_text
+        self.loading = False
+        self._generation = 0
+        self._callbacks = (None, None, None)
+        self._queue = queue.Queue()
+        self._polling = False
+        self._label_text = None
+
+    def load(self, fetch, on_batch, on_done=None, on_error=None) -> int:
+        """
+        Lance un chargement (et périme les précédents).
+        on_batch(rows) / on_done(meta) / on_error(exc) sont appelés dans le thread Tk.
+        """
+        self._generation += 1
+        gen = self._generation
+        self._callbacks = (on_batch, on_done, on_error)
+        self._set_loading(True)
+        _pool.submit(self._work, gen, fetch)
+        self._ensure_polling()
+        return gen
+
+    def cancel(self) -> None:
+        """Périme le chargement en cours sans en lancer d'autre."""
+        self._generation += 1
+        self._set_loading(False)
+
+    # — thread de chargement —
+
+    def _work(self, gen: int, fetch):
+        if gen != self._generation:
+            return
+        try:
+            with Session(bind=self.bind) as session:
+                result = fetch(bound_to(self.controller, session))
+                if isinstance(result, LoadResult):
+                    rows, meta = result.rows, result.meta
+                else:
+                    rows, meta = result, None
+                batch = []
+                for row in rows:
+                    if gen != self._generation:
+                        return  # périmé : inutile de lire la suite
+                    batch.append(row)
+                    if len(batch) >= self.batch_size:
+                        self._queue.put((gen, "batch", batch))
+                        batch = []
+                if batch:
+                    self._queue.put((gen, "batch", batch))
+                self._queue.put((gen, "done", meta))
+        except Exception as e:
+            logger.exception("Chargement en arrière-plan en échec")
+            self._queue.put((gen, "error", e))
+
+    # — thread Tk —
+
+    def _ensure_polling(self):
+        if not self._polling:
+            self._polling = True
+            self.widget.after(POLL_MS, self._poll)
+
+    def _poll(self):
+        try:
+            alive = self.widget.winfo_exists()
+        except Exception:
+            alive = False
+        if not alive:
+            self._generation += 1
+            self._polling = False
+            return
+
+        delivered = 0
+        while delivered < BATCHES_PER_TICK:
+            try:
+                gen, kind, payload = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if gen != self._generation:
+                continue  # réponse d'un chargement périmé
+            on_batch, on_done, on_error = self._callbacks
+            if kind == "batch":
+                on_batch(payload)
+                delivered += 1
+            elif kind == "done":
+                self._set_loading(False)
+                if on_done:
+                    on_done(payload)
+            else:
+                self._set_loading(False)
+                if on_error:
+                    on_error(payload)
+                else:
+                    messagebox.showerror("Erreur", f"Chargement impossible :\n{payload}")
+
+        if self.loading or not self._queue.empty():
+            self.widget.after(POLL_MS, self._poll)
+        else:
+            self._polling = False
+
+    def _set_loading(self, loading: bool):
+        if loading == self.loading:
+            return
+        self.loading = loading
+        if self.status_label is None:
+            return
+        if loading:
+            self._label_text = self.status_label.cget("text")
+            self.status_label.configure(text=self.loading_text)
+        elif self.status_label.cget("text") == self.loading_text:
+            # on_done n'a pas mis à jour le libellé : on remet l'ancien
+            self.status_label.configure(text=self._label_text or "")
@@ -0,0 +1,104 @@
+# view/export_jobs_view.py
+import customtkinter as ctk
+from tkinter import ttk, messagebox
+from service.export_jobs import export_manager, DONE, FAILED
+from view.tree_model import TreeModel
+
+POLL_MS = 200
+
+
+def job_progress_text(job) -> str:
+    if job.total:
+        return f"{job.done}/{job.total} ({job.progress:.0%})"
+    return str(job.done) if job.done else ""
+
+
+def watch_job(widget, job, on_progress=None, on_done=None, interval: int = POLL_MS):
+    """
+    Suit un job depuis le thread Tk : l'état est relu toutes les `interval` ms
+    via widget.after() (Tk n'accepte aucun appel venant du thread d'export).
+    Le suivi s'arrête si le widget est détruit ; le job, lui, continue.
+    """
+    def poll():
+        try:
+            if not widget.winfo_exists():
+                return
+        except Exception:
+            return
+        if job.finished:
+            if on_done:
+                on_done(job)
+            return
+        if on_progress:
+            on_progress(job)
+        widget.after(interval, poll)
+
+    widget.after(interval, poll)
+
+
+def start_export(widget, label: str, task, status_label=None, on_done=None):
+    """
+    Lance `task` dans le pool d'exports et affiche l'avancement dans
+    `status_label` (facultatif). Par défaut, fin signalée par une boîte de dialogue.
+    """
+    def show_progress(job):
+        if status_label is not None:
+            status_label.configure(text=f"{job.label} : {job_progress_text(job)}")
+
+    def finished(job):
+        if status_label is not None:
+            status_label.configure(text=f"{job.label} : {job.status}")
+        if on_done is not None:
+            on_done(job)
+        elif job.status == DONE:
+            messagebox.showinfo("Export terminé", f"Fichier généré :\n{job.result}")
+        elif job.status == FAILED:
+            messagebox.showerror("Erreur d'export", str(job.error))
+
+    job = export_manager.submit(label, task)
+    show_progress(job)
+    watch_job(widget, job, on_progress=show_progress, on_done=finished)
+    return job
+
+
+class ExportJobsView(ctk.CTkToplevel):
+    """Liste des exports du poste : état, progression, fichier ; annulation."""
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.title("Exports en cours / Export jobs")
+        self.geometry("760x320")
+
+        cols = ("ID", "Export", "État", "Progression", "Fichier")
+        self.tree = ttk.Treeview(self, columns=cols, show="headings", height=10)
+        for col, width in zip(cols, (40, 220, 90, 120, 260)):
+            self.tree.heading(col, text=col, anchor="center")
+            self.tree.column(col, anchor="center", width=width)
+        self.tree.pack(fill="both", expand=True, padx=10, pady=10)
+        # Rafraîchi toutes les 500 ms : seules les lignes modifiées sont réécrites
+        self.model = TreeModel(self.tree)
+
+        btns = ctk.CTkFrame(self)
+        btns.pack(pady=(0, 10))
+        ctk.CTkButton(btns, text="Annuler / Cancel", command=self.cancel_selected).pack(side="left", padx=5)
+        ctk.CTkButton(btns, text="Nettoyer / Clear finished", command=self.clear_finished).pack(side="left", padx=5)
+
+        self.refresh()
+
+    def refresh(self):
+        if not self.winfo_exists():
+            return
+        self.model.set_rows(self._row(job) for job in export_manager.jobs())
+        self.after(500, self.refresh)
+
+    @staticmethod
+    def _row(job):
+        result = job.result if job.status == DONE else (str(job.error or "") if job.status == FAILED else "")
+        return job.job_id, (job.job_id, job.label, job.status, job_progress_text(job), result), ()
+
+    def cancel_selected(self):
+        for iid in self.tree.selection():
+            export_manager.cancel(int(iid))
+
+    def clear_finished(self):
+        export_manager.clear_finished()
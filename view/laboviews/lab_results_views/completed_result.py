@@ -3,19 +3,44 @@ import customtkinter as ctk
 from tkinter import messagebox, ttk
 
 class CompletedResultsView(ctk.CTkFrame):
+    PAGE_SIZE = 100
+
     def __init__(self, parent, controller, **kwargs):
         super().__init__(parent, **kwargs)
         self.controller = controller
+        self.page = 1
+        self._count = 0
         ctk.CTkLabel(self, text="Résultats interprétés", font=ctk.CTkFont(size=18, weight="bold")).pack(anchor="w", pady=10)
         self.tree = ttk.Treeview(self, columns=("code","patient","exam","status"), show="headings")
         for c,h in [("code","Code"),("patient","Patient"),("exam","Examen"),("status","Interprétation")]:
             self.tree.heading(c, text=h)
             self.tree.column(c, anchor="center")
         self.tree.pack(fill="both", expand=True)
+        nav = ctk.CTkFrame(self)
+        nav.pack(fill="x")
+        ctk.CTkButton(nav, text="←", width=30, command=self.prev_page).pack(side="left", padx=5)
+        ctk.CTkButton(nav, text="→", width=30, command=self.next_page).pack(side="right", padx=5)
+        self.page_label = ctk.CTkLabel(nav, text="")
+        self.page_label.pack(side="left", expand=True)
         self.load_data()
 
     def load_data(self):
         for i in self.tree.get_children(): self.tree.delete(i)
-        raws = self.controller.list_results_by_status('completed')
+        # Plus récents d'abord
+        raws = self.controller.list_results_by_status(
+            'completed', page=self.page, per_page=self.PAGE_SIZE, oldest_first=False
+        )
+        self._count = len(raws)
+        self.page_label.configure(text=f"Page {self.page}")
         for r in raws:
             self.tree.insert('',"end", values=(r['code_lab_patient'], r['patient_name'], r['examen_name'], r['status']))
+
+    def prev_page(self):
+        if self.page > 1:
+            self.page -= 1
+            self.load_data()
+
+    def next_page(self):
+        if self._count == self.PAGE_SIZE:
+            self.page += 1
+            self.load_data()
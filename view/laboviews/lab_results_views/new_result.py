@@ -143,8 +143,22 @@ class NewEntryView(ctk.CTkFrame):
             ctk.CTkLabel(row_frame, text=p['nom_parametre'], width=150).pack(side="left", padx=5)
             var = tk.StringVar()
             self.param_vars[p['id']] = var
+            # Aperçu de l'interprétation (plage de référence) pendant la saisie
+            preview = ctk.CTkLabel(row_frame, text="", width=120)
+            preview.pack(side="right", padx=5)
+            var.trace_add("write", lambda *_, pid=p['id'], v=var, lbl=preview: self._update_preview(pid, v, lbl))
             ctk.CTkEntry(row_frame, textvariable=var).pack(side="right", fill="x", expand=True, padx=5)
 
+    def _update_preview(self, param_id, var, label):
+        res = self.controller.preview_interpretation(param_id, var.get().strip())
+        if not res:
+            label.configure(text="")
+            return
+        label.configure(
+            text=f"{'⚠ ' if res['flagged'] else ''}[{res['valeur_min']:g} – {res['valeur_max']:g}]",
+            text_color="red" if res['flagged'] else "green"
+        )
+
     def _save(self):
         # Récupérer l'examen sélectionné
         selected = next((e for e in self.filtered_exams if e['nom'] == self.exam_var.get()), None)
@@ -1,13 +1,19 @@
 import tkinter as tk
 import customtkinter as ctk
 from tkinter import messagebox, ttk
+from view.async_loader import AsyncLoader, LoadResult
 
 class PendingResultsView(ctk.CTkFrame):
+    PAGE_SIZE = 100
+
     def __init__(self, parent, controller, on_complete=None, **kwargs):
         super().__init__(parent, **kwargs)
         self.controller  = controller
         self.on_complete = on_complete
+        self.page        = 1
+        self._rows       = {}   # result_id -> ligne de la liste de travail (âge, sexe, ...)
         self._build_ui()
+        self.loader = AsyncLoader(self, controller, status_label=self.count_label)
         self.load_data()
 
     def _build_ui(self):
@@ -24,6 +30,13 @@ class PendingResultsView(ctk.CTkFrame):
             self.tree.column(col, anchor="center")
         self.tree.pack(fill="both", expand=True, pady=(0,10))
 
+        nav = ctk.CTkFrame(self)
+        nav.pack(fill="x")
+        ctk.CTkButton(nav, text="←", width=30, command=self.prev_page).pack(side="left", padx=5)
+        ctk.CTkButton(nav, text="→", width=30, command=self.next_page).pack(side="right", padx=5)
+        self.count_label = ctk.CTkLabel(nav, text="")
+        self.count_label.pack(side="left", expand=True)
+
         ctk.CTkButton(self, text="Marquer comme complété",
                       command=self._mark_completed
         ).pack(pady=5)
@@ -31,8 +44,24 @@ class PendingResultsView(ctk.CTkFrame):
     def load_data(self):
         for iid in self.tree.get_children(): 
             self.tree.delete(iid)
-        raws = self.controller.list_results_by_status("pending")
+        self._rows = {}
+        page = self.page
+
+        def fetch(ctrl):
+            # Liste de travail (dicts) et total, lus dans le thread de chargement
+            raws = ctrl.list_results_by_status("pending", page=page, per_page=self.PAGE_SIZE)
+            return LoadResult(raws, ctrl.count_results_by_status("pending"))
+
+        self.loader.load(
+            fetch, self._insert_rows,
+            on_done=lambda total: self.count_label.configure(
+                text=f"{total} en attente — page {page}"
+            )
+        )
+
+    def _insert_rows(self, raws):
         for r in raws:
+            self._rows[r["result_id"]] = r
             self.tree.insert(
                 "", "end", iid=r["result_id"],
                 values=(
@@ -49,11 +78,20 @@ class PendingResultsView(ctk.CTkFrame):
             messagebox.showwarning("Sélection","Aucun résultat sélectionné")
             return
         rid = int(sel[0])
-        # récupère âge et sexe depuis le controller
-        age  = self.controller.get_patient_age(rid)
-        sexe = self.controller.get_patient_sex(rid)
-        self.controller.complete_result(rid, age, sexe)
+        # âge et sexe déjà chargés avec la liste de travail
+        row = self._rows.get(rid, {})
+        self.controller.complete_result(rid, row.get("age"), row.get("gender"))
         messagebox.showinfo("Terminé", "Le résultat est maintenant complété")
         self.load_data()
         if callable(self.on_complete):
             self.on_complete()
+
+    def prev_page(self):
+        if self.page > 1:
+            self.page -= 1
+            self.load_data()
+
+    def next_page(self):
+        if len(self._rows) == self.PAGE_SIZE:
+            self.page += 1
+            self.load_data()
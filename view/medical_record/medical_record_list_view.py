@@ -1,9 +1,10 @@
 import tkinter as tk
 import customtkinter as ctk
-from tkinter import ttk, filedialog
+from tkinter import ttk, filedialog, messagebox
 from datetime import datetime, timedelta
 from tkcalendar import DateEntry
-from utils.export_utils import export_medical_records_to_pdf, export_medical_records_to_excel
+from service.export_jobs import DONE, FAILED
+from view.export_jobs_view import start_export, ExportJobsView
 from view.medical_record.medical_record_form_view import MedicalRecordFormView
 
 class MedicalRecordListView(ctk.CTkFrame):
@@ -13,6 +14,8 @@ class MedicalRecordListView(ctk.CTkFrame):
         self.on_prescribe = on_prescribe
         self.page = 1
         self.per_page = 20
+        self.total = 0
+        self.records = []
         self.selected_record = None
 
         # Charger motifs pour mapping code ↔ label
@@ -62,10 +65,10 @@ class MedicalRecordListView(ctk.CTkFrame):
             textvariable=self.search_var
         )
         self.search_entry.grid(row=0, column=6, padx=5)
-        ctk.CTkButton(filter_frame, text="Rechercher", command=self.refresh).grid(row=0, column=7, padx=5)
+        ctk.CTkButton(filter_frame, text="Rechercher", command=self.apply_filters).grid(row=0, column=7, padx=5)
 
         # Boutons Filter / Export
-        ctk.CTkButton(filter_frame, text="Filtrer", command=self.refresh).grid(row=0, column=8, padx=5)
+        ctk.CTkButton(filter_frame, text="Filtrer", command=self.apply_filters).grid(row=0, column=8, padx=5)
         ctk.CTkButton(filter_frame, text="Export PDF", command=self.export_pdf).grid(row=0, column=9, padx=5)
         ctk.CTkButton(filter_frame, text="Export Excel", command=self.export_excel).grid(row=0, column=10, padx=5)
 
@@ -110,12 +113,17 @@ class MedicalRecordListView(ctk.CTkFrame):
         self.email_btn.pack(side='left', padx=5)
         self.prescribe_btn = ctk.CTkButton(action_frame, text="Prescription", command=self.prescribe_record, state='disabled')
         self.prescribe_btn.pack(side='left', padx=5)
+        ctk.CTkButton(action_frame, text="Exports", command=lambda: ExportJobsView(self)).pack(side='right', padx=5)
+        self.export_status = ctk.CTkLabel(action_frame, text="")
+        self.export_status.pack(side='right', padx=5)
 
         # === Pagination ===
         nav_frame = ctk.CTkFrame(self)
         nav_frame.pack(fill='x', padx=10, pady=(0,10))
         ctk.CTkButton(nav_frame, text="← Page précédente", command=self.prev_page).pack(side='left', padx=5)
         ctk.CTkButton(nav_frame, text="Page suivante →", command=self.next_page).pack(side='right', padx=5)
+        self.count_label = ctk.CTkLabel(nav_frame, text="")
+        self.count_label.pack(side='left', expand=True)
 
         # Initial load
         self.refresh()
@@ -128,8 +136,16 @@ class MedicalRecordListView(ctk.CTkFrame):
         self.email_btn.configure(state=state)
         self.prescribe_btn.configure(state=state)
 
+    def apply_filters(self):
+        self.page = 1
+        self.refresh()
+
     def refresh(self):
         recs = self._get_filtered_records()
+        self.total = self.ctrl.count_records(**self._filters())
+        self.records = recs
+        pages = max(1, -(-self.total // self.per_page))
+        self.count_label.configure(text=f"{self.total} dossier(s) — page {self.page}/{pages}")
         self.tree.delete(*self.tree.get_children())
         for r in recs:
             self.tree.insert('', 'end', iid=r.record_id, values=(
@@ -158,50 +174,32 @@ class MedicalRecordListView(ctk.CTkFrame):
             self.refresh()
 
     def next_page(self):
-        self.page += 1
-        self.refresh()
+        if self.page * self.per_page < self.total:
+            self.page += 1
+            self.refresh()
 
     def export_pdf(self):
         file = filedialog.asksaveasfilename(defaultextension='.pdf', filetypes=[('PDF','*.pdf')])
         if not file:
             return
-        recs = self._get_filtered_records(for_export=True)
-        data = [{
-            'record_id': r.record_id,
-            'consultation_date': r.consultation_date,
-            'patient_name': f"{r.patient.last_name} {r.patient.first_name}" if r.patient else "",
-            'motif_code': r.motif_code,
-            'severity': r.severity,
-            'bp': r.bp,
-            'temperature': r.temperature,
-            'weight': r.weight,
-            'height': r.height,
-            'diagnosis': r.diagnosis,
-            'treatment': r.treatment
-        } for r in recs]
-        export_medical_records_to_pdf(data, file)
-        self._flash_message(f"PDF enregistré : {file}")
+        # Rendu dans le pool d'exports : la fenêtre reste utilisable
+        task = self.ctrl.export_records_task(file, "pdf", **self._filters())
+        start_export(self, "Dossiers médicaux (PDF)", task, status_label=self.export_status,
+                     on_done=self._export_done)
 
     def export_excel(self):
         file = filedialog.asksaveasfilename(defaultextension='.xlsx', filetypes=[('Excel','*.xlsx')])
         if not file:
             return
-        recs = self._get_filtered_records(for_export=True)
-        data = [{
-            'record_id': r.record_id,
-            'consultation_date': r.consultation_date,
-            'patient_name': f"{r.patient.last_name} {r.patient.first_name}" if r.patient else "",
-            'motif_code': r.motif_code,
-            'severity': r.severity,
-            'bp': r.bp,
-            'temperature': r.temperature,
-            'weight': r.weight,
-            'height': r.height,
-            'diagnosis': r.diagnosis,
-            'treatment': r.treatment
-        } for r in recs]
-        export_medical_records_to_excel(data, file)
-        self._flash_message(f"Excel enregistré : {file}")
+        task = self.ctrl.export_records_task(file, "xlsx", **self._filters())
+        start_export(self, "Dossiers médicaux (Excel)", task, status_label=self.export_status,
+                     on_done=self._export_done)
+
+    def _export_done(self, job):
+        if job.status == DONE:
+            self._flash_message(f"Fichier enregistré : {job.result}")
+        elif job.status == FAILED:
+            messagebox.showerror("Erreur d'export", str(job.error))
 
     def view_record(self):
         if not self.selected_record:
@@ -220,8 +218,7 @@ class MedicalRecordListView(ctk.CTkFrame):
     def prescribe_record(self):
         if not self.selected_record:
             return
-        recs = self._get_filtered_records()
-        rec = next(r for r in recs if r.record_id == self.selected_record)
+        rec = next((r for r in self.records if r.record_id == self.selected_record), None)
         if rec and rec.patient_id:
             self.on_prescribe(
                 patient_id=rec.patient_id,
@@ -233,30 +230,18 @@ class MedicalRecordListView(ctk.CTkFrame):
         msg.place(relx=0.5, rely=0.5, anchor='center')
         self.after(duration, msg.destroy)
 
-    def _get_filtered_records(self, for_export=False):
-        # Pagination ou export
-        if for_export:
-            recs = self.ctrl.list_records(page=1, per_page=10_000)
-        else:
-            recs = self.ctrl.list_records(page=self.page, per_page=self.per_page)
-        # Filtres date
-        from_d = self.from_date.get_date()
-        to_d = self.to_date.get_date()
-        recs = [r for r in recs if from_d <= r.consultation_date.date() <= to_d]
-        # Filtre motif
-        if self.motif_var.get() != "Tous":
-            code = self.label_to_code[self.motif_var.get()]
-            recs = [r for r in recs if r.motif_code == code]
-        # Filtre gravité
-        if self.severity_var.get() != "Toutes":
-            recs = [r for r in recs if r.severity == self.severity_var.get()]
-        # Filtre recherche
-        q = self.search_var.get().strip().lower()
-        if q:
-            recs = [r for r in recs if r.patient and (
-                q in r.patient.code_patient.lower() or
-                q in f"{r.patient.last_name} {r.patient.first_name}".lower()
-            )]
-        # Tri décroissant par date
-        recs.sort(key=lambda r: r.consultation_date, reverse=True)
-        return recs
+    def _filters(self) -> dict:
+        """Filtres de la barre (date, motif, gravité, recherche), appliqués côté base."""
+        motif = self.motif_var.get()
+        severity = self.severity_var.get()
+        return {
+            'date_from':  self.from_date.get_date(),
+            'date_to':    self.to_date.get_date(),
+            'motif_code': self.label_to_code.get(motif) if motif != "Tous" else None,
+            'severity':   severity if severity != "Toutes" else None,
+            'search':     self.search_var.get().strip() or None,
+        }
+
+    def _get_filtered_records(self):
+        # Page courante (filtres et tri par date décroissante en base)
+        return self.ctrl.list_records(page=self.page, per_page=self.per_page, **self._filters())
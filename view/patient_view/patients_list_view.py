@@ -1,7 +1,8 @@
 import customtkinter as ctk
 from tkinter import ttk
 from tkinter import messagebox
-from utils.pdf_export import export_patients_to_pdf
+from view.export_jobs_view import start_export, ExportJobsView
+from view.async_loader import AsyncLoader, LoadResult
 
 # Assuming these view classes exist for editing and viewing profiles
 from view.patient_view.patients_edit_view import PatientsEditView
@@ -43,6 +44,7 @@ class PatientListView(ctk.CTkFrame):
         self.edit_btn.grid(row=0, column=3, padx=5)
         # Export PDF button
         ctk.CTkButton(top, text="Export PDF", command=self.export_pdf).grid(row=0, column=4, padx=(5,0))
+        ctk.CTkButton(top, text="Exports", width=70, command=lambda: ExportJobsView(self)).grid(row=0, column=5, padx=(5,0))
 
         # Table container
         table_frame = ctk.CTkFrame(self)
@@ -73,6 +75,12 @@ class PatientListView(ctk.CTkFrame):
         self.page = 1
         ctk.CTkButton(nav, text="←", width=30, command=self.prev_page).pack(side='left', padx=5)
         ctk.CTkButton(nav, text="→", width=30, command=self.next_page).pack(side='right', padx=5)
+        self.count_label = ctk.CTkLabel(nav, text="")
+        self.count_label.pack(side='left', expand=True)
+
+        # Requêtes hors du thread Tk (contrôleur patients, même si on a reçu l'AuthController)
+        self.loader = AsyncLoader(self, getattr(self.controller, 'patient_controller', self.controller),
+                                  status_label=self.count_label)
 
         # Load initial data
         self.refresh()
@@ -84,17 +92,33 @@ class PatientListView(ctk.CTkFrame):
         self.edit_btn.configure(state='disabled')
 
         search = self.search_entry.get().strip() or None
-        data = self.controller.list_patients(page=self.page, per_page=15, search=search)
-
-        # Clear existing rows
+        if search != getattr(self, '_last_search', None):
+            # Nouvelle recherche : on repart de la première page
+            self._last_search = search
+            self.page = 1
+        page = self.page
+
+        def fetch(ctrl):
+            if search:
+                # Recherche classée par pertinence, avec le nombre total de résultats
+                data, total = ctrl.search_patients(search, page=page, per_page=15)
+                label = f"{total} résultat(s) — page {page}"
+            else:
+                data = ctrl.list_patients(page=page, per_page=15)
+                label = f"Page {page}"
+            rows = [(p.patient_id, p.code_patient, p.last_name, p.first_name,
+                     p.birth_date, p.contact_phone) for p in data]
+            return LoadResult(rows, label)
+
+        # Clear existing rows ; une frappe plus récente périme ce chargement
         for iid in self.tree.get_children():
             self.tree.delete(iid)
-        # Insert new data
-        for p in data:
-            self.tree.insert('', 'end', iid=p.patient_id, values=(
-                p.patient_id, p.code_patient, p.last_name, p.first_name,
-                p.birth_date, p.contact_phone
-            ))
+        self.loader.load(fetch, self._insert_rows,
+                         on_done=lambda label: self.count_label.configure(text=label))
+
+    def _insert_rows(self, rows):
+        for values in rows:
+            self.tree.insert('', 'end', iid=values[0], values=values)
 
     def on_select(self, event):
         sel = self.tree.selection()
@@ -119,20 +143,9 @@ class PatientListView(ctk.CTkFrame):
 
     def export_pdf(self):
             search = self.search_entry.get().strip() or None
-            data = self.controller.list_patients(
-                page=self.page, per_page=1000, search=search
-            )
-            try:
-                out_path = export_patients_to_pdf(data, title="Liste des Patients")
-                messagebox.showinfo(
-                    "Export PDF terminé",
-                    f"Le fichier a été généré ici :\n{out_path}"
-                )
-            except Exception as e:
-                messagebox.showerror(
-                    "Erreur lors de l'export PDF",
-                    f"Une erreur est survenue :\n{e}"
-                )
+            # Tous les patients correspondant à la recherche, rendus hors du thread UI
+            task = self.controller.export_patients_task("Liste des Patients", search=search)
+            start_export(self, "Liste des patients (PDF)", task)
 
     def view_profile(self):
         if self.selected_patient is None:
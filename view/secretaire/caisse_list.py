@@ -9,9 +9,14 @@ from datetime import date, datetime
 from view.secretaire.caisse_form import CaisseFormView
 from view.secretaire.retraitList import RetraitListView
 from view.secretaire.retrait_dialog import RetraitDialog
+from view.async_loader import AsyncLoader, LoadResult
+from view.tree_model import TreeModel
 
 
 class CaisseListView(ctk.CTkFrame):
+    # Nombre de transactions chargées à chaque défilement du Treeview
+    PAGE_SIZE = 50
+
     def __init__(
         self,
         parent,
@@ -28,7 +33,12 @@ class CaisseListView(ctk.CTkFrame):
         self.patient_ctrl = patient_ctrl
         self.pharmacy_ctrl = pharmacy_ctrl
         self.locale = locale
-        self.filtered = None
+
+        # Pagination par curseur : filtres courants + curseur de la page suivante
+        self._page_filters = {}
+        self._next_cursor = None
+        self._loading_page = False
+        self._replace_rows = False
 
         # Variables pour afficher les totaux
         self.var_total_tx        = tk.StringVar(value="0.00")
@@ -36,6 +46,10 @@ class CaisseListView(ctk.CTkFrame):
         self.var_net             = tk.StringVar(value="0.00")
 
         self._build_ui()
+        # Requêtes hors du thread Tk : liste paginée et totaux, chacun son chargeur
+        self.loader = AsyncLoader(self, controller, batch_size=self.PAGE_SIZE, status_label=self.lbl_status,
+                                  loading_text={"fr": "Chargement…", "en": "Loading…"}[self.locale])
+        self.totals_loader = AsyncLoader(self, controller)
         self.load_data()
 
     def _build_ui(self):
@@ -100,14 +114,24 @@ class CaisseListView(ctk.CTkFrame):
             text={"fr": "Réinitialiser", "en": "Reset"}[self.locale],
             command=self._reset_filters
         ).grid(row=1, column=5, **pad)
+        self.lbl_status = ctk.CTkLabel(filter_frame, text="")
+        self.lbl_status.grid(row=0, column=4, columnspan=2, **pad)
 
         # — Transactions Treeview —
         cols = ("ID", "Patient", "Type", "Paiement", "Montant", "Date", "Statut")
-        self.tree = ttk.Treeview(self, columns=cols, show="headings", height=15)
+        tree_frame = ctk.CTkFrame(self)
+        tree_frame.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+        self.tree = ttk.Treeview(tree_frame, columns=cols, show="headings", height=15)
         for col_name in cols:
             self.tree.heading(col_name, text=col_name)
             self.tree.column(col_name, width=100, anchor="center")
-        self.tree.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+        self.tree_scroll = ttk.Scrollbar(tree_frame, orient="vertical")
+        self.tree_scroll.pack(side="right", fill="y")
+        self.tree.pack(side="left", fill="both", expand=True)
+        # Liste sans fin (pages successives) : seules les lignes visibles sont
+        # matérialisées, le bas de liste déclenche la page suivante
+        self.model = TreeModel(self.tree, self.tree_scroll, virtual=True,
+                               on_scroll_end=self._load_next_page)
 
         style = ttk.Style()
         style.configure("Treeview", rowheight=25)
@@ -178,45 +202,90 @@ class CaisseListView(ctk.CTkFrame):
         today = date.today().strftime("%Y-%m-%d")
         self.date_from.set_date(today)
         self.date_to.set_date(today)
-        self.filtered = None
         self.load_data()
 
     def apply_filters(self):
-        txs = self.controller.list_transactions()
-        d1, d2 = self.date_from.get_date(), self.date_to.get_date()
-        self.filtered = [tx for tx in txs if d1 <= tx.paid_at.date() <= d2]
-        self._populate_tree()
+        self._page_filters = {
+            "date_from": self.date_from.get_date(),
+            "date_to": self.date_to.get_date(),
+            "payment_method": self.var_payment.get(),
+            "term": self.var_search.get().strip() or None,
+        }
+        self._reload_pages()
         self._refresh_totals()
 
     def load_data(self):
-        self.filtered = None
-        self._populate_tree()
+        self._page_filters = {}
+        self._reload_pages()
         self._refresh_totals()
         self.retrait_list.load_data()
 
-    def _populate_tree(self):
-        for iid in self.tree.get_children():
-            self.tree.delete(iid)
-
-        data = self.filtered or self.controller.list_transactions()
-        for tx in data:
-            patient_display = ""
-            if tx.patient_id:
-                p = self.patient_ctrl.get_patient(tx.patient_id)
-                patient_display = getattr(p, 'code_patient', '') if p else ''
-            tag = tx.status
-            self.tree.insert(
-                "", "end", iid=str(tx.transaction_id),
-                values=(
-                    tx.transaction_id,
-                    patient_display,
-                    tx.transaction_type,
-                    tx.payment_method,
-                    f"{tx.amount:.2f}",
-                    tx.paid_at.strftime("%Y-%m-%d %H:%M"),
-                    tx.status
-                ), tags=(tag,)
-            )
+    def _reload_pages(self):
+        """
+        Recharge la première page avec les filtres courants. L'ancienne liste
+        reste affichée jusqu'à l'arrivée du résultat, qui lui est appliqué par
+        différence (sélection conservée pour les transactions toujours présentes).
+        """
+        self._next_cursor = None
+        self._fetch_page(after=None)
+
+    def _load_next_page(self):
+        if self._next_cursor is None or self._loading_page:
+            return
+        self._fetch_page(after=self._next_cursor)
+
+    def _fetch_page(self, after):
+        """Charge une page en arrière-plan ; une nouvelle recherche périme la précédente."""
+        self._loading_page = True
+        self._replace_rows = after is None
+        filters = dict(self._page_filters)
+
+        def fetch(ctrl):
+            rows, cursor = ctrl.list_transactions_page(after=after, limit=self.PAGE_SIZE, **filters)
+            return LoadResult([self._row(tx) for tx in rows], cursor)
+
+        self.loader.load(fetch, self._populate_tree,
+                         on_done=self._page_loaded, on_error=self._page_failed)
+
+    def _page_loaded(self, cursor):
+        if self._replace_rows:
+            # Rechargement sans aucun résultat
+            self._replace_rows = False
+            self.model.clear()
+        self._next_cursor = cursor
+        self._loading_page = False
+
+    def _page_failed(self, error):
+        self._loading_page = False
+        messagebox.showerror({"fr": "Erreur", "en": "Error"}[self.locale], str(error))
+
+    @staticmethod
+    def _row(tx):
+        """(iid, valeurs, tag) d'une transaction ; appelé dans le thread de chargement."""
+        # patient_by_id est chargé par list_page (pas de requête par ligne)
+        patient = tx.patient_by_id
+        patient_display = (patient.code_patient or '') if patient else ''
+        values = (
+            tx.transaction_id,
+            patient_display,
+            tx.transaction_type,
+            tx.payment_method,
+            f"{tx.amount:.2f}",
+            tx.paid_at.strftime("%Y-%m-%d %H:%M"),
+            tx.status
+        )
+        return str(tx.transaction_id), values, tx.status
+
+    def _populate_tree(self, rows):
+        """
+        Applique un lot de transactions au modèle : le premier lot d'un
+        rechargement remplace la liste, les pages suivantes s'ajoutent à la fin.
+        """
+        if self._replace_rows:
+            self._replace_rows = False
+            self.model.set_rows(rows)
+        else:
+            self.model.append_rows(rows)
 
     def _refresh_totals(self):
         """
@@ -226,32 +295,20 @@ class CaisseListView(ctk.CTkFrame):
          - net = total_tx - total_retraits    → var_net
         Le tout en tenant compte du filtre sur les dates.
         """
-        # 1) Construire date_from / date_to en datetime complet
-        d_from = self.date_from.get_date()
-        d_to   = self.date_to.get_date()
-        dt_start = datetime(d_from.year,  d_from.month,  d_from.day,  0,  0,  0)
-        dt_end   = datetime(d_to.year,    d_to.month,    d_to.day,    23, 59, 59)
-
-        # 2) Somme des transactions (Decimal)
-        total_tx = self.controller.get_total_transactions(
-            date_from=dt_start,
-            date_to=dt_end
-        )
+        # 1) Totaux sur la plage de dates, en une requête groupée (jours passés lus
+        #    dans la clôture journalière, seule la journée en cours est recalculée)
+        d_from, d_to = self.date_from.get_date(), self.date_to.get_date()
 
-        # 3) Somme des retraits (float)
-        total_rt = self.caisse_retrait_controller.get_total_retraits(
-            status=None,  # None = tous statuts
-            date_from=dt_start,
-            date_to=dt_end
-        )
+        def fetch(ctrl):
+            return LoadResult([], ctrl.get_cash_summary(d_from, d_to))
 
-        # 4) Calcul du net en convertissant en float
-        net_amount = float(total_tx) - float(total_rt)
+        # 2) Mise à jour des StringVar à l'arrivée du résultat
+        def show(summary):
+            self.var_total_tx.set(f"{summary['total_transactions']:.2f}")
+            self.var_total_retraits.set(f"{summary['total_retraits']:.2f}")
+            self.var_net.set(f"{summary['net']:.2f}")
 
-        # 5) Mise à jour des StringVar
-        self.var_total_tx.set(f"{float(total_tx):.2f}")
-        self.var_total_retraits.set(f"{total_rt:.2f}")
-        self.var_net.set(f"{net_amount:.2f}")
+        self.totals_loader.load(fetch, on_batch=None, on_done=show)
 
     def _new_transaction(self):
         def on_refresh():
@@ -267,7 +324,7 @@ class CaisseListView(ctk.CTkFrame):
         )
 
     def _edit_selected(self):
-        sel = self.tree.selection()
+        sel = self.model.selection()
         if not sel:
             messagebox.showerror(
                 {"fr": "Erreur", "en": "Error"}[self.locale],
@@ -298,7 +355,7 @@ class CaisseListView(ctk.CTkFrame):
         )
 
     def _cancel_selected(self):
-        sel = self.tree.selection()
+        sel = self.model.selection()
         if not sel:
             messagebox.showerror(
                 {"fr": "Erreur", "en": "Error"}[self.locale],
@@ -321,7 +378,7 @@ class CaisseListView(ctk.CTkFrame):
             )
 
     def _delete_selected(self):
-        sel = self.tree.selection()
+        sel = self.model.selection()
         if not sel:
             messagebox.showerror(
                 {"fr": "Erreur", "en": "Error"}[self.locale],
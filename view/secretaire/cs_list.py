@@ -3,7 +3,9 @@
 import tkinter as tk
 import customtkinter as ctk
 from tkinter import ttk, messagebox
-from utils.export_cs_pdf import export_cs_to_pdf
+from datetime import datetime
+from view.export_jobs_view import start_export, ExportJobsView
+from view.tree_model import TreeModel
 from view.secretaire.cs_form import CSFormView  # ← Remplace l’ancien import
 
 class CSListView(ctk.CTkFrame):
@@ -13,6 +15,7 @@ class CSListView(ctk.CTkFrame):
         self.filtered = None
         self.page = 0
         self.page_size = 100
+        self.total = 0
 
         # Title
         ctk.CTkLabel(
@@ -43,8 +46,8 @@ class CSListView(ctk.CTkFrame):
             command=self._apply_filters
         ).grid(row=0, column=1, padx=(5,20))
 
-        # Type filter dropdown
-        types = ["Tous"] + sorted({cs.type_consultation for cs in controller.list_consultations()})
+        # Type filter dropdown (SELECT DISTINCT côté base)
+        types = ["Tous"] + controller.list_consultation_types()
         self.type_var = tk.StringVar(value="Tous")
         ctk.CTkLabel(filter_frame, text="Type:").grid(row=0, column=2, padx=(0,5))
         ctk.CTkOptionMenu(
@@ -54,6 +57,20 @@ class CSListView(ctk.CTkFrame):
             command=lambda _: self._apply_filters()
         ).grid(row=0, column=3)
 
+        # Période (date de consultation, bornes facultatives AAAA-MM-JJ)
+        self.date_from_var = tk.StringVar()
+        self.date_to_var = tk.StringVar()
+        ctk.CTkLabel(filter_frame, text="Du:").grid(row=0, column=4, padx=(20,5))
+        from_entry = ctk.CTkEntry(filter_frame, textvariable=self.date_from_var,
+                                  placeholder_text="AAAA-MM-JJ", width=100)
+        from_entry.grid(row=0, column=5)
+        ctk.CTkLabel(filter_frame, text="Au:").grid(row=0, column=6, padx=(10,5))
+        to_entry = ctk.CTkEntry(filter_frame, textvariable=self.date_to_var,
+                                placeholder_text="AAAA-MM-JJ", width=100)
+        to_entry.grid(row=0, column=7)
+        from_entry.bind("<Return>", lambda e: self._apply_filters())
+        to_entry.bind("<Return>", lambda e: self._apply_filters())
+
         # Define columns
         cols = (
             "patient", "type_consultation", "presc_generic", "presc_med_spirituel",
@@ -90,6 +107,8 @@ class CSListView(ctk.CTkFrame):
         # Alternating row colors
         self.tree.tag_configure('odd', background='white')
         self.tree.tag_configure('even', background='#f0f0f0')
+        # Rafraîchissements par différence (clé : consultation_id), zébrage selon le rang
+        self.model = TreeModel(self.tree, stripes=('even', 'odd'))
 
         self.tree.grid(row=2, column=0, columnspan=5, sticky="nsew", padx=10, pady=5)
 
@@ -107,6 +126,9 @@ class CSListView(ctk.CTkFrame):
         # ctk.CTkButton(action_frame, text="Nouveau", command=self._on_create).pack(side="left", padx=10)
         ctk.CTkButton(action_frame, text="Éditer", command=self._edit_selected).pack(side="left", padx=10)
         ctk.CTkButton(action_frame, text="Exporter PDF", command=self._export_pdf).pack(side="left", padx=10)
+        ctk.CTkButton(action_frame, text="Exports", command=lambda: ExportJobsView(self)).pack(side="left", padx=10)
+        self.export_status = ctk.CTkLabel(action_frame, text="")
+        self.export_status.pack(side="left", padx=10)
 
         # Pagination controls
         pag_frame = ctk.CTkFrame(self)
@@ -125,63 +147,56 @@ class CSListView(ctk.CTkFrame):
         # Initial load
         self.load_data()
 
-    def _apply_filters(self):
+    def _filters(self) -> dict:
         """
-        Applique le filtre saisi par l’utilisateur :
-        - On recherche dans le code_patient OU dans le nom/prénom (case-insensitive).
-        - On applique aussi le filtre de type si nécessaire.
+        Filtres saisis par l’utilisateur, appliqués côté base :
+        - recherche dans le code_patient OU dans le nom/prénom (case-insensitive) ;
+        - type de consultation ;
+        - période sur la date de consultation.
         """
-        all_cs = self.controller.list_consultations()
-        term = self.search_var.get().strip().lower()
-
-        if term:
-            def match_patient(cs):
-                if not cs.patient:
-                    return False
-                code = (cs.patient.code_patient or "").lower()
-                nom  = (getattr(cs.patient, 'last_name', "") or "").lower()
-                pre  = (getattr(cs.patient, 'first_name', "") or "").lower()
-                return term in code or term in nom or term in pre
-
-            filtered = [cs for cs in all_cs if match_patient(cs)]
-        else:
-            filtered = all_cs
-
-        t = self.type_var.get()
-        if t != "Tous":
-            filtered = [cs for cs in filtered if cs.type_consultation == t]
+        def parse(var):
+            txt = var.get().strip()
+            return datetime.strptime(txt, "%Y-%m-%d").date() if txt else None
+
+        return {
+            "type_filter": self.type_var.get(),
+            "term": self.search_var.get().strip() or None,
+            "date_from": parse(self.date_from_var),
+            "date_to": parse(self.date_to_var),
+        }
 
-        self.filtered = filtered
+    def _apply_filters(self):
         self.page = 0
         self._populate_tree()
 
 
     def load_data(self):
-        self.filtered = None
         self.page = 0
         self._populate_tree()
 
     def _populate_tree(self):
         """
-        Remplit le Treeview avec les consultations paginées.
+        Remplit le Treeview avec la page courante (LIMIT/OFFSET + COUNT en base).
         La colonne “patient” affiche maintenant : 
             <code_patient> – <last_name> <first_name>
         """
-        data = self.filtered if self.filtered is not None else self.controller.list_consultations()
-        start = self.page * self.page_size
-        end = start + self.page_size
-        page_data = data[start:end]
+        try:
+            filters = self._filters()
+        except ValueError:
+            messagebox.showerror("Erreur", "Date invalide (format AAAA-MM-JJ).")
+            return
+        page_data, self.total = self.controller.list_consultations_page(
+            page=self.page + 1, per_page=self.page_size, **filters
+        )
+        self.filtered = page_data
 
-        total_pages = max(1, (len(data) + self.page_size - 1) // self.page_size)
+        total_pages = max(1, (self.total + self.page_size - 1) // self.page_size)
         self.page_label.configure(text=f"Page {self.page + 1} / {total_pages}")
         self.prev_btn.configure(state="normal" if self.page > 0 else "disabled")
         self.next_btn.configure(state="normal" if self.page < total_pages - 1 else "disabled")
 
-        # Vide le tree
-        for iid in self.tree.get_children():
-            self.tree.delete(iid)
-
-        for idx, cs in enumerate(page_data):
+        rows = []
+        for cs in page_data:
             # Nouveau format pour la colonne patient
             if cs.patient:
                 code = cs.patient.code_patient or ""
@@ -197,12 +212,9 @@ class CSListView(ctk.CTkFrame):
             obs_text = cs.fr_observation or ""
             obs = obs_text[:30] + ("…" if len(obs_text) > 30 else "")
 
-            tag = 'even' if idx % 2 == 0 else 'odd'
-            self.tree.insert(
-                "",
-                "end",
-                iid=getattr(cs, 'consultation_id', None),
-                values=(
+            rows.append((
+                cs.consultation_id,
+                (
                     patient_display,
                     cs.type_consultation,
                     cs.presc_generic,
@@ -213,8 +225,11 @@ class CSListView(ctk.CTkFrame):
                     amt,
                     obs
                 ),
-                tags=(tag,)
-            )
+                ()
+            ))
+
+        # Seules les lignes ajoutées, modifiées ou disparues touchent le Treeview
+        self.model.set_rows(rows)
 
 
     def _prev_page(self):
@@ -223,8 +238,7 @@ class CSListView(ctk.CTkFrame):
             self._populate_tree()
 
     def _next_page(self):
-        total = len(self.filtered) if self.filtered is not None else len(self.controller.list_consultations())
-        if (self.page + 1) * self.page_size < total:
+        if (self.page + 1) * self.page_size < self.total:
             self.page += 1
             self._populate_tree()
 
@@ -266,20 +280,12 @@ class CSListView(ctk.CTkFrame):
     #     )
 
     def _export_pdf(self):
-        data = self.filtered if self.filtered is not None else self.controller.list_consultations()
+        try:
+            filters = self._filters()
+        except ValueError:
+            messagebox.showerror("Erreur", "Date invalide (format AAAA-MM-JJ).")
+            return
+        # Toutes les lignes filtrées (pas seulement la page affichée), rendues hors du thread UI
         t = self.type_var.get()
-        if t != "Tous":
-            data = [cs for cs in data if cs.type_consultation == t]
-        export_list = []
-        for cs in data:
-            export_list.append(type('X', (object,), {
-                'patient_id': cs.patient.patient_id if cs.patient else None,
-                'code_patient': cs.patient.code_patient if cs.patient else '',
-                'type_consultation': cs.type_consultation,
-                'fr_registered_at': cs.fr_registered_at,
-                'fr_appointment_at': cs.fr_appointment_at,
-                'fr_amount_paid': cs.fr_amount_paid,
-                'fr_observation': cs.fr_observation
-            })())
-        out = export_cs_to_pdf(data, title=f"Consultations_{t}")
-        messagebox.showinfo("Export PDF", f"Fichier généré : {out}")
+        task = self.controller.export_consultations_task(f"Consultations_{t}", **filters)
+        start_export(self, f"Consultations {t} (PDF)", task, status_label=self.export_status)
@@ -235,11 +235,10 @@ class SecretaireDashboardView(ctk.CTkFrame):
 
     def show_patient_list(self):
         self._set_active_menu(self.btn_patient_list)
-        patients = self.patient_ctrl.list_spiritual_patients()
+        # Liste paginée : le contrôleur restreint déjà aux patients des secrétaires
         view = PatientListView(
             self.content,
-            controller=self.patient_ctrl,
-            patients=patients
+            controller=self.patient_ctrl
         )
         view.pack(fill="both", expand=True)
 
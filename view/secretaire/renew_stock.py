@@ -10,11 +10,12 @@ class RenewStockDialog(ctk.CTkToplevel):
         Dialog moderne pour réapprovisionner un produit.
         - parent : fenêtre parente
         - product_name : nom du produit à réapprovisionner
-        - on_confirm : callback (added_qty) à appeler si l'utilisateur valide
+        - on_confirm : callback (added_qty, expiry_date, lot_number) à appeler si
+          l'utilisateur valide ; l'arrivage est enregistré comme un nouveau lot
         """
         super().__init__(parent)
         self.title("Réapprovisionnement")
-        self.geometry("400x200")
+        self.geometry("400x320")
         self.resizable(False, False)
         self.configure(bg="transparent")
         self.on_confirm = on_confirm
@@ -38,6 +39,16 @@ class RenewStockDialog(ctk.CTkToplevel):
         ctk.CTkEntry(entry_frame, textvariable=self.var_add, placeholder_text="Entrez un entier").pack(fill="x", padx=10, pady=(0, 5))
         entry_frame.grid_columnconfigure(0, weight=1)
 
+        # Lot : péremption et numéro (facultatifs)
+        self.var_expiry = tk.StringVar()
+        self.var_lot = tk.StringVar()
+        lot_frame = ctk.CTkFrame(container, corner_radius=5)
+        lot_frame.pack(fill="x", padx=10, pady=(0, 15))
+        ctk.CTkLabel(lot_frame, text="Péremption du lot (AAAA-MM-JJ) :", anchor="w").pack(fill="x", padx=10, pady=(5, 0))
+        ctk.CTkEntry(lot_frame, textvariable=self.var_expiry, placeholder_text="facultatif").pack(fill="x", padx=10, pady=(0, 5))
+        ctk.CTkLabel(lot_frame, text="Numéro de lot :", anchor="w").pack(fill="x", padx=10, pady=(5, 0))
+        ctk.CTkEntry(lot_frame, textvariable=self.var_lot, placeholder_text="facultatif").pack(fill="x", padx=10, pady=(0, 5))
+
         # Boutons confirmer / annuler
         btn_frame = ctk.CTkFrame(container, corner_radius=5)
         btn_frame.pack(pady=(0, 10))
@@ -70,6 +81,12 @@ class RenewStockDialog(ctk.CTkToplevel):
         if added <= 0:
             messagebox.showerror("Erreur", "La quantité doit être strictement positive.", parent=self)
             return
+        expiry_str = self.var_expiry.get().strip()
+        try:
+            expiry = datetime.strptime(expiry_str, "%Y-%m-%d") if expiry_str else None
+        except ValueError:
+            messagebox.showerror("Erreur", "Date de péremption invalide (AAAA-MM-JJ).", parent=self)
+            return
 
-        self.on_confirm(added)
+        self.on_confirm(added, expiry, self.var_lot.get().strip() or None)
         self.destroy()
\ No newline at end of file
@@ -0,0 +1,79 @@
+import customtkinter as ctk
+from tkinter import ttk, messagebox
+from view.async_loader import AsyncLoader
+from view.tree_model import TreeModel
+
+
+class ReorderSuggestionsView(ctk.CTkToplevel):
+    def __init__(self, parent, controller, window_days: int = 28, lead_time_days: int = 7):
+        """
+        Fenêtre des réapprovisionnements suggérés :
+        consommation moyenne, jours de stock restants et quantité à commander.
+        """
+        super().__init__(parent)
+        self.title("Réapprovisionnement suggéré / Reorder suggestions")
+        self.geometry("820x420")
+        self.controller = controller
+        self.window_days = window_days
+        self.lead_time_days = lead_time_days
+
+        ctk.CTkLabel(
+            self,
+            text=f"Consommation des {window_days} derniers jours, délai de livraison {lead_time_days} j",
+            font=ctk.CTkFont(size=14, weight="bold")
+        ).pack(pady=(10, 5))
+
+        cols = (
+            "Nom / Name",
+            "Stock",
+            "Seuil / Threshold",
+            "Conso. / jour",
+            "Jours restants",
+            "À commander"
+        )
+        self.tree = ttk.Treeview(self, columns=cols, show="headings", height=15)
+        for col in cols:
+            self.tree.heading(col, text=col, anchor="center")
+            self.tree.column(col, anchor="center", width=120)
+        self.tree.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+        self.model = TreeModel(self.tree)
+
+        self.status_label = ctk.CTkLabel(self, text="")
+        self.status_label.pack()
+        ctk.CTkButton(self, text="Rafraîchir / Refresh", command=self.load_data).pack(pady=(0, 10))
+
+        # Rafraîchissement des cumuls et prévision hors du thread Tk
+        self.loader = AsyncLoader(self, controller, status_label=self.status_label,
+                                  loading_text="Chargement… / Loading…")
+        self._rows = []
+        self.load_data()
+
+    def load_data(self):
+        """Recalcule les suggestions en arrière-plan ; la liste affichée reste en place jusqu'au résultat."""
+        params = dict(window_days=self.window_days, lead_time_days=self.lead_time_days)
+
+        def fetch(ctrl):
+            return [self._row(r) for r in ctrl.reorder_suggestions(**params)]
+
+        self._rows = []
+        self.loader.load(fetch, lambda rows: self._rows.extend(rows), on_done=self._loaded, on_error=self._failed)
+
+    @staticmethod
+    def _row(r):
+        """(iid, valeurs, tags) d'une suggestion ; appelé dans le thread de chargement."""
+        days = r['days_remaining']
+        return r['medication_id'], (
+            r['drug_name'],
+            r['quantity'],
+            r['threshold'],
+            f"{float(r['avg_daily']):.2f}",
+            f"{float(days):.0f}" if days is not None else "—",
+            r['suggested_quantity'],
+        ), ()
+
+    def _loaded(self, _meta):
+        self.model.set_rows(self._rows)
+        self.status_label.configure(text=f"{len(self._rows)} produit(s) à commander")
+
+    def _failed(self, error):
+        messagebox.showerror("Erreur / Error", str(error), parent=self)
@@ -6,6 +6,8 @@ from tkinter import ttk, messagebox, simpledialog
 from tkcalendar import DateEntry
 from datetime import datetime
 
+from view.async_loader import AsyncLoader, LoadResult
+
 
 class RetraitListView(ctk.CTkFrame):
     """
@@ -27,6 +29,8 @@ class RetraitListView(ctk.CTkFrame):
         self.locale = locale
 
         self._build_ui()
+        self.loader = AsyncLoader(self, retrait_ctrl, status_label=self.lbl_status,
+                                  loading_text={"fr": "Chargement…", "en": "Loading…"}[self.locale])
         self.load_data()
 
 
@@ -115,97 +119,60 @@ class RetraitListView(ctk.CTkFrame):
         self.var_total = tk.StringVar(value="0.00")
         ctk.CTkEntry(self, textvariable=self.var_total, state="disabled") \
             .pack(padx=10, pady=(0, 10), fill="x")
+        self.lbl_status = ctk.CTkLabel(self, text="")
+        self.lbl_status.pack()
 
 
-    def load_data(self):
+    def _filters(self) -> dict:
         """
-        Recharge la liste des retraits en fonction :
-         - statut choisi (Actif, Annulé, Tous),
-         - plage de dates (Du … Au …).
-        Puis met à jour le total correspondant.
+        Filtres courants :
+         - statut choisi (Actif, Annulé, Tous) traduit en "active"/"cancelled"/None,
+         - plage de dates (Du … Au …) en datetime complet (inclusif).
         """
-        # 1) Traduire status_choice en "active"/"cancelled"/None
         status_choice = self.var_status.get()
-        if self.locale == "fr":
-            if status_choice == "Actif":
-                status_filter = "active"
-            elif status_choice == "Annulé":
-                status_filter = "cancelled"
-            else:
-                status_filter = None  # "Tous"
-        else:
-            if status_choice == "Active":
-                status_filter = "active"
-            elif status_choice == "Cancelled":
-                status_filter = "cancelled"
-            else:
-                status_filter = None  # "All"
-
-        # 2) Construire date_from / date_to en datetime complet (inclusif)
+        status_filter = {
+            "Actif": "active", "Annulé": "cancelled",
+            "Active": "active", "Cancelled": "cancelled",
+        }.get(status_choice)  # "Tous" / "All" → None
+
         d_from = self.ret_from.get_date()
         d_to   = self.ret_to.get_date()
-        date_from_dt = datetime(d_from.year,   d_from.month,   d_from.day,   0,  0,  0)
-        date_to_dt   = datetime(d_to.year,     d_to.month,     d_to.day,     23, 59, 59)
-
-        # 3) Appeler le controller pour récupérer la liste filtrée
-        rets = self.retrait_ctrl.list_retraits(
-            status=status_filter,
-            date_from=date_from_dt,
-            date_to=date_to_dt
-        )
-
-        # 4) Remplir le Treeview
-        self.tree.delete(*self.tree.get_children())
-        for r in rets:
-            utilisateur   = getattr(r.user, 'username', str(r.handled_by))
-            justification = r.cancel_justification or r.justification or ""
-            vals = (
-                r.retrait_id,
-                f"{float(r.amount):.2f}",
-                r.retrait_at.strftime("%Y-%m-%d %H:%M"),
-                utilisateur,
-                justification,
-                r.status
-            )
-            tag = r.status  # 'active' ou 'cancelled'
-            self.tree.insert("", "end", iid=str(r.retrait_id), values=vals, tags=(tag,))
-
-        # 5) Mettre à jour le total
-        self._refresh_totals()
+        return {
+            "status":    status_filter,
+            "date_from": datetime(d_from.year, d_from.month, d_from.day, 0,  0,  0),
+            "date_to":   datetime(d_to.year,   d_to.month,   d_to.day,   23, 59, 59),
+        }
 
-
-    def _refresh_totals(self):
+    def load_data(self):
         """
-        Calcule la somme des montants des retraits selon le même filtre
-        (statut, date_from, date_to) et l’affiche dans self.var_total.
+        Recharge la liste des retraits et le total correspondant, en arrière-plan
+        (un changement de filtre pendant le chargement périme l'ancien résultat).
         """
-        status_choice = self.var_status.get()
-        if self.locale == "fr":
-            if status_choice == "Actif":
-                status_filter = "active"
-            elif status_choice == "Annulé":
-                status_filter = "cancelled"
-            else:
-                status_filter = None
-        else:
-            if status_choice == "Active":
-                status_filter = "active"
-            elif status_choice == "Cancelled":
-                status_filter = "cancelled"
-            else:
-                status_filter = None
+        filters = self._filters()
+
+        def fetch(ctrl):
+            rows = []
+            for r in ctrl.list_retraits(**filters):
+                utilisateur   = getattr(r.user, 'username', str(r.handled_by))
+                justification = r.cancel_justification or r.justification or ""
+                vals = (
+                    r.retrait_id,
+                    f"{float(r.amount):.2f}",
+                    r.retrait_at.strftime("%Y-%m-%d %H:%M"),
+                    utilisateur,
+                    justification,
+                    r.status
+                )
+                rows.append((str(r.retrait_id), vals, r.status))  # tag 'active' ou 'cancelled'
+            return LoadResult(rows, ctrl.get_total_retraits(**filters))
 
-        d_from = self.ret_from.get_date()
-        d_to   = self.ret_to.get_date()
-        date_from_dt = datetime(d_from.year,   d_from.month,   d_from.day,   0,  0,  0)
-        date_to_dt   = datetime(d_to.year,     d_to.month,     d_to.day,     23, 59, 59)
+        self.tree.delete(*self.tree.get_children())
+        self.loader.load(fetch, self._insert_rows,
+                         on_done=lambda total: self.var_total.set(f"{total:.2f}"))
 
-        total = self.retrait_ctrl.get_total_retraits(
-            status=status_filter,
-            date_from=date_from_dt,
-            date_to=date_to_dt
-        )
-        self.var_total.set(f"{total:.2f}")
+    def _insert_rows(self, rows):
+        for iid, vals, tag in rows:
+            self.tree.insert("", "end", iid=iid, values=vals, tags=(tag,))
 
 
     def _cancel_selected(self):
@@ -2,12 +2,38 @@ import tkinter as tk
 import customtkinter as ctk
 from tkinter import ttk, messagebox
 from view.secretaire.stock_form import StockFormView  # vue d’édition/création
+from view.secretaire.reorder_suggestions import ReorderSuggestionsView
+from view.async_loader import AsyncLoader, LoadResult
+from view.tree_model import TreeModel
 
 class StockListView(ctk.CTkFrame):
+    PAGE_SIZE = 50
+
+    # Fenêtres de péremption : libellé -> (expires_within_days, expired)
+    EXPIRY_WINDOWS = {
+        "Toutes / All":             (None, False),
+        "Périmés / Expired":        (None, True),
+        "≤ 30 jours / days":        (30, False),
+        "≤ 90 jours / days":        (90, False),
+    }
+
+    # Colonne affichée -> colonne triable côté base
+    SORT_COLUMNS = {
+        "Nom / Name":          "drug_name",
+        "Type / Type":         "medication_type",
+        "Quantité / Quantity": "quantity",
+        "Statut / Status":     "stock_status",
+        "Expiration":          "expiry_date",
+    }
+
     def __init__(self, parent, controller, **kwargs):
         super().__init__(parent, **kwargs)
         self.controller = controller
         self.filtered = None
+        self.page = 1
+        self.total = 0
+        self.sort_by = "drug_name"
+        self.descending = False
 
         # Titre
         ctk.CTkLabel(
@@ -69,7 +95,20 @@ class StockListView(ctk.CTkFrame):
             width=150,
             command=lambda _: self.apply_filters()
         )
-        status_combo.grid(row=0, column=6, sticky="ew")
+        status_combo.grid(row=0, column=6, sticky="ew", padx=(0, 15))
+
+        # Filtre par péremption
+        ctk.CTkLabel(filter_frame, text="Péremption / Expiry :").grid(
+            row=0, column=7, sticky="e", padx=(0, 5)
+        )
+        self.expiry_var = tk.StringVar(value="Toutes / All")
+        ctk.CTkComboBox(
+            filter_frame,
+            variable=self.expiry_var,
+            values=list(self.EXPIRY_WINDOWS),
+            width=150,
+            command=lambda _: self.apply_filters()
+        ).grid(row=0, column=8, sticky="ew")
 
         # --- Treeview des produits ---
         cols = (
@@ -89,9 +128,24 @@ class StockListView(ctk.CTkFrame):
             height=15
         )
         for col in cols:
-            self.tree.heading(col, text=col, anchor="center")
+            if col in self.SORT_COLUMNS:
+                # Clic sur l'en-tête : tri côté base
+                self.tree.heading(col, text=col, anchor="center",
+                                  command=lambda c=self.SORT_COLUMNS[col]: self._sort_by(c))
+            else:
+                self.tree.heading(col, text=col, anchor="center")
             self.tree.column(col, anchor="center", width=100)
-        self.tree.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+        self.tree.pack(fill="both", expand=True, padx=10, pady=(0, 5))
+        # Rafraîchissements appliqués par différence (clé : medication_id)
+        self.model = TreeModel(self.tree)
+
+        # Pagination
+        nav = ctk.CTkFrame(self, fg_color="transparent")
+        nav.pack(fill="x", padx=10, pady=(0, 10))
+        ctk.CTkButton(nav, text="←", width=30, command=self.prev_page).pack(side="left", padx=5)
+        ctk.CTkButton(nav, text="→", width=30, command=self.next_page).pack(side="right", padx=5)
+        self.count_label = ctk.CTkLabel(nav, text="")
+        self.count_label.pack(side="left", expand=True)
 
         # Styles de ligne (coloration selon stock_status)
         style = ttk.Style()
@@ -105,44 +159,25 @@ class StockListView(ctk.CTkFrame):
         action_frame.pack(fill="x", padx=10, pady=(0, 10))
         ctk.CTkButton(action_frame, text="Nouveau / New", command=self._on_create).pack(side="left", padx=(0, 10))
         ctk.CTkButton(action_frame, text="Éditer / Edit", command=self._on_edit).pack(side="left", padx=(0, 10))
-        ctk.CTkButton(action_frame, text="Rafraîchir / Refresh", command=self.load_data).pack(side="left")
+        ctk.CTkButton(action_frame, text="Rafraîchir / Refresh", command=self.load_data).pack(side="left", padx=(0, 10))
+        ctk.CTkButton(
+            action_frame, text="Réappro. suggéré / Reorder",
+            command=lambda: ReorderSuggestionsView(self, self.controller)
+        ).pack(side="left")
+
+        # Recherche en base hors du thread Tk ; un nouveau filtre périme la requête en cours
+        self.loader = AsyncLoader(self, controller, status_label=self.count_label,
+                                  loading_text="Chargement… / Loading…")
 
         # Chargement initial
         self.load_data()
 
     def apply_filters(self):
         """
-        Combine recherche (nom/type/forme), filtre type et filtre statut.
+        Combine recherche (nom/type/forme), filtre type, filtre statut et
+        fenêtre de péremption ; filtrage, tri et pagination sont faits en base.
         """
-        all_products = self.controller.list_products()
-        term = self.search_var.get().strip().lower()
-        t_full = self.type_var.get()
-        s_full = self.status_var.get()
-
-        # Extraction des parties françaises avant le slash
-        t = t_full.split(" / ")[0].strip()       # ex. "Naturel" ou "Tous"
-        s = s_full.split(" / ")[0].strip()       # ex. "normal" ou "Tous"
-
-        filtered = all_products
-
-        # 1) Recherche : nom OU type OU forme
-        if term:
-            filtered = [
-                p for p in filtered
-                if term in p.drug_name.lower()
-                or term in p.medication_type.lower()
-                or term in p.forme.lower()
-            ]
-
-        # 2) Filtre par type
-        if t != "Tous":
-            filtered = [p for p in filtered if p.medication_type == t]
-
-        # 3) Filtre par statut
-        if s != "Tous":
-            filtered = [p for p in filtered if p.stock_status == s]
-
-        self.filtered = filtered
+        self.page = 1
         self._populate_tree()
 
     def load_data(self):
@@ -152,37 +187,80 @@ class StockListView(ctk.CTkFrame):
         self.search_var.set("")
         self.type_var.set("Tous / All")
         self.status_var.set("Tous / All")
-        self.filtered = None
+        self.expiry_var.set("Toutes / All")
+        self.page = 1
+        self._populate_tree()
+
+    def _sort_by(self, column):
+        # Second clic sur la même colonne : ordre inversé
+        self.descending = not self.descending if column == self.sort_by else False
+        self.sort_by = column
+        self.page = 1
         self._populate_tree()
 
+    def prev_page(self):
+        if self.page > 1:
+            self.page -= 1
+            self._populate_tree()
+
+    def next_page(self):
+        if self.page * self.PAGE_SIZE < self.total:
+            self.page += 1
+            self._populate_tree()
+
     def _populate_tree(self):
-        for iid in self.tree.get_children():
-            self.tree.delete(iid)
-
-        data = self.filtered if self.filtered is not None else self.controller.list_products()
-
-        for p in data:
-            dosage_str = f"{float(p.dosage_mg):.2f}" if p.dosage_mg is not None else ""
-            expiry_str = p.expiry_date.strftime("%Y-%m-%d") if p.expiry_date else ""
-            tag = p.stock_status
-
-            values = (
-                p.drug_name,
-                p.medication_type,
-                p.forme,
-                p.quantity,
-                p.threshold,
-                p.stock_status,
-                dosage_str,
-                expiry_str
-            )
-            self.tree.insert(
-                "",
-                "end",
-                iid=p.medication_id,
-                values=values,
-                tags=(tag,)
-            )
+        """
+        Recharge la page courante en arrière-plan ; la page affichée reste en
+        place jusqu'au résultat, appliqué au Treeview par différence.
+        """
+        # Extraction des parties françaises avant le slash
+        t = self.type_var.get().split(" / ")[0].strip()       # ex. "Naturel" ou "Tous"
+        s = self.status_var.get().split(" / ")[0].strip()     # ex. "normal" ou "Tous"
+        within, expired = self.EXPIRY_WINDOWS.get(self.expiry_var.get(), (None, False))
+        params = dict(
+            term=self.search_var.get().strip() or None,
+            type_filter=t,
+            status_filter=s,
+            expires_within_days=within,
+            expired=expired,
+            sort_by=self.sort_by,
+            descending=self.descending,
+            page=self.page,
+            per_page=self.PAGE_SIZE
+        )
+
+        def fetch(ctrl):
+            data, total = ctrl.search_products_page(**params)
+            return LoadResult([self._row(p) for p in data], total)
+
+        self.filtered = []
+        self.loader.load(fetch, self._insert_rows, on_done=self._page_loaded)
+
+    @staticmethod
+    def _row(p):
+        """(iid, valeurs, tag) d'un produit ; appelé dans le thread de chargement."""
+        dosage_str = f"{float(p.dosage_mg):.2f}" if p.dosage_mg is not None else ""
+        expiry_str = p.expiry_date.strftime("%Y-%m-%d") if p.expiry_date else ""
+        values = (
+            p.drug_name,
+            p.medication_type,
+            p.forme,
+            p.quantity,
+            p.threshold,
+            p.stock_status,
+            dosage_str,
+            expiry_str
+        )
+        return p.medication_id, values, p.stock_status
+
+    def _insert_rows(self, rows):
+        self.filtered.extend(rows)
+
+    def _page_loaded(self, total):
+        self.model.set_rows(self.filtered)
+        self.total = total
+        pages = max(1, -(-self.total // self.PAGE_SIZE))
+        self.count_label.configure(text=f"{self.total} produit(s) — page {self.page}/{pages}")
 
     def _on_create(self):
         """
@@ -0,0 +1,190 @@
+# view/tree_model.py
+
+
+class TreeModel:
+    """
+    Adaptateur entre un ttk.Treeview et des lignes indexées par clé primaire.
+
+    Les lignes sont des tuples (clé, valeurs, tags). set_rows() compare avec
+    ce qui est affiché et n'applique que les différences : suppression des
+    clés disparues, item() pour les lignes modifiées, insert() pour les
+    nouvelles, move() si l'ordre a changé. Les items conservés ne sont pas
+    recréés : sélection et position de défilement restent en place.
+
+    virtual=True : seules les lignes visibles sont matérialisées dans le
+    Treeview (fenêtre recalculée à chaque redimensionnement) ; la scrollbar
+    et la molette pilotent le décalage de la fenêtre dans le modèle.
+    on_scroll_end() est appelé quand l'utilisateur atteint le bas de la liste
+    (chargement de la page suivante).
+    stripes=('even', 'odd') : tag de zébrage ajouté selon le rang de la ligne.
+    """
+
+    def __init__(self, tree, scrollbar=None, virtual: bool = False,
+                 on_scroll_end=None, stripes=None):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.virtual = virtual
+        self.on_scroll_end = on_scroll_end
+        self.stripes = stripes
+        self._keys = []         # ordre des lignes du modèle
+        self._data = {}         # clé -> (valeurs, tags)
+        self._shown = {}        # clé -> (valeurs, tags) tels que rendus dans le Treeview
+        self.offset = 0
+        self.window = int(tree.cget("height")) if virtual else None
+        self._offscreen_selection = set()
+
+        if virtual:
+            if scrollbar is not None:
+                scrollbar.configure(command=self.yview)
+            tree.configure(yscrollcommand=lambda *_: None)
+            tree.bind("<Configure>", self._on_resize, add="+")
+            tree.bind("<MouseWheel>", self._on_wheel, add="+")
+            tree.bind("<Button-4>", lambda e: self._scroll(-3), add="+")
+            tree.bind("<Button-5>", lambda e: self._scroll(3), add="+")
+            # Nouvelle sélection par l'utilisateur : on oublie l'ancienne hors écran
+            tree.bind("<Button-1>", lambda e: self._offscreen_selection.clear(), add="+")
+        elif scrollbar is not None:
+            tree.configure(yscrollcommand=self._on_tree_scroll)
+
+    # — données —
+
+    def __len__(self):
+        return len(self._keys)
+
+    def keys(self) -> list:
+        return list(self._keys)
+
+    def get(self, key):
+        """Valeurs de la ligne `key` (None si absente)."""
+        row = self._data.get(str(key))
+        return row[0] if row else None
+
+    def selection(self) -> list:
+        """Clés sélectionnées, y compris hors de la fenêtre affichée (mode virtuel)."""
+        return list(self.tree.selection()) + sorted(self._offscreen_selection - set(self.tree.selection()))
+
+    def set_rows(self, rows) -> None:
+        """Remplace le contenu du modèle par `rows` et met à jour le Treeview par différence."""
+        self._keys, self._data = [], {}
+        self._add(rows)
+        self._render()
+
+    def append_rows(self, rows) -> None:
+        """Ajoute des lignes en fin de liste (pages suivantes) ; une clé déjà présente est mise à jour."""
+        self._add(rows)
+        self._render()
+
+    def clear(self) -> None:
+        self.set_rows(())
+
+    def _add(self, rows):
+        for key, values, tags in rows:
+            key = str(key)
+            if isinstance(tags, str):
+                tags = (tags,)
+            if key not in self._data:
+                self._keys.append(key)
+            self._data[key] = (tuple(values), tuple(tags or ()))
+
+    # — rendu —
+
+    def _visible_keys(self) -> list:
+        if not self.virtual:
+            return self._keys
+        self.offset = max(0, min(self.offset, len(self._keys) - self.window))
+        return self._keys[self.offset:self.offset + self.window]
+
+    def _render(self) -> None:
+        tree = self.tree
+        target = self._visible_keys()
+        target_set = set(target)
+
+        selected = set(tree.selection()) | self._offscreen_selection
+        current = tree.get_children()
+        stale = [iid for iid in current if iid not in target_set]
+        if stale:
+            tree.delete(*stale)
+            for iid in stale:
+                self._shown.pop(iid, None)
+
+        start = self.offset if self.virtual else 0
+        for index, key in enumerate(target):
+            values, tags = self._data[key]
+            if self.stripes:
+                tags = tags + (self.stripes[(start + index) % 2],)
+            shown = self._shown.get(key)
+            if shown is None:
+                tree.insert("", index, iid=key, values=values, tags=tags)
+            elif shown != (values, tags):
+                tree.item(key, values=values, tags=tags)
+            self._shown[key] = (values, tags)
+
+        if tuple(tree.get_children()) != tuple(target):
+            for index, key in enumerate(target):
+                tree.move(key, "", index)
+
+        if self.virtual:
+            on_screen = [k for k in selected if k in target_set]
+            self._offscreen_selection = {k for k in selected if k not in target_set and k in self._data}
+            if set(tree.selection()) != set(on_screen):
+                tree.selection_set(on_screen)
+            self._update_scrollbar()
+
+    # — défilement (mode virtuel) —
+
+    def _update_scrollbar(self):
+        if self.scrollbar is None:
+            return
+        total = len(self._keys)
+        if total <= self.window:
+            self.scrollbar.set(0.0, 1.0)
+        else:
+            self.scrollbar.set(self.offset / total, (self.offset + self.window) / total)
+
+    def yview(self, *args):
+        """Commande de la scrollbar (protocole Tk : moveto / scroll n units|pages)."""
+        if not args:
+            return
+        total = len(self._keys)
+        if args[0] == "moveto":
+            self._move_to(int(float(args[1]) * total))
+        elif args[0] == "scroll":
+            step = int(args[1])
+            if args[2] == "pages":
+                step *= max(1, self.window - 1)
+            self._scroll(step)
+
+    def _scroll(self, step: int):
+        self._move_to(self.offset + step)
+        return "break"
+
+    def _move_to(self, offset: int):
+        before = self.offset
+        self.offset = offset
+        self._render()
+        at_end = self.offset + self.window >= len(self._keys)
+        if at_end and offset >= before and self.on_scroll_end is not None:
+            self.on_scroll_end()
+
+    def _on_wheel(self, event):
+        return self._scroll(-3 if event.delta > 0 else 3)
+
+    def _on_resize(self, event):
+        style_name = self.tree.cget("style") or "Treeview"
+        try:
+            row_height = int(self.tree.tk.call("ttk::style", "lookup", style_name, "-rowheight") or 20)
+        except Exception:
+            row_height = 20
+        # Une ligne d'en-tête, puis autant de lignes que la hauteur le permet
+        window = max(1, event.height // row_height - 1)
+        if window != self.window:
+            self.window = window
+            self._render()
+
+    # — défilement natif (mode non virtuel) —
+
+    def _on_tree_scroll(self, first, last):
+        """yscrollcommand : met à jour la scrollbar et signale l'approche du bas de liste."""
+        self.scrollbar.set(first, last)
+        if float(last) >= 0.95 and self.on_scroll_end is not None and self._keys:
+            self.tree.after_idle(self.on_scroll_end)
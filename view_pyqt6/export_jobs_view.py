@@ -0,0 +1,114 @@
+# view_pyqt6/export_jobs_view.py
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget,
+    QTableWidgetItem, QHeaderView, QMessageBox
+)
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+
+from service.export_jobs import export_manager, DONE, FAILED
+
+
+def job_progress_text(job) -> str:
+    if job.total:
+        return f"{job.done}/{job.total} ({job.progress:.0%})"
+    return str(job.done) if job.done else ""
+
+
+class JobSignals(QObject):
+    """Pont thread d'export → thread UI : émis depuis le pool, reçu dans la boucle Qt."""
+    changed = pyqtSignal(object)
+
+
+class JobRunnable(QRunnable):
+    def __init__(self, job):
+        super().__init__()
+        self.job = job
+
+    def run(self):
+        self.job.run()
+
+
+# Signaux des jobs en cours : gardés vivants jusqu'à la fin du job
+_live_signals = {}
+
+
+def start_export(parent, label: str, task, on_progress=None, on_done=None):
+    """
+    Lance `task` sur QThreadPool (job inscrit dans export_manager) ;
+    on_progress(job) / on_done(job) sont appelés dans le thread UI.
+    Par défaut, fin signalée par une boîte de dialogue.
+    """
+    job = export_manager.create(label, task)
+    signals = JobSignals()
+    _live_signals[job.job_id] = signals
+
+    def on_changed(j):
+        if not j.finished:
+            if on_progress:
+                on_progress(j)
+            return
+        _live_signals.pop(j.job_id, None)
+        if on_done is not None:
+            on_done(j)
+        elif j.status == DONE:
+            QMessageBox.information(parent, "Export terminé", f"Fichier généré :\n{j.result}")
+        elif j.status == FAILED:
+            QMessageBox.critical(parent, "Erreur d'export", str(j.error))
+
+    signals.changed.connect(on_changed)
+    job.subscribe(signals.changed.emit)
+    QThreadPool.globalInstance().start(JobRunnable(job))
+    return job
+
+
+class ExportJobsDialog(QDialog):
+    """Liste des exports du poste : état, progression, fichier ; annulation."""
+
+    COLUMNS = ["ID", "Export", "État", "Progression", "Fichier"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Exports en cours")
+        self.resize(760, 320)
+        layout = QVBoxLayout(self)
+
+        self.table = QTableWidget(0, len(self.COLUMNS), self)
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QTableWidget.SelectionMode.SingleSelection)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        layout.addWidget(self.table)
+
+        btns = QHBoxLayout()
+        btn_cancel = QPushButton("Annuler", self)
+        btn_cancel.clicked.connect(self.cancel_selected)
+        btn_clear = QPushButton("Nettoyer", self)
+        btn_clear.clicked.connect(self.clear_finished)
+        btns.addWidget(btn_cancel); btns.addWidget(btn_clear); btns.addStretch()
+        layout.addLayout(btns)
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(500)
+        self.refresh()
+
+    def refresh(self):
+        selected = {self.table.item(i.row(), 0).text() for i in self.table.selectionModel().selectedRows()}
+        jobs = export_manager.jobs()
+        self.table.setRowCount(len(jobs))
+        for row, job in enumerate(jobs):
+            result = job.result if job.status == DONE else (str(job.error or "") if job.status == FAILED else "")
+            vals = [job.job_id, job.label, job.status, job_progress_text(job), result or ""]
+            for col, v in enumerate(vals):
+                self.table.setItem(row, col, QTableWidgetItem(str(v)))
+            if str(job.job_id) in selected:
+                self.table.selectRow(row)
+
+    def cancel_selected(self):
+        for idx in self.table.selectionModel().selectedRows():
+            export_manager.cancel(int(self.table.item(idx.row(), 0).text()))
+
+    def clear_finished(self):
+        export_manager.clear_finished()
+        self.refresh()
@@ -4,13 +4,14 @@ import os
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QFormLayout, QLineEdit, QComboBox,
     QDateEdit, QPushButton, QTableWidget, QTableWidgetItem, QHeaderView,
-    QFileDialog, QMessageBox
+    QFileDialog, QMessageBox, QLabel
 )
 from PyQt6.QtCore import Qt, QDate
 from datetime import datetime, timedelta
 
 from view_pyqt6.medical_record.mr_form_view import MedicalRecordFormView
-from utils.export_utils import export_medical_records_to_pdf, export_medical_records_to_excel
+from service.export_jobs import DONE, FAILED
+from view_pyqt6.export_jobs_view import start_export, ExportJobsDialog, job_progress_text
 
 class MedicalRecordListView(QWidget):
     def __init__(self, parent, controller, on_prescribe):
@@ -19,6 +20,8 @@ class MedicalRecordListView(QWidget):
         self.on_prescribe = on_prescribe
         self.page = 1
         self.per_page = 20
+        self.total = 0
+        self.records = []
         self.selected_record = None
 
         # Récupère les motifs
@@ -58,7 +61,7 @@ class MedicalRecordListView(QWidget):
         filt_layout.addWidget(self.le_search)
         # Boutons
         btn_refresh = QPushButton("Filtrer", self)
-        btn_refresh.clicked.connect(self.refresh)
+        btn_refresh.clicked.connect(self.apply_filters)
         filt_layout.addWidget(btn_refresh)
         btn_pdf = QPushButton("Export PDF", self)
         btn_pdf.clicked.connect(self.export_pdf)
@@ -66,6 +69,11 @@ class MedicalRecordListView(QWidget):
         btn_xlsx = QPushButton("Export Excel", self)
         btn_xlsx.clicked.connect(self.export_excel)
         filt_layout.addWidget(btn_xlsx)
+        btn_jobs = QPushButton("Exports", self)
+        btn_jobs.clicked.connect(lambda: ExportJobsDialog(self).show())
+        filt_layout.addWidget(btn_jobs)
+        self.export_label = QLabel("", self)
+        filt_layout.addWidget(self.export_label)
 
         main.addLayout(filt_layout)
 
@@ -103,6 +111,9 @@ class MedicalRecordListView(QWidget):
         btn_prev = QPushButton("← Page précédente", self)
         btn_prev.clicked.connect(self.prev_page)
         nav.addWidget(btn_prev)
+        self.count_label = QLabel("", self)
+        self.count_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        nav.addWidget(self.count_label, 1)
         btn_next = QPushButton("Page suivante →", self)
         btn_next.clicked.connect(self.next_page)
         nav.addWidget(btn_next)
@@ -111,36 +122,25 @@ class MedicalRecordListView(QWidget):
         # Chargement initial
         self.refresh()
 
-    def _get_filtered_records(self, for_export=False):
-        if for_export:
-            recs = self.ctrl.list_records(page=1, per_page=10000)
-        else:
-            recs = self.ctrl.list_records(page=self.page, per_page=self.per_page)
-        # Filtre dates
-        from_d = self.from_date.date().toPyDate()
-        to_d   = self.to_date.date().toPyDate()
-        recs = [r for r in recs if from_d <= r.consultation_date.date() <= to_d]
-        # Filtre motif
+    def _filters(self) -> dict:
+        """Filtres de la barre (date, motif, gravité, recherche), appliqués côté base."""
         m = self.cbo_motif.currentText()
-        if m != "Tous":
-            code = self.label_to_code[m]
-            recs = [r for r in recs if r.motif_code == code]
-        # Filtre gravité
-        s = self.cbo_sev.currentText()
-        if s != "Toutes":
-            recs = [r for r in recs if r.severity == s]
-        # Filtre recherche
-        q = self.le_search.text().strip().lower()
-        if q:
-            recs = [
-                r for r in recs
-                if r.patient and (
-                    q in r.patient.code_patient.lower()
-                    or q in f"{r.patient.last_name} {r.patient.first_name}".lower()
-                )
-            ]
-        # Tri décroissant
-        return sorted(recs, key=lambda r: r.consultation_date, reverse=True)
+        sev = self.cbo_sev.currentText()
+        return {
+            'date_from':  self.from_date.date().toPyDate(),
+            'date_to':    self.to_date.date().toPyDate(),
+            'motif_code': self.label_to_code.get(m) if m != "Tous" else None,
+            'severity':   sev if sev != "Toutes" else None,
+            'search':     self.le_search.text().strip() or None,
+        }
+
+    def _get_filtered_records(self):
+        # Page courante (filtres et tri par date décroissante en base)
+        return self.ctrl.list_records(page=self.page, per_page=self.per_page, **self._filters())
+
+    def apply_filters(self):
+        self.page = 1
+        self.refresh()
 
     def refresh(self):
         self.selected_record = None
@@ -148,6 +148,10 @@ class MedicalRecordListView(QWidget):
         self.btn_email.setEnabled(False)
         self.btn_presc.setEnabled(False)
         recs = self._get_filtered_records()
+        self.total = self.ctrl.count_records(**self._filters())
+        self.records = recs
+        pages = max(1, -(-self.total // self.per_page))
+        self.count_label.setText(f"{self.total} dossier(s) — page {self.page}/{pages}")
         self.table.setRowCount(0)
         for r in recs:
             row = self.table.rowCount()
@@ -181,50 +185,36 @@ class MedicalRecordListView(QWidget):
             self.refresh()
 
     def next_page(self):
-        self.page += 1
-        self.refresh()
+        if self.page * self.per_page < self.total:
+            self.page += 1
+            self.refresh()
 
     def export_pdf(self):
         path, _ = QFileDialog.getSaveFileName(self, "Exporter PDF", "", "PDF Files (*.pdf)")
         if not path:
             return
-        recs = self._get_filtered_records(for_export=True)
-        data = [{
-            'record_id': r.record_id,
-            'consultation_date': r.consultation_date,
-            'patient_name': f"{r.patient.last_name} {r.patient.first_name}" if r.patient else "",
-            'motif_code': r.motif_code,
-            'severity': r.severity,
-            'bp': r.bp,
-            'temperature': r.temperature,
-            'weight': r.weight,
-            'height': r.height,
-            'diagnosis': r.diagnosis,
-            'treatment': r.treatment
-        } for r in recs]
-        export_medical_records_to_pdf(data, path)
-        QMessageBox.information(self, "Export PDF", f"Fichier enregistré :\n{path}")
+        # Rendu sur QThreadPool : la fenêtre reste utilisable
+        task = self.ctrl.export_records_task(path, "pdf", **self._filters())
+        start_export(self, "Dossiers médicaux (PDF)", task,
+                     on_progress=self._export_progress, on_done=self._export_done)
 
     def export_excel(self):
         path, _ = QFileDialog.getSaveFileName(self, "Exporter Excel", "", "Excel Files (*.xlsx)")
         if not path:
             return
-        recs = self._get_filtered_records(for_export=True)
-        data = [{
-            'record_id': r.record_id,
-            'consultation_date': r.consultation_date,
-            'patient_name': f"{r.patient.last_name} {r.patient.first_name}" if r.patient else "",
-            'motif_code': r.motif_code,
-            'severity': r.severity,
-            'bp': r.bp,
-            'temperature': r.temperature,
-            'weight': r.weight,
-            'height': r.height,
-            'diagnosis': r.diagnosis,
-            'treatment': r.treatment
-        } for r in recs]
-        export_medical_records_to_excel(data, path)
-        QMessageBox.information(self, "Export Excel", f"Fichier enregistré :\n{path}")
+        task = self.ctrl.export_records_task(path, "xlsx", **self._filters())
+        start_export(self, "Dossiers médicaux (Excel)", task,
+                     on_progress=self._export_progress, on_done=self._export_done)
+
+    def _export_progress(self, job):
+        self.export_label.setText(f"{job.label} : {job_progress_text(job)}")
+
+    def _export_done(self, job):
+        self.export_label.setText(f"{job.label} : {job.status}")
+        if job.status == DONE:
+            QMessageBox.information(self, "Export", f"Fichier enregistré :\n{job.result}")
+        elif job.status == FAILED:
+            QMessageBox.critical(self, "Erreur d'export", str(job.error))
 
     def view_record(self):
         if not self.selected_record:
@@ -241,8 +231,7 @@ class MedicalRecordListView(QWidget):
     def prescribe_record(self):
         if not self.selected_record:
             return
-        recs = self._get_filtered_records()
-        rec = next((r for r in recs if r.record_id == self.selected_record), None)
+        rec = next((r for r in self.records if r.record_id == self.selected_record), None)
         if rec and rec.patient_id:
             self.on_prescribe(patient_id=rec.patient_id,
                               medical_record_id=rec.record_id)
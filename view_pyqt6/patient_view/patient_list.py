@@ -1,13 +1,13 @@
 import os
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton,
-    QTableWidget, QTableWidgetItem, QMessageBox, QDialog
+    QTableWidget, QTableWidgetItem, QMessageBox, QDialog, QLabel
 )
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont
 from view_pyqt6.patient_view.patient_profile import PatientProfileView
 from view_pyqt6.patient_view.patient_edit_view import PatientsEditView
-from utils.pdf_export import export_patients_to_pdf
+from view_pyqt6.export_jobs_view import start_export, ExportJobsDialog
 
 class PatientListView(QWidget):
     def __init__(self, parent, controller=None, patients=None):
@@ -50,6 +50,9 @@ class PatientListView(QWidget):
         btn_export = QPushButton("Export PDF")
         btn_export.clicked.connect(self.export_pdf)
         top_layout.addWidget(btn_export)
+        btn_jobs = QPushButton("Exports")
+        btn_jobs.clicked.connect(lambda: ExportJobsDialog(self).show())
+        top_layout.addWidget(btn_jobs)
 
         main_layout.addLayout(top_layout)
 
@@ -70,6 +73,9 @@ class PatientListView(QWidget):
         btn_prev = QPushButton("←")
         btn_prev.clicked.connect(self.prev_page)
         nav_layout.addWidget(btn_prev)
+        self.count_label = QLabel("")
+        self.count_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        nav_layout.addWidget(self.count_label, 1)
         btn_next = QPushButton("→")
         btn_next.clicked.connect(self.next_page)
         nav_layout.addWidget(btn_next)
@@ -83,7 +89,18 @@ class PatientListView(QWidget):
         self.edit_btn.setEnabled(False)
 
         search = self.search_entry.text().strip() or None
-        data = self.patients_override or self.controller.list_patients(page=self.page, per_page=15, search=search)
+        if search != getattr(self, '_last_search', None):
+            self._last_search = search
+            self.page = 1
+        if self.patients_override:
+            data = self.patients_override
+        elif search:
+            # Recherche classée par pertinence, avec le nombre total de résultats
+            data, total = self.controller.search_patients(search, page=self.page, per_page=15)
+            self.count_label.setText(f"{total} résultat(s) — page {self.page}")
+        else:
+            data = self.controller.list_patients(page=self.page, per_page=15)
+            self.count_label.setText(f"Page {self.page}")
 
         self.table.setRowCount(0)
         for p in data:
@@ -114,12 +131,9 @@ class PatientListView(QWidget):
         self.refresh()
 
     def export_pdf(self):
-        try:
-            data = self.controller.list_patients(page=self.page, per_page=1000)
-            out_path = export_patients_to_pdf(data, title="Liste des Patients")
-            QMessageBox.information(self, "Export PDF terminé", f"Fichier généré : {out_path}")
-        except Exception as e:
-            QMessageBox.critical(self, "Erreur Export PDF", str(e))
+        # Rendu sur QThreadPool : la fenêtre reste utilisable
+        task = self.controller.export_patients_task("Liste des Patients")
+        start_export(self, "Liste des patients (PDF)", task)
 
     def view_profile(self):
         if self.selected_patient is None:
@@ -13,6 +13,9 @@ from view_pyqt6.secretaire.retraitDialog import RetraitDialog
 from view_pyqt6.languagemanager import lang
 
 class CaisseListView(QWidget):
+    # Nombre de transactions chargées à chaque défilement de la table
+    PAGE_SIZE = 50
+
     def __init__(self, parent, controller,
                  caisse_retrait_controller,
                  patient_ctrl, pharmacy_ctrl,
@@ -23,7 +26,11 @@ class CaisseListView(QWidget):
         self.patient_ctrl = patient_ctrl
         self.pharmacy_ctrl = pharmacy_ctrl
         self.locale = locale
-        self.filtered = None
+
+        # Pagination par curseur : filtres courants + curseur de la page suivante
+        self._page_filters = {}
+        self._next_cursor = None
+        self._loading_page = False
 
         self.var_total_tx = "0.00"
         self.var_total_rt = "0.00"
@@ -75,13 +82,17 @@ class CaisseListView(QWidget):
         self.table.horizontalHeader().setSectionResizeMode(
             QHeaderView.ResizeMode.Stretch
         )
+        self.table.verticalScrollBar().valueChanged.connect(self._on_table_scroll)
         layout.addWidget(self.table)
 
         # Totals
         thl = QHBoxLayout()
-        thl.addWidget(QLabel("Total Tx :")); thl.addWidget(QLabel(self.var_total_tx))
-        thl.addWidget(QLabel("Total Retraits :")); thl.addWidget(QLabel(self.var_total_rt))
-        thl.addWidget(QLabel("Solde net :")); thl.addWidget(QLabel(self.var_net))
+        self.lbl_total_tx = QLabel(self.var_total_tx)
+        self.lbl_total_rt = QLabel(self.var_total_rt)
+        self.lbl_net      = QLabel(self.var_net)
+        thl.addWidget(QLabel("Total Tx :")); thl.addWidget(self.lbl_total_tx)
+        thl.addWidget(QLabel("Total Retraits :")); thl.addWidget(self.lbl_total_rt)
+        thl.addWidget(QLabel("Solde net :")); thl.addWidget(self.lbl_net)
         layout.addLayout(thl)
 
         # Actions
@@ -110,8 +121,8 @@ class CaisseListView(QWidget):
         self.load_data()
 
     def load_data(self):
-        txs = self.controller.list_transactions()
-        self._populate(txs)
+        self._page_filters = {}
+        self._reload_pages()
         self._refresh_totals()
         self.retrait_list.load_data()
 
@@ -123,18 +134,48 @@ class CaisseListView(QWidget):
         except:
             QMessageBox.warning(self, lang.t('warning'), "Dates invalides")
             return
-        txs = [tx for tx in self.controller.list_transactions()
-               if d1.date() <= tx.paid_at.date() <= d2.date()]
-        self._populate(txs)
+        self._page_filters = {
+            "date_from": d1.date(),
+            "date_to": d2.date(),
+            "term": self.search_le.text().strip() or None,
+        }
+        self._reload_pages()
         self._refresh_totals()
 
+    def _reload_pages(self):
+        """Vide la table et recharge la première page avec les filtres courants."""
+        self.table.setRowCount(0)
+        self._next_cursor = None
+        self._fetch_page(after=None)
+
+    def _on_table_scroll(self, value):
+        """Charge la page suivante lorsque l'utilisateur approche du bas de la table."""
+        bar = self.table.verticalScrollBar()
+        if value >= bar.maximum() - 5 and self._next_cursor is not None:
+            self._fetch_page(after=self._next_cursor)
+
+    def _fetch_page(self, after):
+        if self._loading_page:
+            return
+        self._loading_page = True
+        try:
+            txs, self._next_cursor = self.controller.list_transactions_page(
+                after=after,
+                limit=self.PAGE_SIZE,
+                **self._page_filters
+            )
+            self._populate(txs)
+        finally:
+            self._loading_page = False
+
     def _populate(self, txs):
-        self.table.setRowCount(len(txs))
-        for i, tx in enumerate(txs):
-            p = ""
-            if tx.patient_id:
-                pat = self.patient_ctrl.get_patient(tx.patient_id)
-                p = getattr(pat,'code_patient','') if pat else ''
+        """Ajoute les transactions d'une page à la fin de la table."""
+        start = self.table.rowCount()
+        self.table.setRowCount(start + len(txs))
+        for i, tx in enumerate(txs, start):
+            # patient_by_id est chargé par list_page (pas de requête par ligne)
+            pat = tx.patient_by_id
+            p = (pat.code_patient or '') if pat else ''
             vals = [
                 str(tx.transaction_id), p, tx.transaction_type,
                 tx.payment_method, f"{tx.amount:.2f}",
@@ -150,16 +191,21 @@ class CaisseListView(QWidget):
          - total des retraits (float)
          - net = total_tx - total_rt
         """
-        # On force tx.amount en float pour éviter Decimal/float
-        total_tx = sum(float(tx.amount) for tx in self.controller.list_transactions())
-        # get_total_retraits() retourne déjà un float
-        total_rt = self.retrait_ctrl.get_total_retraits(None, None, None)
-        net      = total_tx - total_rt
+        try:
+            d1 = date.fromisoformat(self.dt_from.text())
+            d2 = date.fromisoformat(self.dt_to.text())
+        except ValueError:
+            d1 = d2 = date.today()
+        # Une seule requête groupée ; les jours passés viennent de la clôture journalière
+        summary = self.controller.get_cash_summary(d1, d2)
 
         # Mise à jour des chaînes
-        self.var_total_tx = f"{total_tx:.2f}"
-        self.var_total_rt = f"{total_rt:.2f}"
-        self.var_net      = f"{net:.2f}"
+        self.var_total_tx = f"{summary['total_transactions']:.2f}"
+        self.var_total_rt = f"{summary['total_retraits']:.2f}"
+        self.var_net      = f"{summary['net']:.2f}"
+        self.lbl_total_tx.setText(self.var_total_tx)
+        self.lbl_total_rt.setText(self.var_total_rt)
+        self.lbl_net.setText(self.var_net)
 
 
     def _new(self):       CaisseFormDialog(self, self.controller,
@@ -11,6 +11,7 @@ from view_pyqt6.secretaire.retraitList import RetraitListView
 from view_pyqt6.secretaire.retraitDialog import RetraitDialog
 from datetime import date, datetime
 from view_pyqt6.languagemanager import lang
+from view_pyqt6.export_jobs_view import start_export
 
 class CSListView(QWidget):
     def __init__(self, parent=None, controller=None, locale='fr'):
@@ -21,6 +22,7 @@ class CSListView(QWidget):
         self.filtered = None
         self.page = 0
         self.page_size = 100
+        self.total = 0
         self._build_ui()
         self.load_data()
 
@@ -45,6 +47,14 @@ class CSListView(QWidget):
                    'Inscrit','Rdv','Montant','Obs']
         self.table.setHorizontalHeaderLabels(headers)
         l.addWidget(self.table)
+        # pagination
+        ph = QHBoxLayout()
+        prev_btn = QPushButton('←'); prev_btn.clicked.connect(self._prev_page)
+        next_btn = QPushButton('→'); next_btn.clicked.connect(self._next_page)
+        self.page_label = QLabel('')
+        self.page_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        ph.addWidget(prev_btn); ph.addWidget(self.page_label, 1); ph.addWidget(next_btn)
+        l.addLayout(ph)
         # export/edit
         ah = QHBoxLayout()
         btn_e = QPushButton(lang.t('edit')); btn_e.clicked.connect(self._edit)
@@ -53,24 +63,28 @@ class CSListView(QWidget):
         l.addLayout(ah)
 
     def load_data(self):
-        self.filtered=None; self.page=0; self._populate()
+        self.page=0; self._populate()
 
     def _apply_filters(self):
-        term = self.search_le.text().lower()
-        all_cs = self.controller.list_consultations()
-        if term:
-            def m(c):
-                if not c.patient: return False
-                return term in (c.patient.code_patient or '').lower() \
-                       or term in (c.patient.last_name or '').lower()
-            self.filtered = [c for c in all_cs if m(c)]
-        else:
-            self.filtered=None
+        # Recherche patient appliquée côté base
         self.page=0; self._populate()
 
+    def _prev_page(self):
+        if self.page > 0:
+            self.page -= 1; self._populate()
+
+    def _next_page(self):
+        if (self.page + 1) * self.page_size < self.total:
+            self.page += 1; self._populate()
+
     def _populate(self):
-        data = self.filtered if self.filtered is not None else self.controller.list_consultations()
-        page_data = data[self.page*self.page_size:(self.page+1)*self.page_size]
+        page_data, self.total = self.controller.list_consultations_page(
+            term=self.search_le.text().strip() or None,
+            page=self.page + 1, per_page=self.page_size
+        )
+        self.filtered = page_data
+        pages = max(1, (self.total + self.page_size - 1) // self.page_size)
+        self.page_label.setText(f"{self.total} — page {self.page + 1} / {pages}")
         self.table.setRowCount(len(page_data))
         for i, cs in enumerate(page_data):
             pat = cs.patient; txt = f"{pat.code_patient} – {pat.last_name} {pat.first_name}" if pat else ''
@@ -93,14 +107,15 @@ class CSListView(QWidget):
         if not sel:
             QMessageBox.warning(self, lang.t('warning'), 'Sélectionnez une ligne')
             return
-        idx = sel[0].row()
-        data = self.filtered or self.controller.list_consultations()
-        cs = data[self.page*self.page_size + idx]
+        cs = self.filtered[sel[0].row()]
         dlg = CSFormDialog(self, self.controller, self.controller.patient_ctrl,
                            consultation=cs, on_save=self.load_data,
                            locale=self.locale)
         dlg.exec()
 
     def _export(self):
-        # implement export logic or call utility
-        pass
\ No newline at end of file
+        # Toutes les consultations correspondant à la recherche, rendues sur QThreadPool
+        task = self.controller.export_consultations_task(
+            "Consultations", term=self.search_le.text().strip() or None
+        )
+        start_export(self, "Consultations (PDF)", task)
\ No newline at end of file
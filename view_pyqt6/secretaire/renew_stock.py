@@ -4,13 +4,14 @@ from PyQt6.QtWidgets import (
     QWidget, QMessageBox, QFrame
 )
 from PyQt6.QtCore import Qt
+from datetime import datetime
 
 class RenewStockDialog(QDialog):
     def __init__(self, parent=None, product_name:str="", on_confirm=None):
         super().__init__(parent)
         self.on_confirm = on_confirm
         self.setWindowTitle("Réapprovisionnement")
-        self.setFixedSize(400, 200)
+        self.setFixedSize(400, 300)
         
         # Main container
         container = QWidget(self)
@@ -31,6 +32,16 @@ class RenewStockDialog(QDialog):
         layout.addWidget(QLabel("Quantité à ajouter :"))
         layout.addWidget(self.add_edit)
 
+        # Lot : péremption et numéro (facultatifs)
+        self.expiry_edit = QLineEdit()
+        self.expiry_edit.setPlaceholderText("AAAA-MM-JJ (facultatif)")
+        layout.addWidget(QLabel("Péremption du lot :"))
+        layout.addWidget(self.expiry_edit)
+        self.lot_edit = QLineEdit()
+        self.lot_edit.setPlaceholderText("facultatif")
+        layout.addWidget(QLabel("Numéro de lot :"))
+        layout.addWidget(self.lot_edit)
+
         # Buttons
         btn_frame = QHBoxLayout()
         btn_frame.setSpacing(10)
@@ -55,6 +66,12 @@ class RenewStockDialog(QDialog):
         except ValueError:
             QMessageBox.critical(self, "Erreur", "La quantité doit être un entier strictement positif.")
             return
+        expiry_str = self.expiry_edit.text().strip()
+        try:
+            expiry = datetime.strptime(expiry_str, "%Y-%m-%d") if expiry_str else None
+        except ValueError:
+            QMessageBox.critical(self, "Erreur", "Date de péremption invalide (AAAA-MM-JJ).")
+            return
         if callable(self.on_confirm):
-            self.on_confirm(added)
+            self.on_confirm(added, expiry, self.lot_edit.text().strip() or None)
         self.accept()
\ No newline at end of file
@@ -7,10 +7,14 @@ from PyQt6.QtCore import Qt
 from view_pyqt6.secretaire.stock_form import StockFormDialog
 
 class StockListView(QWidget):
+    PAGE_SIZE = 50
+
     def __init__(self, parent=None, controller=None):
         super().__init__(parent)
         self.controller = controller
         self.filtered = None
+        self.page = 1
+        self.total = 0
         self._init_ui()
         self.load_data()
 
@@ -23,6 +27,7 @@ class StockListView(QWidget):
         fl = QHBoxLayout()
         self.search_le = QLineEdit()
         self.search_le.setPlaceholderText("Nom, type ou forme… / Name, type or form…")
+        self.search_le.returnPressed.connect(self.apply_filters)
         fl.addWidget(self.search_le)
         btn = QPushButton("🔍")
         btn.clicked.connect(self.apply_filters)
@@ -33,6 +38,8 @@ class StockListView(QWidget):
         self.status_cb = QComboBox()
         self.status_cb.addItems(["Tous / All","normal","critique","épuisé"])
         fl.addWidget(self.status_cb)
+        self.type_cb.currentIndexChanged.connect(self.apply_filters)
+        self.status_cb.currentIndexChanged.connect(self.apply_filters)
         layout.addLayout(fl)
         # Table
         self.table = QTableWidget(0,8)
@@ -40,6 +47,16 @@ class StockListView(QWidget):
         self.table.setHorizontalHeaderLabels(headers)
         self.table.horizontalHeader().setStretchLastSection(True)
         layout.addWidget(self.table)
+        # Pagination
+        nav = QHBoxLayout()
+        prev_btn = QPushButton("←")
+        prev_btn.clicked.connect(self.prev_page)
+        next_btn = QPushButton("→")
+        next_btn.clicked.connect(self.next_page)
+        self.count_label = QLabel("")
+        self.count_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        nav.addWidget(prev_btn); nav.addWidget(self.count_label, 1); nav.addWidget(next_btn)
+        layout.addLayout(nav)
         # Actions
         ah = QHBoxLayout()
         new_btn = QPushButton("Nouveau / New")
@@ -52,22 +69,35 @@ class StockListView(QWidget):
         layout.addLayout(ah)
 
     def load_data(self):
-        self.filtered = None
+        self.page = 1
         self._populate()
 
     def apply_filters(self):
-        all_p = self.controller.list_products()
-        term = self.search_le.text().lower()
-        t = self.type_cb.currentText().split(" /")[0]
-        s = self.status_cb.currentText().split(" /")[0]
-        f = [p for p in all_p if (not term or term in p.drug_name.lower() or term in p.medication_type.lower() or term in p.forme.lower())]
-        if t!="Tous": f = [p for p in f if p.medication_type==t]
-        if s!="Tous": f = [p for p in f if p.stock_status==s]
-        self.filtered = f
+        # Filtrage et pagination côté base
+        self.page = 1
         self._populate()
 
+    def prev_page(self):
+        if self.page > 1:
+            self.page -= 1
+            self._populate()
+
+    def next_page(self):
+        if self.page * self.PAGE_SIZE < self.total:
+            self.page += 1
+            self._populate()
+
     def _populate(self):
-        data = self.filtered if self.filtered is not None else self.controller.list_products()
+        t = self.type_cb.currentText().split(" /")[0]
+        s = self.status_cb.currentText().split(" /")[0]
+        data, self.total = self.controller.search_products_page(
+            term=self.search_le.text().strip() or None,
+            type_filter=t, status_filter=s,
+            page=self.page, per_page=self.PAGE_SIZE
+        )
+        self.filtered = data
+        pages = max(1, -(-self.total // self.PAGE_SIZE))
+        self.count_label.setText(f"{self.total} produit(s) — page {self.page}/{pages}")
         self.table.setRowCount(len(data))
         for i,p in enumerate(data):
             vals = [
@@ -89,7 +119,6 @@ class StockListView(QWidget):
             QMessageBox.critical(self, "Erreur / Error", "Aucun produit sélectionné / No product selected.")
             return
         idx = sel[0].row()
-        data = self.filtered if self.filtered is not None else self.controller.list_products()
-        prod = data[idx]
+        prod = self.filtered[idx]
         dlg = StockFormDialog(self, self.controller, on_save=self.load_data, product=prod)
         dlg.exec()